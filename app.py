@@ -86,19 +86,76 @@ def run_youtube_crawler_task(task_type, repository, **kwargs):
         _set_crawler_running(True)
         add_log(f"开始执行任务: {task_type}", "INFO")
         
-        scraper = YouTubeScraper()
-        searcher = KeywordSearcher(scraper)
+        # 频道信息缓存：同一频道在本次运行中只解析一次；persist为true时持久化到数据库，跨运行复用
+        from platforms.youtube.channel_cache import YouTubeChannelCache
+        channel_cache_config = load_config().get('youtube', {}).get('channel_cache', {})
+        channel_cache_repository = None
+        if channel_cache_config.get('persist', True):
+            from storage.repositories.youtube_channel_cache_repository import YouTubeChannelCacheRepository
+            channel_cache_repository = YouTubeChannelCacheRepository(repository.db)
+        channel_cache = YouTubeChannelCache(
+            ttl_hours=channel_cache_config.get('ttl_hours', 24),
+            repository=channel_cache_repository
+        )
+        # yt-dlp提取结果磁盘缓存：视频/频道信息跨运行复用，观看数等指标按较短的有效期刷新
+        from platforms.youtube.info_cache import YouTubeInfoCache
+        info_cache = YouTubeInfoCache.from_config(load_config().get('youtube', {}).get('info_cache', {}))
+        scraper = YouTubeScraper(channel_cache=channel_cache, info_cache=info_cache)
+        
+        # 关键词调度器：按历史产出率选择搜索关键词，统计持久化到数据库
+        scheduler = None
+        scheduler_config = load_config().get('youtube', {}).get('keyword_scheduler', {})
+        if scheduler_config.get('enabled', True):
+            from utils.keyword_scheduler import KeywordScheduler
+            from storage.repositories.keyword_stats_repository import KeywordStatsRepository
+            scheduler = KeywordScheduler(
+                'youtube', KeywordStatsRepository(repository.db),
+                prior_alpha=scheduler_config.get('prior_alpha', 1.0),
+                prior_beta=scheduler_config.get('prior_beta', 1.0)
+            )
+        
+        # 关键词重叠度：结果高度重叠的关键词对（如 "Sora AI"/"Sora"）只搜索新频道产出高的一个
+        overlap_tracker = None
+        if scheduler and scheduler_config.get('overlap_threshold'):
+            from utils.keyword_overlap import KeywordOverlapTracker
+            overlap_tracker = KeywordOverlapTracker(
+                'youtube', KeywordStatsRepository(repository.db),
+                threshold=scheduler_config['overlap_threshold']
+            )
+        
+        # 搜索结果缓存：按规范化搜索词缓存，有效期内重复运行不再请求
+        from platforms.youtube.search_cache import YouTubeSearchCache
+        search_cache_config = load_config().get('youtube', {}).get('search_cache', {})
+        search_cache_repository = None
+        if search_cache_config.get('persist', True):
+            from storage.repositories.youtube_search_cache_repository import YouTubeSearchCacheRepository
+            search_cache_repository = YouTubeSearchCacheRepository(repository.db)
+        search_cache = YouTubeSearchCache(
+            ttl_hours=search_cache_config.get('ttl_hours', 24),
+            repository=search_cache_repository
+        )
+        
+        searcher = KeywordSearcher(scraper, scheduler=scheduler, search_cache=search_cache,
+                                   overlap_tracker=overlap_tracker, is_known_channel=repository.exists)
         analyzer = KOLAnalyzer(scraper)
         expander = KOLExpander(scraper)
         filter_obj = KOLFilter(repository)
         
+        # 多进程模式：候选频道分发到多个工作进程分析（每个进程有自己的爬虫和数据库连接）
+        parallel = None
+        process_workers = load_config().get('youtube', {}).get('process_workers', 1)
+        if process_workers != 1:
+            from tasks.youtube.parallel import ShardedChannelCrawler
+            parallel = ShardedChannelCrawler(repository.db.db_path, workers=process_workers or None)
+            add_log(f"多进程分析模式: {parallel.workers} 个工作进程", "INFO")
+        
         if task_type == "discovery":
-            task = YouTubeDiscoveryTask(searcher, analyzer, filter_obj, repository)
+            task = YouTubeDiscoveryTask(searcher, analyzer, filter_obj, repository, parallel=parallel)
             keyword_limit = kwargs.get('keyword_limit', 30)
             add_log(f"使用 {keyword_limit} 个关键词进行搜索", "INFO")
             task.run(keyword_limit)
         elif task_type == "expand":
-            task = YouTubeExpandTask(expander, analyzer, filter_obj, repository)
+            task = YouTubeExpandTask(expander, analyzer, filter_obj, repository, parallel=parallel)
             add_log("开始扩散任务", "INFO")
             task.run()
         
@@ -142,7 +199,15 @@ def run_github_crawler_task(task_type, repository, **kwargs):
         add_log(f"开始执行GitHub任务: {task_type}", "INFO")
         
         scraper = GitHubScraper()
-        searcher = GitHubSearcher(scraper, repository)  # 传入repository用于去重
+        
+        # 断点续爬：记录关键词/仓库/贡献者进度，停止后重新运行从断点继续
+        frontier = None
+        strategy_config = load_config().get('github', {}).get('discovery_strategy', {})
+        if strategy_config.get('enable_resume', True):
+            from storage.repositories.github_frontier_repository import GitHubFrontierRepository
+            frontier = GitHubFrontierRepository(repository.db)
+        
+        searcher = GitHubSearcher(scraper, repository, frontier=frontier)  # 传入repository用于去重
         analyzer = GitHubAnalyzer(scraper)
         
         if task_type == "discovery":
@@ -192,7 +257,7 @@ def run_twitter_crawler_task(task_type, repository, **kwargs):
         _set_crawler_running(True)
         add_log(f"开始执行Twitter任务: {task_type}", "INFO")
         
-        task = TwitterDiscoveryTask()
+        task = TwitterDiscoveryTask(repository)
         
         if task_type == "keyword_discovery":
             keyword_count = kwargs.get('keyword_count', 5)
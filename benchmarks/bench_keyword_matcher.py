@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+关键词匹配微基准：逐个 `in` 扫描（旧写法） vs KeywordMatcher
+
+用法：
+    python benchmarks/bench_keyword_matcher.py
+"""
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.keyword_matcher import KeywordMatcher
+
+
+def random_word(rng, min_len=3, max_len=12):
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(min_len, max_len)))
+
+
+def build_text(rng, keywords, words, hit_ratio=0.02):
+    """生成长描述：大部分是随机单词，少量是关键词"""
+    parts = [rng.choice(keywords) if rng.random() < hit_ratio else random_word(rng) for _ in range(words)]
+    return ' '.join(parts)
+
+
+def naive_find_all(keywords, text):
+    """旧写法：每次调用都把关键词转小写再逐个扫描"""
+    text_lower = text.lower()
+    return [kw for kw in keywords if kw.lower() in text_lower]
+
+
+def timeit(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(keyword_counts=(30, 100, 300, 1000, 5000), text_words=(50, 500, 2000), repeat=30, seed=42):
+    rng = random.Random(seed)
+    vocabulary = list({random_word(rng) for _ in range(max(keyword_counts) * 2)})
+
+    print(f"{'关键词数':>8} {'文本长度':>8} {'逐个扫描(ms)':>14} {'扫描模式(ms)':>14} {'前缀树正则(ms)':>16} {'加速比':>8}")
+    for count in keyword_counts:
+        keywords = vocabulary[:count]
+        scan = KeywordMatcher(keywords)
+        scan._regex = None  # 强制逐个扫描模式
+        threshold = KeywordMatcher.REGEX_THRESHOLD
+        try:
+            KeywordMatcher.REGEX_THRESHOLD = 0  # 强制前缀树正则模式
+            regex_matcher = KeywordMatcher(keywords)
+        finally:
+            KeywordMatcher.REGEX_THRESHOLD = threshold
+        auto = KeywordMatcher(keywords)
+
+        for words in text_words:
+            text = build_text(rng, keywords, words)
+            expected = naive_find_all(keywords, text)
+            assert scan.find_all(text) == expected
+            assert regex_matcher.find_all(text) == expected
+            assert auto.find_all(text) == expected
+
+            naive_ms = timeit(lambda: naive_find_all(keywords, text), repeat)
+            scan_ms = timeit(lambda: scan.find_all(text), repeat)
+            regex_ms = timeit(lambda: regex_matcher.find_all(text), repeat)
+            auto_ms = timeit(lambda: auto.find_all(text), repeat)
+            print(f"{count:>8} {len(text):>8} {naive_ms:>14.3f} {scan_ms:>14.3f} {regex_ms:>16.3f} "
+                  f"{naive_ms / auto_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    run()
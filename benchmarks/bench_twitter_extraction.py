@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Twitter页面提取基准：逐个find_element（旧写法） vs 页面内一次execute_script批量提取
+
+用本地HTTP服务器提供保存的页面fixture（benchmarks/fixtures/），不访问Twitter；
+统计每次提取的耗时和WebDriver请求次数（每个WebDriver命令都是一次到ChromeDriver的HTTP请求）。
+需要本机安装Chrome。
+
+用法：
+    python benchmarks/bench_twitter_extraction.py
+"""
+import functools
+import os
+import re
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium.webdriver.common.by import By
+from platforms.twitter.driver_pool import WebDriverPool
+from platforms.twitter.scraper import TwitterScraper
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def serve_fixtures():
+    """在后台线程启动本地HTTP服务器，返回 (server, base_url)"""
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=FIXTURES_DIR)
+    handler.log_message = lambda *args: None
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def count_commands(driver):
+    """包装driver.execute，统计WebDriver命令数"""
+    counter = {'commands': 0}
+    execute = driver.execute
+
+    def counting_execute(*args, **kwargs):
+        counter['commands'] += 1
+        return execute(*args, **kwargs)
+
+    driver.execute = counting_execute
+    return counter
+
+
+def legacy_metric(element, metric_type):
+    try:
+        metric_elem = element.find_element(By.CSS_SELECTOR, f'[data-testid="{metric_type}"]')
+        numbers = re.findall(r'\d+', metric_elem.get_attribute('aria-label') or metric_elem.text)
+        return int(numbers[0]) if numbers else 0
+    except Exception:
+        return 0
+
+
+def legacy_extract(driver, username):
+    """旧写法：每条推文逐个find_element"""
+    tweets = []
+    for elem in driver.find_elements(By.CSS_SELECTOR, 'article[data-testid="tweet"]'):
+        try:
+            tweets.append({
+                'username': username,
+                'text': elem.find_element(By.CSS_SELECTOR, '[data-testid="tweetText"]').text,
+                'created_at': elem.find_element(By.CSS_SELECTOR, 'time').get_attribute('datetime'),
+                'reply_count': legacy_metric(elem, 'reply'),
+                'retweet_count': legacy_metric(elem, 'retweet'),
+                'like_count': legacy_metric(elem, 'like'),
+            })
+        except Exception:
+            continue
+    return tweets
+
+
+def batched_extract(scraper, username):
+    """新写法：一次execute_script"""
+    return [
+        {
+            'username': username,
+            'text': node['text'],
+            'created_at': node['created_at'],
+            'reply_count': scraper._parse_metric(node['reply']),
+            'retweet_count': scraper._parse_metric(node['retweet']),
+            'like_count': scraper._parse_metric(node['like']),
+        }
+        for node in scraper._extract_tweet_nodes()
+    ]
+
+
+def reset_marks(driver):
+    """清除批量提取留下的已提取标记（不计入耗时和请求数）"""
+    driver.execute_script(
+        "document.querySelectorAll('[data-kol-extracted]').forEach(function (e) { e.removeAttribute('data-kol-extracted'); });")
+
+
+def measure(func, counter, repeat, setup=None):
+    elapsed = commands = 0
+    for _ in range(repeat):
+        if setup:
+            setup()
+        counter['commands'] = 0
+        start = time.perf_counter()
+        result = func()
+        elapsed += time.perf_counter() - start
+        commands += counter['commands']
+    return result, elapsed / repeat * 1000, commands / repeat
+
+
+def run(repeat=5):
+    server, base_url = serve_fixtures()
+    pool = WebDriverPool(size=1)
+    scraper = TwitterScraper(pool=pool)
+    try:
+        with scraper.session() as driver:
+            driver.get(f"{base_url}/twitter_profile.html")
+            counter = count_commands(driver)
+
+            legacy, legacy_ms, legacy_cmds = measure(lambda: legacy_extract(driver, 'ai_dev'), counter, repeat)
+            batched, batched_ms, batched_cmds = measure(lambda: batched_extract(scraper, 'ai_dev'), counter, repeat,
+                                                        setup=lambda: reset_marks(driver))
+            # 已提取的节点不再返回：滚动后的再次提取只处理新节点
+            _, rescan_ms, rescan_cmds = measure(lambda: batched_extract(scraper, 'ai_dev'), counter, repeat)
+            _, profile_ms, profile_cmds = measure(
+                lambda: scraper._extract_profile('ai_dev', f"{base_url}/twitter_profile.html"), counter, repeat)
+    finally:
+        pool.close()
+        server.shutdown()
+
+    # 互动数带千位分隔符时旧写法只取到逗号前的数字，其余字段应一致
+    assert [(t['text'], t['created_at']) for t in legacy] == [(t['text'], t['created_at']) for t in batched]
+
+    print(f"推文数: {len(batched)}")
+    print(f"{'方式':<12} {'耗时(ms)':>10} {'WebDriver请求':>14}")
+    print(f"{'逐个提取':<12} {legacy_ms:>10.1f} {legacy_cmds:>14.0f}")
+    print(f"{'批量提取':<12} {batched_ms:>10.1f} {batched_cmds:>14.0f}")
+    print(f"{'无新节点':<12} {rescan_ms:>10.1f} {rescan_cmds:>14.0f}")
+    print(f"加速比: {legacy_ms / batched_ms:.1f}x")
+    print(f"用户信息提取: {profile_ms:.1f} ms, {profile_cmds:.0f} 次WebDriver请求")
+
+
+if __name__ == '__main__':
+    run()
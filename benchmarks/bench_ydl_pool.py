@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+YoutubeDL单次调用开销微基准：每次新建实例（旧写法） vs 实例池复用
+
+只测量发起网络请求之前的固定开销（创建实例、初始化YouTube提取器、HTTP处理器），不访问网络。
+
+用法：
+    python benchmarks/bench_ydl_pool.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import yt_dlp
+from platforms.youtube.ydl_pool import YoutubeDLPool
+
+# 与YouTubeScraper.ydl_opts相同的基础选项
+BASE_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': True,
+    'socket_timeout': 10,
+    'extractor_args': {'youtube': {'player_client': ['android', 'web'], 'skip': ['hls', 'dash']}},
+}
+
+# 一次频道分析用到的提取器：频道页/搜索（YoutubeTab、YoutubeSearch）和视频详情（Youtube）
+EXTRACTORS = ('YoutubeTab', 'YoutubeSearch', 'Youtube')
+
+
+def prepare(ydl):
+    """模拟一次调用在请求前的准备工作：初始化提取器和HTTP请求处理器"""
+    for name in EXTRACTORS:
+        ydl.get_info_extractor(name)
+    ydl._request_director
+
+
+def per_call_new_instance(opts):
+    with yt_dlp.YoutubeDL(dict(opts)) as ydl:
+        prepare(ydl)
+
+
+def per_call_pooled(pool, opts):
+    with pool.checkout('flat', opts) as ydl:
+        prepare(ydl)
+
+
+def timeit(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(repeat=50):
+    pool = YoutubeDLPool()
+    per_call_pooled(pool, BASE_OPTS)  # 预热
+
+    new_ms = timeit(lambda: per_call_new_instance(BASE_OPTS), repeat)
+    pooled_ms = timeit(lambda: per_call_pooled(pool, BASE_OPTS), repeat)
+    pool.close()
+
+    print(f"{'方式':<12} {'单次开销(ms)':>14}")
+    print(f"{'每次新建':<12} {new_ms:>14.3f}")
+    print(f"{'实例池复用':<12} {pooled_ms:>14.3f}")
+    print(f"加速比: {new_ms / pooled_ms:.0f}x（每次调用节省 {new_ms - pooled_ms:.2f} ms）")
+
+
+if __name__ == '__main__':
+    run()
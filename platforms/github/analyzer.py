@@ -14,6 +14,9 @@ class GitHubAnalyzer:
     
     def __init__(self, scraper: GitHubScraper = None):
         self.scraper = scraper or GitHubScraper()
+        
+        # 预筛选统计（本次运行）
+        self.prescreen_stats = {'analyzed': 0, 'prescreen_rejected': 0, 'saved_fetches': 0}
     
     def analyze_developer(self, username: str) -> Dict:
         """
@@ -21,6 +24,11 @@ class GitHubAnalyzer:
         
         优化原则：只要满足一个不合格条件，立即返回，不再继续判断
         
+        分阶段判断：
+        1. 主页预筛选（排除的组织），不通过时不再做商业开发者的仓库阶段判断
+        2. 主页显示没有公开仓库，或已排除商业判定且主页没有学术特征时，不请求仓库页
+        3. 仓库阶段判断（星标、AI项目、研究项目）
+        
         Args:
             username: 用户名
             
@@ -46,19 +54,34 @@ class GitHubAnalyzer:
             logger.warning(f"⚠️ 检测到停止信号，停止分析")
             return {}
         
-        # 获取用户仓库
-        repositories = self.scraper.get_user_repositories(username, max_repos=30)
+        self.prescreen_stats['analyzed'] += 1
+        
+        # 主页预筛选（不需要仓库列表）；配置快照在文件未修改时不读取文件
+        from utils.config_loader import get_config_snapshot
+        config = get_config_snapshot()
+        indie_possible, indie_reason = self.scraper.prescreen_indie_developer(user_info, config)
+        if not indie_possible:
+            self.prescreen_stats['prescreen_rejected'] += 1
+        
+        # 获取用户仓库（预筛选确定不需要时跳过仓库页请求）
+        repositories_needed, skip_reason = self.scraper.prescreen_repositories(user_info, indie_possible, config)
+        if repositories_needed:
+            repositories = self.scraper.get_user_repositories(username, max_repos=30)
+        else:
+            self.prescreen_stats['saved_fetches'] += 1
+            logger.info(f"⚡ {username} {skip_reason}，跳过仓库页")
+            repositories = []
         
         # 计算统计数据（所有类型都需要）
         stats = self._calculate_stats(repositories)
         
         # 先检查是否为学术人士
-        is_academic, academic_indicators, research_areas = self.scraper.check_is_academic(user_info, repositories)
+        is_academic, academic_indicators, research_areas = self.scraper.check_is_academic(user_info, repositories, config)
         
         # 如果是学术人士
         if is_academic:
             # 提取联系方式
-            contact_info = self._extract_contact_info(user_info)
+            contact_info = self.extract_contact_info(user_info)
             
             # 学术人士也需要有联系方式
             if not contact_info:
@@ -66,7 +89,7 @@ class GitHubAnalyzer:
                 commit_email = self.scraper._extract_email_from_commits(username)
                 if commit_email:
                     user_info['email'] = commit_email
-                    contact_info = self._extract_contact_info(user_info)
+                    contact_info = self.extract_contact_info(user_info)
                     logger.info(f"✓ 从commit提取到邮箱: {commit_email}")
                 else:
                     logger.info(f"✗ 学术人士无联系方式，不合格")
@@ -83,8 +106,12 @@ class GitHubAnalyzer:
                                      academic_indicators=academic_indicators,
                                      research_areas=research_areas)
         
-        # 不是学术人士，检查是否为商业/独立开发者
-        is_indie = self.scraper.check_is_indie_developer(user_info, repositories)
+        # 不是学术人士，检查是否为商业/独立开发者（预筛选已通过，只做仓库阶段判断）
+        if indie_possible:
+            is_indie = self.scraper.check_indie_repositories(user_info, repositories, config)
+        else:
+            logger.info(f"❌ {username} {indie_reason}")
+            is_indie = False
         
         # 如果影响力不足，立即返回不合格（不再检查联系方式）
         if not is_indie:
@@ -93,14 +120,14 @@ class GitHubAnalyzer:
                                      'commercial', False, '')
         
         # 影响力合格，检查联系方式
-        contact_info = self._extract_contact_info(user_info)
+        contact_info = self.extract_contact_info(user_info)
         
         if not contact_info:
             logger.info(f"商业开发者 {username} 没有联系方式，尝试从commit提取...")
             commit_email = self.scraper._extract_email_from_commits(username)
             if commit_email:
                 user_info['email'] = commit_email
-                contact_info = self._extract_contact_info(user_info)
+                contact_info = self.extract_contact_info(user_info)
                 logger.info(f"✓ 从commit提取到邮箱: {commit_email}")
             else:
                 logger.info(f"✗ 商业开发者无联系方式，不合格")
@@ -113,6 +140,14 @@ class GitHubAnalyzer:
         return self._build_result(username, user_info, stats, repositories,
                                  'commercial', True, contact_info)
     
+    def log_prescreen_report(self):
+        """输出本次运行的预筛选统计"""
+        stats = self.prescreen_stats
+        if stats['analyzed'] == 0:
+            return
+        logger.info(f"预筛选: 分析 {stats['analyzed']} 个，主页阶段排除商业开发者判定 {stats['prescreen_rejected']} 个，"
+                   f"节省 {stats['saved_fetches']} 次仓库页请求")
+    
     def _build_result(self, username: str, user_info: Dict, stats: Dict, 
                      repositories: List[Dict], developer_type: str, 
                      is_qualified: bool, contact_info: str,
@@ -144,6 +179,7 @@ class GitHubAnalyzer:
             'avg_forks': stats['avg_forks'],
             'top_languages': stats['top_languages'],
             'original_repos': stats['original_repos'],
+            'repositories': repositories,  # 分析用的仓库列表，入库后可离线重新判定
             
             'developer_type': developer_type,
             'status': 'qualified' if is_qualified else 'rejected',
@@ -198,7 +234,8 @@ class GitHubAnalyzer:
             'original_repos': original_repos
         }
     
-    def _extract_contact_info(self, user_info: Dict) -> str:
+    @staticmethod
+    def extract_contact_info(user_info: Dict) -> str:
         """提取联系方式（带图标）"""
         contacts = []
         
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+GitHub候选开发者评分 - 按预估合格率排序候选者
+"""
+import math
+from typing import Dict, Optional, Tuple
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+# discovered_from 格式: search|关键词|仓库名（旧数据为 'search'）
+SOURCE_TAG_PREFIX = 'search'
+SOURCE_TAG_SEPARATOR = '|'
+
+
+def build_source_tag(keyword: str, repo_name: str) -> str:
+    """生成discovered_from来源标记"""
+    return SOURCE_TAG_SEPARATOR.join([SOURCE_TAG_PREFIX, keyword or '', repo_name or ''])
+
+
+def parse_source_tag(tag: str) -> Optional[Tuple[str, str]]:
+    """解析discovered_from来源标记，返回 (keyword, repo_name)，无法解析返回None"""
+    if not tag:
+        return None
+    parts = tag.split(SOURCE_TAG_SEPARATOR)
+    if len(parts) != 3 or parts[0] != SOURCE_TAG_PREFIX:
+        return None
+    return parts[1], parts[2]
+
+
+class CandidateScorer:
+    """
+    候选开发者评分器
+
+    信号：
+    - 贡献者的commit数和排名
+    - 来源仓库的星标数
+    - 来源仓库、关键词的历史合格率（来自已入库开发者的discovered_from）
+
+    历史合格率使用Beta先验平滑：样本少时接近全局合格率，样本多时接近实际合格率
+    """
+
+    DEFAULT_WEIGHTS = {
+        'commits': 1.0,
+        'rank': 1.0,
+        'repo_stars': 0.5,
+        'repo_rate': 2.0,
+        'keyword_rate': 1.0,
+    }
+
+    def __init__(self, weights: Dict = None, prior_strength: float = 10.0):
+        self.weights = {**self.DEFAULT_WEIGHTS, **(weights or {})}
+        self.prior_strength = prior_strength
+        self.global_rate = 0.0
+        self.repo_history = {}     # repo_name -> (analyzed, qualified)
+        self.keyword_history = {}  # keyword -> (analyzed, qualified)
+
+    def load_history(self, source_stats: Dict[str, Dict]):
+        """
+        加载历史合格率
+
+        Args:
+            source_stats: {discovered_from: {'total': int, 'qualified': int}}
+        """
+        self.repo_history = {}
+        self.keyword_history = {}
+        total_all = 0
+        qualified_all = 0
+
+        for tag, counts in source_stats.items():
+            total = counts.get('total', 0)
+            qualified = counts.get('qualified', 0)
+            total_all += total
+            qualified_all += qualified
+
+            parsed = parse_source_tag(tag)
+            if not parsed:
+                continue
+            keyword, repo_name = parsed
+            for history, key in ((self.keyword_history, keyword), (self.repo_history, repo_name)):
+                if not key:
+                    continue
+                prev_total, prev_qualified = history.get(key, (0, 0))
+                history[key] = (prev_total + total, prev_qualified + qualified)
+
+        self.global_rate = qualified_all / total_all if total_all > 0 else 0.0
+
+        if total_all:
+            logger.info(f"✓ 候选评分已加载历史数据: {total_all} 个开发者, 全局合格率 {self.global_rate:.1%}, "
+                       f"{len(self.repo_history)} 个仓库, {len(self.keyword_history)} 个关键词")
+
+    def _smoothed_rate(self, history: Dict, key: str) -> float:
+        """Beta先验平滑后的合格率"""
+        total, qualified = history.get(key, (0, 0))
+        prior = self.global_rate
+        return (qualified + prior * self.prior_strength) / (total + self.prior_strength)
+
+    def _relative_rate(self, history: Dict, key: str) -> float:
+        """相对全局合格率的倍数（无历史数据时为1），限制在[0, 5]"""
+        if not self.global_rate:
+            return 1.0
+        return min(self._smoothed_rate(history, key) / self.global_rate, 5.0)
+
+    def score(self, contributor: Dict, repo_stars: int, keyword: str, repo_name: str) -> float:
+        """
+        计算候选者得分（越高越优先分析）
+
+        Args:
+            contributor: 贡献者信息 {'username', 'commits', 'rank'}
+            repo_stars: 来源仓库星标数
+            keyword: 搜索关键词
+            repo_name: 来源仓库
+        """
+        commits = max(contributor.get('commits', 0) or 0, 0)
+        rank = max(contributor.get('rank', 1) or 1, 1)
+
+        commits_score = min(math.log1p(commits) / math.log1p(1000), 1.0)
+        rank_score = 1.0 / math.sqrt(rank)
+        stars_score = min(math.log10(max(repo_stars, 0) + 1) / 5, 1.0)
+
+        w = self.weights
+        return (w['commits'] * commits_score
+                + w['rank'] * rank_score
+                + w['repo_stars'] * stars_score
+                + w['repo_rate'] * self._relative_rate(self.repo_history, repo_name)
+                + w['keyword_rate'] * self._relative_rate(self.keyword_history, keyword))
+
+    def keyword_score(self, keyword: str) -> float:
+        """关键词的历史合格率（用于关键词排序）"""
+        return self._smoothed_rate(self.keyword_history, keyword)
@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""
+GitHub开发者判定规则 - 独立开发者/学术人士的预筛选与判定
+
+只依赖用户信息和仓库列表，不发起网络请求：
+GitHubScraper继承这些规则用于在线分析，GitHubRequalifyTask直接使用它离线重新判定已入库的开发者
+"""
+from typing import Dict, List
+from utils.logger import setup_logger
+from utils.keyword_matcher import KeywordMatcher, compile_keywords
+
+logger = setup_logger()
+
+
+# 研究领域 -> 识别关键词
+RESEARCH_AREA_KEYWORDS = {
+    'deep-learning': ['deep-learning', 'deep learning', 'deeplearning', 'dl'],
+    'neural-network': ['neural-network', 'neural network', 'neuralnetwork', 'nn'],
+    'machine-learning': ['machine-learning', 'machine learning', 'machinelearning', 'ml'],
+    'computer-vision': ['computer-vision', 'computer vision', 'cv', 'image-processing'],
+    'nlp': ['nlp', 'natural-language', 'natural language processing', 'text-processing'],
+    'reinforcement-learning': ['reinforcement-learning', 'reinforcement learning', 'rl'],
+    'multimodal': ['multimodal', 'multi-modal', 'vision-language', 'vlm'],
+    'transformer': ['transformer', 'attention', 'bert', 'gpt'],
+    'diffusion': ['diffusion', 'stable-diffusion', 'ddpm', 'ddim'],
+    'gan': ['gan', 'generative adversarial', 'stylegan'],
+}
+
+# 所有领域关键词编译为一个匹配器，一次扫描后映射回领域
+_AREAS_BY_KEYWORD = {}
+for _area, _keywords in RESEARCH_AREA_KEYWORDS.items():
+    for _kw in _keywords:
+        _AREAS_BY_KEYWORD.setdefault(_kw, []).append(_area)
+_RESEARCH_AREA_MATCHER = KeywordMatcher(_AREAS_BY_KEYWORD)
+
+
+class GitHubQualificationRules:
+    """GitHub开发者判定规则（无网络请求）"""
+    
+    @staticmethod
+    def is_organization_account(username: str) -> bool:
+        """
+        简单判断是否为组织账号
+        
+        启发式规则：
+        - 包含公司常见后缀
+        - 全大写
+        """
+        org_indicators = ['inc', 'corp', 'company', 'team', 'lab', 'labs', 'ai', 'tech']
+        username_lower = username.lower()
+        
+        # 检查是否包含组织指示词
+        for indicator in org_indicators:
+            if indicator in username_lower and len(username) > 10:
+                return True
+        
+        # 全大写可能是组织
+        if username.isupper() and len(username) > 3:
+            return True
+        
+        return False
+    
+    def prescreen_indie_developer(self, user_info: Dict, config: Dict = None) -> tuple[bool, str]:
+        """
+        独立开发者预筛选（仅依赖主页信息，不需要仓库列表）
+        
+        影响力是粉丝数或星标总数达到阈值，星标总数要从仓库列表得到，
+        因此粉丝数少不能排除；这里只检查排除的组织
+        
+        Args:
+            user_info: 用户信息
+            config: 配置（为None时自动加载）
+            
+        Returns:
+            (possible, reason): 是否仍可能合格，不可能时给出原因
+        """
+        if config is None:
+            from utils.config_loader import get_config_snapshot
+            config = get_config_snapshot()
+        github_config = config.get('github', {})
+        
+        company = (user_info.get('company') or '').lower()
+        bio = (user_info.get('bio') or '').lower()
+        
+        # 排除大公司员工、竞争对手和项目团队成员（从github.exclusion_organizations读取）
+        exclusion_organizations = github_config.get('exclusion_organizations', [])
+        exclusion_orgs_lower = [org.lower() for org in exclusion_organizations if org]
+        
+        for org in exclusion_orgs_lower:
+            # 检查company字段
+            if org in company:
+                return False, f"属于排除的组织: {company}"
+            
+            # 检查bio中是否标注为该组织的成员
+            if f"{org} team" in bio or f"{org} member" in bio or f"{org} contributor" in bio:
+                return False, f"是 {org} 组织成员"
+        
+        return True, ""
+    
+    def academic_profile_keyword(self, user_info: Dict, config: Dict = None) -> str:
+        """
+        主页（bio/company/location）中的学术机构关键词
+        
+        Returns:
+            匹配到的关键词，没有时返回空字符串
+        """
+        if config is None:
+            from utils.config_loader import get_config_snapshot
+            config = get_config_snapshot()
+        github_config = config.get('github', {})
+        
+        bio = (user_info.get('bio') or '').lower()
+        company = (user_info.get('company') or '').lower()
+        location = (user_info.get('location') or '').lower()
+        
+        # 从配置文件读取学术机构关键词
+        academic_keywords = github_config.get('academic_keywords', [
+            'university', 'college', 'institute', 'research', 'lab', 'laboratory',
+            'phd', 'ph.d', 'professor', 'postdoc', 'post-doc', 'student',
+            'academic', 'scholar', 'researcher', 'faculty',
+            '大学', '学院', '研究所', '实验室', '博士', '教授', '研究员', '学者'
+        ])
+        
+        # 各字段用换行分隔，避免跨字段拼出关键词
+        return compile_keywords(academic_keywords).first_match(f"{bio}\n{company}\n{location}") or ''
+    
+    def prescreen_repositories(self, user_info: Dict, indie_possible: bool, config: Dict = None) -> tuple[bool, str]:
+        """
+        是否需要请求仓库页（仅依赖主页信息）
+        
+        - 主页显示0个公开仓库（成功解析，不是解析失败的默认值）：仓库列表必然为空，
+          直接用空列表判定，结果与请求仓库页相同
+        - 已被排除的组织排除商业判定，且主页没有学术特征：不再请求仓库页
+        
+        Args:
+            user_info: 用户信息
+            indie_possible: 独立开发者预筛选是否通过
+            config: 配置（为None时自动加载）
+            
+        Returns:
+            (needed, reason): 是否需要仓库列表，不需要时给出原因
+        """
+        if user_info.get('public_repos_parsed') and user_info.get('public_repos') == 0:
+            return False, "没有公开仓库"
+        
+        if not indie_possible and not self.academic_profile_keyword(user_info, config):
+            return False, "属于排除的组织且主页没有学术特征"
+        
+        return True, ""
+    
+    def check_is_indie_developer(self, user_info: Dict, repositories: List[Dict], config: Dict = None) -> bool:
+        """
+        判断是否为适合WaveSpeedAI合作的独立开发者
+        
+        WaveSpeedAI业务：图像/视频生成API平台
+        目标客户：AI应用开发者、内容创作工具开发者、API集成者
+        
+        判断标准（针对独立开发者）：
+        1. 不属于大公司（包括竞争对手）（预筛选，仅依赖主页）
+        2. 有一定影响力（followers或stars达到配置阈值）
+        3. 有明确的AI相关项目经验
+        4. **核心：必须是独立开发者，不是某个大项目的成员/贡献者**
+        
+        config为None时自动加载（批量判定时传入，避免重复读取配置文件）
+        """
+        # 加载配置（一次性加载）
+        if config is None:
+            from utils.config_loader import get_config_snapshot
+            config = get_config_snapshot()
+        
+        possible, reason = self.prescreen_indie_developer(user_info, config)
+        if not possible:
+            logger.info(f"❌ {user_info.get('username', '')} {reason}")
+            return False
+        
+        return self.check_indie_repositories(user_info, repositories, config)
+    
+    def check_indie_repositories(self, user_info: Dict, repositories: List[Dict], config: Dict = None) -> bool:
+        """
+        独立开发者仓库阶段判断（需要仓库列表，应在预筛选通过后调用）
+        
+        Args:
+            user_info: 用户信息
+            repositories: 仓库列表
+            config: 配置（为None时自动加载）
+        """
+        if config is None:
+            from utils.config_loader import get_config_snapshot
+            config = get_config_snapshot()
+        github_config = config.get('github', {})
+        
+        username = user_info.get('username', '')
+        company = (user_info.get('company') or '').lower()
+        exclusion_orgs_lower = [org.lower() for org in github_config.get('exclusion_organizations', []) if org]
+        
+        # 2. 获取原创仓库
+        original_repos = [r for r in repositories if not r.get('is_fork', False)]
+        
+        # 3. 检查影响力（从配置文件读取阈值）
+        min_followers = github_config.get('min_followers', 100)
+        min_stars = github_config.get('min_stars', 500)
+        
+        followers = user_info.get('followers', 0)
+        total_stars = sum(r.get('stars', 0) for r in original_repos)
+        
+        if followers < min_followers and total_stars < min_stars:
+            logger.info(f"❌ {username} 影响力不足: followers={followers} (需要>={min_followers}), stars={total_stars} (需要>={min_stars})")
+            return False
+        
+        # 4. 检查company中是否标注为某个项目的成员（使用同样的排除组织列表）
+        for project in exclusion_orgs_lower:
+            if project in company and ('team' in company or 'member' in company):
+                logger.info(f"❌ {username} 在company中标注为 {project} 成员")
+                return False
+        
+        # 5. 检查是否有AI相关项目（从配置文件读取关键词）
+        core_ai_keywords = github_config.get('core_ai_keywords', [
+            # 默认关键词（如果配置文件中没有）
+            'machine-learning', 'deep-learning', 'neural-network', 'ml-model',
+            'pytorch', 'tensorflow', 'keras', 'scikit-learn',
+            'stable-diffusion', 'diffusion-model', 'text-to-image', 'text-to-video',
+            'image-generation', 'video-generation', 'generative-ai', 'gan',
+            'controlnet', 'animatediff',
+            'gpt', 'llm', 'large-language-model', 'chatbot', 'transformer',
+            'bert', 'nlp', 'natural-language',
+            'computer-vision', 'object-detection', 'image-recognition',
+            'yolo', 'opencv-ai', 'face-recognition'
+        ])
+        
+        has_ai_project = False
+        ai_repo_name = None
+        core_matcher = compile_keywords(core_ai_keywords)
+        
+        for repo in original_repos:
+            repo_name = repo.get('repo_name', '')
+            description = repo.get('description', '')
+            language = repo.get('language', '')
+            
+            repo_text = f"{repo_name} {description} {language}"
+            
+            # 检查核心AI关键词（任意一个即可）
+            matched_core = core_matcher.find_all(repo_text)
+            
+            if matched_core:
+                has_ai_project = True
+                ai_repo_name = repo.get('repo_name')
+                logger.info(f"✓ {username} 有AI项目: {ai_repo_name}")
+                logger.info(f"  匹配关键词: {matched_core}")
+                break
+        
+        if not has_ai_project:
+            logger.info(f"❌ {username} 没有明确的AI相关项目")
+            return False
+        
+        logger.info(f"✓ {username} 合格 - 独立开发者 - Followers:{followers}, Stars:{total_stars}")
+        return True
+    
+    def check_is_academic(self, user_info: Dict, repositories: List[Dict], config: Dict = None) -> tuple[bool, list, list]:
+        """
+        判断是否为学术人士
+        
+        学术人士特征：
+        1. Bio/Company包含学术机构关键词
+        2. 项目主要是研究性质（论文复现、模型训练、研究工具）
+        3. 深度学习/神经网络相关的研究项目
+        4. 满足影响力要求（followers或stars达到配置阈值）
+        
+        Args:
+            user_info: 用户信息
+            repositories: 仓库列表
+            config: 配置（为None时自动加载）
+            
+        Returns:
+            (is_academic, academic_indicators, research_areas)
+            - is_academic: 是否为学术人士
+            - academic_indicators: 学术指标列表
+            - research_areas: 研究领域列表
+        """
+        if config is None:
+            from utils.config_loader import get_config_snapshot
+            config = get_config_snapshot()
+        github_config = config.get('github', {})
+        
+        username = user_info.get('username', '')
+        
+        academic_indicators = []
+        research_areas = []
+        
+        # 1. 主页中的学术机构关键词
+        profile_keyword = self.academic_profile_keyword(user_info, config)
+        if profile_keyword:
+            academic_indicators.append(f"Profile contains: {profile_keyword}")
+        
+        # 2. 检查项目特征（研究领域关键词见RESEARCH_AREA_KEYWORDS）
+        # 从配置文件读取研究项目关键词
+        research_project_indicators = github_config.get('research_project_keywords', [
+            'paper', 'arxiv', 'implementation', 'reproduction', 'reproduce',
+            'research', 'experiment', 'benchmark', 'dataset', 'pretrained',
+            'model', 'training', 'pytorch', 'tensorflow', 'keras',
+            '论文', '复现', '实验', '研究'
+        ])
+        
+        research_matcher = compile_keywords(research_project_indicators)
+        
+        # 统计研究项目数量
+        research_project_count = 0
+        matched_areas = set()
+        
+        for repo in repositories:
+            repo_name = repo.get('repo_name', '')
+            description = repo.get('description', '')
+            repo_text = f"{repo_name} {description}"
+            
+            # 检查是否为研究项目
+            is_research = research_matcher.contains_any(repo_text)
+            
+            if is_research:
+                research_project_count += 1
+                
+                # 识别研究领域
+                for kw in _RESEARCH_AREA_MATCHER.find_all(repo_text):
+                    matched_areas.update(_AREAS_BY_KEYWORD[kw])
+        
+        if research_project_count > 0:
+            academic_indicators.append(f"Research projects: {research_project_count}")
+        
+        if matched_areas:
+            research_areas = list(matched_areas)
+            academic_indicators.append(f"Research areas: {', '.join(research_areas)}")
+        
+        # 3. 判断是否为学术人士
+        # 条件：有学术机构关键词 或 有2个以上研究项目
+        is_academic = len(academic_indicators) > 0 and (
+            any('Profile contains' in ind for ind in academic_indicators) or
+            research_project_count >= 2
+        )
+        
+        if not is_academic:
+            return False, [], []
+        
+        # 4. 检查影响力（从配置文件读取学术人士的阈值）
+        academic_min_followers = github_config.get('academic_min_followers', 50)
+        academic_min_stars = github_config.get('academic_min_stars', 100)
+        
+        followers = user_info.get('followers', 0)
+        original_repos = [r for r in repositories if not r.get('is_fork', False)]
+        total_stars = sum(r.get('stars', 0) for r in original_repos)
+        
+        if followers < academic_min_followers and total_stars < academic_min_stars:
+            logger.info(f"❌ {username} 学术人士影响力不足: followers={followers} (需要>={academic_min_followers}), stars={total_stars} (需要>={academic_min_stars})")
+            return False, [], []
+        
+        logger.info(f"✓ {username} 识别为学术人士")
+        logger.info(f"  学术指标: {academic_indicators}")
+        logger.info(f"  研究领域: {research_areas}")
+        logger.info(f"  影响力: Followers={followers}, Stars={total_stars}")
+        
+        return is_academic, academic_indicators, research_areas
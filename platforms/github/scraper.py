@@ -7,6 +7,7 @@ GitHub爬虫 - 使用API获取贡献者
 - 速度快、稳定、可获取完整列表（100+个贡献者）
 - 不再使用Selenium或侧边栏爬取
 """
+import hashlib
 import requests
 import time
 import re
@@ -15,13 +16,22 @@ from typing import Dict, List, Optional
 from bs4 import BeautifulSoup
 from utils.logger import setup_logger
 from utils.retry import retry_on_failure
+from utils.rate_limiter import get_rate_limiter_registry
+from .qualification import GitHubQualificationRules
 
 logger = setup_logger()
 
 
-class GitHubScraper:
+def stable_id(text: str) -> int:
+    """由用户名/仓库名生成稳定的整数ID（内置hash()每个进程随机，跨运行不一致）"""
+    return int(hashlib.md5(text.lower().encode('utf-8')).hexdigest()[:15], 16)
+
+
+class GitHubScraper(GitHubQualificationRules):
     """GitHub爬虫（UA轮换+智能延迟）"""
     
+    MAX_429_RETRIES = 5  # 搜索遇到429时的最多请求次数
+    
     def __init__(self):
         self.session = requests.Session()
         
@@ -49,9 +59,18 @@ class GitHubScraper:
         self.initial_cooldown = rate_limit_config.get('initial_cooldown', 5)
         self.max_429_backoff = rate_limit_config.get('max_429_backoff', 30)
         
-        self.last_request_time = 0
-        self.rate_limit_count = 0
-        self.consecutive_429 = 0  # 连续429次数
+        # github.com的限速器在进程内共享：多个爬虫实例/线程共用一个请求预算
+        # 间隔为 min_delay + 0~(max_delay-min_delay) 秒随机抖动，429时自动降速并遵守Retry-After
+        registry = get_rate_limiter_registry()
+        self.rate_limiter = registry.get(
+            'github.com',
+            rate=1.0 / max(self.min_delay, 0.1),
+            burst=1,
+            jitter=max(self.max_delay - self.min_delay, 0.0),
+            max_backoff=self.max_429_backoff
+        )
+        # 所有响应都交给限速器（Retry-After、X-RateLimit-*、429/503）
+        self.session.hooks['response'].append(registry.observe_response)
         
         logger.info(f"爬虫初始化（延迟{self.min_delay}-{self.max_delay}秒，{len(self.user_agents)}个UA）")
         logger.info(f"⏳ 等待{self.initial_cooldown}秒让IP冷却...")
@@ -67,21 +86,8 @@ class GitHubScraper:
         }
     
     def _wait(self):
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        delay = random.uniform(self.min_delay, self.max_delay)
-        
-        # 如果连续触发429，增加额外延迟
-        if self.consecutive_429 > 0:
-            penalty = min(self.consecutive_429 * 2, 5)
-            delay = min(delay + penalty, 5.0)
-            logger.debug(f"连续429 {self.consecutive_429}次，延迟增加到{delay:.1f}秒")
-        
-        if time_since_last < delay:
-            time.sleep(delay - time_since_last)
-        
-        self.last_request_time = time.time()
+        """等待github.com共享限速器放行"""
+        self.rate_limiter.acquire()
     
     @retry_on_failure(max_retries=3)
     def search_repositories(self, keyword: str, max_results: int = 10, sort: str = 'stars') -> List[Dict]:
@@ -93,27 +99,19 @@ class GitHubScraper:
             
             response = self.session.get(url, params=params, headers=self._get_headers(), timeout=15)
             
-            if response.status_code == 429:
-                self.consecutive_429 += 1
-                # 指数退避：2^n秒，最多使用配置的最大值
-                wait_time = min(2 ** self.consecutive_429, self.max_429_backoff)
-                logger.warning(f"⚠️ 429错误（第{self.consecutive_429}次），等待{wait_time}秒...")
-                time.sleep(wait_time)
-                
-                # 如果连续3次429，建议更长的冷却期
-                if self.consecutive_429 >= 3:
-                    logger.warning(f"⚠️ 连续{self.consecutive_429}次429，建议稍后再试或降低爬取频率")
-                    logger.warning(f"   当前延迟: {self.min_delay}-{self.max_delay}秒，最大退避: {self.max_429_backoff}秒")
-                
-                return self.search_repositories(keyword, max_results, sort)
+            # 429：限速器已通过响应钩子暂停并降速，等待放行后重试（有次数上限，不再递归）
+            attempts = 1
+            while response.status_code == 429 and attempts < self.MAX_429_RETRIES:
+                attempts += 1
+                logger.warning(f"⚠️ 429错误（第{self.rate_limiter.consecutive_throttles}次），等待限速器放行后重试...")
+                if self.rate_limiter.consecutive_throttles >= 3:
+                    logger.warning(f"⚠️ 连续{self.rate_limiter.consecutive_throttles}次429，建议稍后再试或降低爬取频率")
+                    logger.warning(f"   当前间隔: {self.rate_limiter.interval:.1f}秒，最大退避: {self.max_429_backoff}秒")
+                self._wait()
+                response = self.session.get(url, params=params, headers=self._get_headers(), timeout=15)
             
             response.raise_for_status()
             
-            # 成功后重置429计数
-            if self.consecutive_429 > 0:
-                logger.info(f"✓ 速率限制已解除（之前连续{self.consecutive_429}次429）")
-                self.consecutive_429 = 0
-            
             soup = BeautifulSoup(response.text, 'html.parser')
             repositories = []
             
@@ -161,7 +159,7 @@ class GitHubScraper:
                     language = lang_elem.text.strip() if lang_elem else ''
                     
                     repositories.append({
-                        'repo_id': hash(repo_name),
+                        'repo_id': stable_id(repo_name),
                         'repo_name': repo_name,
                         'repo_url': f"https://github.com/{repo_name}",
                         'owner_username': owner_username,
@@ -183,11 +181,6 @@ class GitHubScraper:
             return repositories
             
         except Exception as e:
-            if '429' in str(e):
-                self.consecutive_429 += 1
-                wait_time = min(2 ** self.consecutive_429, 5)
-                logger.warning(f"429错误（第{self.consecutive_429}次），等待{wait_time}秒...")
-                time.sleep(wait_time)
             logger.error(f"搜索失败: {e}")
             return []
     
@@ -209,7 +202,7 @@ class GitHubScraper:
             soup = BeautifulSoup(response.text, 'html.parser')
             
             user_info = {
-                'user_id': hash(username),
+                'user_id': stable_id(username),
                 'username': username,
                 'name': '',
                 'profile_url': url,
@@ -322,6 +315,8 @@ class GitHubScraper:
             if repos_elem:
                 try:
                     user_info['public_repos'] = int(repos_elem.text.strip().replace(',', ''))
+                    # 区分真实的0个仓库和解析失败（默认值0）
+                    user_info['public_repos_parsed'] = True
                 except:
                     pass
             
@@ -456,7 +451,7 @@ class GitHubScraper:
                     is_fork = 'fork' in item.text.lower()
                     
                     repositories.append({
-                        'repo_id': hash(repo_name),
+                        'repo_id': stable_id(repo_name),
                         'repo_name': repo_name,
                         'repo_url': f"https://github.com/{repo_name}",
                         'description': description,
@@ -653,237 +648,3 @@ class GitHubScraper:
             return [], f"请求失败: {str(req_err)}"
         except Exception as e:
             return [], f"未知错误: {type(e).__name__} - {str(e)}"
-    
-    def check_is_indie_developer(self, user_info: Dict, repositories: List[Dict]) -> bool:
-        """
-        判断是否为适合WaveSpeedAI合作的独立开发者
-        
-        WaveSpeedAI业务：图像/视频生成API平台
-        目标客户：AI应用开发者、内容创作工具开发者、API集成者
-        
-        判断标准（针对独立开发者）：
-        1. 不属于大公司（包括竞争对手）
-        2. 有一定影响力（followers或stars达到配置阈值）
-        3. 有明确的AI相关项目经验
-        4. **核心：必须是独立开发者，不是某个大项目的成员/贡献者**
-        """
-        # 加载配置（一次性加载）
-        from utils.config_loader import load_config
-        config = load_config()
-        github_config = config.get('github', {})
-        exclusion_rules = config.get('exclusion_rules', {})
-        
-        username = user_info.get('username', '')
-        
-        # 1. 排除大公司员工、竞争对手和项目团队成员（从配置读取）
-        company = (user_info.get('company') or '').lower()
-        bio = (user_info.get('bio') or '').lower()
-        
-        # 从配置读取排除的组织列表（从github.exclusion_organizations读取）
-        exclusion_organizations = github_config.get('exclusion_organizations', [])
-        
-        # 转为小写列表
-        exclusion_orgs_lower = [org.lower() for org in exclusion_organizations if org]
-        
-        for org in exclusion_orgs_lower:
-            # 检查company字段
-            if org in company:
-                logger.info(f"❌ {username} 属于排除的组织: {company}")
-                return False
-            
-            # 检查bio中是否标注为该组织的成员
-            if f"{org} team" in bio or f"{org} member" in bio or f"{org} contributor" in bio:
-                logger.info(f"❌ {username} 是 {org} 组织成员")
-                return False
-        
-        # 2. 获取原创仓库
-        original_repos = [r for r in repositories if not r.get('is_fork', False)]
-        
-        # 3. 检查影响力（从配置文件读取阈值）
-        min_followers = github_config.get('min_followers', 100)
-        min_stars = github_config.get('min_stars', 500)
-        
-        followers = user_info.get('followers', 0)
-        total_stars = sum(r.get('stars', 0) for r in original_repos)
-        
-        if followers < min_followers and total_stars < min_stars:
-            logger.info(f"❌ {username} 影响力不足: followers={followers} (需要>={min_followers}), stars={total_stars} (需要>={min_stars})")
-            return False
-        
-        # 4. 检查是否有知名项目的成员标识（从配置读取）
-        # 通过bio、company字段检查是否标注为某个项目的成员
-        bio = (user_info.get('bio') or '').lower()
-        
-        # 使用同样的排除组织列表
-        for project in exclusion_orgs_lower:
-            # 检查是否在bio或company中标注为该项目成员
-            if f"{project} team" in bio or f"{project} member" in bio or f"{project} contributor" in bio:
-                logger.info(f"❌ {username} 是 {project} 项目成员")
-                return False
-            if project in company and ('team' in company or 'member' in company):
-                logger.info(f"❌ {username} 在company中标注为 {project} 成员")
-                return False
-        
-        # 5. 检查是否有AI相关项目（从配置文件读取关键词）
-        core_ai_keywords = github_config.get('core_ai_keywords', [
-            # 默认关键词（如果配置文件中没有）
-            'machine-learning', 'deep-learning', 'neural-network', 'ml-model',
-            'pytorch', 'tensorflow', 'keras', 'scikit-learn',
-            'stable-diffusion', 'diffusion-model', 'text-to-image', 'text-to-video',
-            'image-generation', 'video-generation', 'generative-ai', 'gan',
-            'controlnet', 'animatediff',
-            'gpt', 'llm', 'large-language-model', 'chatbot', 'transformer',
-            'bert', 'nlp', 'natural-language',
-            'computer-vision', 'object-detection', 'image-recognition',
-            'yolo', 'opencv-ai', 'face-recognition'
-        ])
-        
-        has_ai_project = False
-        ai_repo_name = None
-        
-        for repo in original_repos:
-            repo_name = repo.get('repo_name', '').lower()
-            description = repo.get('description', '').lower()
-            language = repo.get('language', '').lower()
-            
-            repo_text = f"{repo_name} {description} {language}"
-            
-            # 检查核心AI关键词（任意一个即可）
-            matched_core = [kw for kw in core_ai_keywords if kw in repo_text]
-            
-            if matched_core:
-                has_ai_project = True
-                ai_repo_name = repo.get('repo_name')
-                logger.info(f"✓ {username} 有AI项目: {ai_repo_name}")
-                logger.info(f"  匹配关键词: {matched_core}")
-                break
-        
-        if not has_ai_project:
-            logger.info(f"❌ {username} 没有明确的AI相关项目")
-            return False
-        
-        logger.info(f"✓ {username} 合格 - 独立开发者 - Followers:{followers}, Stars:{total_stars}")
-        return True
-    
-    def check_is_academic(self, user_info: Dict, repositories: List[Dict]) -> tuple[bool, list, list]:
-        """
-        判断是否为学术人士
-        
-        学术人士特征：
-        1. Bio/Company包含学术机构关键词
-        2. 项目主要是研究性质（论文复现、模型训练、研究工具）
-        3. 深度学习/神经网络相关的研究项目
-        4. 满足影响力要求（followers或stars达到配置阈值）
-        
-        Args:
-            user_info: 用户信息
-            repositories: 仓库列表
-            
-        Returns:
-            (is_academic, academic_indicators, research_areas)
-            - is_academic: 是否为学术人士
-            - academic_indicators: 学术指标列表
-            - research_areas: 研究领域列表
-        """
-        from utils.config_loader import load_config
-        config = load_config()
-        github_config = config.get('github', {})
-        
-        username = user_info.get('username', '')
-        bio = (user_info.get('bio') or '').lower()
-        company = (user_info.get('company') or '').lower()
-        location = (user_info.get('location') or '').lower()
-        
-        academic_indicators = []
-        research_areas = []
-        
-        # 1. 从配置文件读取学术机构关键词
-        academic_keywords = github_config.get('academic_keywords', [
-            'university', 'college', 'institute', 'research', 'lab', 'laboratory',
-            'phd', 'ph.d', 'professor', 'postdoc', 'post-doc', 'student',
-            'academic', 'scholar', 'researcher', 'faculty',
-            '大学', '学院', '研究所', '实验室', '博士', '教授', '研究员', '学者'
-        ])
-        
-        for keyword in academic_keywords:
-            if keyword.lower() in bio or keyword.lower() in company or keyword.lower() in location:
-                academic_indicators.append(f"Profile contains: {keyword}")
-                break
-        
-        # 2. 检查项目特征
-        research_keywords = {
-            'deep-learning': ['deep-learning', 'deep learning', 'deeplearning', 'dl'],
-            'neural-network': ['neural-network', 'neural network', 'neuralnetwork', 'nn'],
-            'machine-learning': ['machine-learning', 'machine learning', 'machinelearning', 'ml'],
-            'computer-vision': ['computer-vision', 'computer vision', 'cv', 'image-processing'],
-            'nlp': ['nlp', 'natural-language', 'natural language processing', 'text-processing'],
-            'reinforcement-learning': ['reinforcement-learning', 'reinforcement learning', 'rl'],
-            'multimodal': ['multimodal', 'multi-modal', 'vision-language', 'vlm'],
-            'transformer': ['transformer', 'attention', 'bert', 'gpt'],
-            'diffusion': ['diffusion', 'stable-diffusion', 'ddpm', 'ddim'],
-            'gan': ['gan', 'generative adversarial', 'stylegan'],
-        }
-        
-        # 从配置文件读取研究项目关键词
-        research_project_indicators = github_config.get('research_project_keywords', [
-            'paper', 'arxiv', 'implementation', 'reproduction', 'reproduce',
-            'research', 'experiment', 'benchmark', 'dataset', 'pretrained',
-            'model', 'training', 'pytorch', 'tensorflow', 'keras',
-            '论文', '复现', '实验', '研究'
-        ])
-        
-        # 统计研究项目数量
-        research_project_count = 0
-        matched_areas = set()
-        
-        for repo in repositories:
-            repo_name = repo.get('repo_name', '').lower()
-            description = repo.get('description', '').lower()
-            repo_text = f"{repo_name} {description}"
-            
-            # 检查是否为研究项目
-            is_research = any(indicator.lower() in repo_text for indicator in research_project_indicators)
-            
-            if is_research:
-                research_project_count += 1
-                
-                # 识别研究领域
-                for area, keywords in research_keywords.items():
-                    if any(kw in repo_text for kw in keywords):
-                        matched_areas.add(area)
-        
-        if research_project_count > 0:
-            academic_indicators.append(f"Research projects: {research_project_count}")
-        
-        if matched_areas:
-            research_areas = list(matched_areas)
-            academic_indicators.append(f"Research areas: {', '.join(research_areas)}")
-        
-        # 3. 判断是否为学术人士
-        # 条件：有学术机构关键词 或 有2个以上研究项目
-        is_academic = len(academic_indicators) > 0 and (
-            any('Profile contains' in ind for ind in academic_indicators) or
-            research_project_count >= 2
-        )
-        
-        if not is_academic:
-            return False, [], []
-        
-        # 4. 检查影响力（从配置文件读取学术人士的阈值）
-        academic_min_followers = github_config.get('academic_min_followers', 50)
-        academic_min_stars = github_config.get('academic_min_stars', 100)
-        
-        followers = user_info.get('followers', 0)
-        original_repos = [r for r in repositories if not r.get('is_fork', False)]
-        total_stars = sum(r.get('stars', 0) for r in original_repos)
-        
-        if followers < academic_min_followers and total_stars < academic_min_stars:
-            logger.info(f"❌ {username} 学术人士影响力不足: followers={followers} (需要>={academic_min_followers}), stars={total_stars} (需要>={academic_min_stars})")
-            return False, [], []
-        
-        logger.info(f"✓ {username} 识别为学术人士")
-        logger.info(f"  学术指标: {academic_indicators}")
-        logger.info(f"  研究领域: {research_areas}")
-        logger.info(f"  影响力: Followers={followers}, Stars={total_stars}")
-        
-        return is_academic, academic_indicators, research_areas
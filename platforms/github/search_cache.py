@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+GitHub仓库搜索结果缓存 - 按 (关键词, 排序方式) 缓存，支持TTL和分策略命中率统计
+"""
+import time
+from typing import List, Dict, Optional
+from utils.ttl_cache import TTLCache
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class GitHubSearchCache:
+    """
+    GitHub搜索结果缓存
+
+    两级缓存：
+    - 内存（本次运行内复用）
+    - 数据库（传入repository时启用，跨运行复用）
+
+    缓存键为规范化后的 (关键词, 排序方式)；缓存的结果数不少于本次请求数时才命中，
+    或者上次搜索结果本身就不足（说明搜索结果已取尽）。
+    """
+
+    def __init__(self, ttl_hours: float = 24, repository=None):
+        self.ttl_seconds = ttl_hours * 3600
+        self.repository = repository
+        self.memory = TTLCache(ttl_seconds=self.ttl_seconds, max_entries=1000)
+
+        if self.repository:
+            self.repository.purge_expired(time.time() - self.ttl_seconds)
+
+    @staticmethod
+    def _make_key(keyword: str, sort: str):
+        """规范化缓存键（GitHub搜索不区分大小写，多余空白不影响结果）"""
+        return (' '.join(keyword.lower().split()), sort or 'stars')
+
+    @staticmethod
+    def _covers(entry: Dict, max_results: int) -> bool:
+        """缓存条目是否足够满足本次请求"""
+        return (entry['max_results'] >= max_results
+                or len(entry['results']) < entry['max_results'])
+
+    def get(self, keyword: str, sort: str, max_results: int, strategy: str = 'default') -> Optional[List[Dict]]:
+        """
+        查询缓存
+
+        Args:
+            keyword: 搜索关键词
+            sort: 排序方式
+            max_results: 本次请求的结果数
+            strategy: 调用的搜索策略（用于命中率统计）
+
+        Returns:
+            命中返回仓库列表（最多max_results个），未命中返回None
+        """
+        key = self._make_key(keyword, sort)
+
+        entry = self.memory.get(key)
+        if entry is None and self.repository:
+            saved = self.repository.get(*key)
+            if saved and time.time() - saved['fetched_ts'] < self.ttl_seconds:
+                entry = saved
+                self.memory.set(key, entry, stored_at=saved['fetched_ts'])
+
+        if entry is not None and self._covers(entry, max_results):
+            self.memory.record(strategy, True)
+            return [dict(repo) for repo in entry['results'][:max_results]]
+
+        self.memory.record(strategy, False)
+        return None
+
+    def put(self, keyword: str, sort: str, max_results: int, results: List[Dict]):
+        """写入缓存（空结果可能是限流导致的，不缓存）"""
+        if not results:
+            return
+
+        key = self._make_key(keyword, sort)
+        fetched_ts = time.time()
+        entry = {'results': results, 'max_results': max_results, 'fetched_ts': fetched_ts}
+        self.memory.set(key, entry, stored_at=fetched_ts)
+
+        if self.repository:
+            self.repository.save(key[0], key[1], max_results, results, fetched_ts)
+
+    def get_hit_rates(self) -> Dict[str, Dict]:
+        """获取各搜索策略的命中率 {strategy: {'hits', 'misses', 'hit_rate'}}"""
+        return self.memory.get_stats()
+
+    def log_report(self):
+        """输出各搜索策略的缓存命中率"""
+        stats = self.get_hit_rates()
+        if not stats:
+            return
+
+        total_hits = sum(s['hits'] for s in stats.values())
+        total = sum(s['hits'] + s['misses'] for s in stats.values())
+
+        logger.info(f"搜索缓存命中率 (TTL: {self.ttl_seconds / 3600:g} 小时):")
+        for strategy, s in sorted(stats.items()):
+            logger.info(f"  {strategy}: {s['hits']}/{s['hits'] + s['misses']} ({s['hit_rate']:.1%})")
+        logger.info(f"  合计: {total_hits}/{total} ({total_hits / total:.1%})，节省 {total_hits} 次搜索请求")
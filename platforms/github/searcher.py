@@ -2,11 +2,16 @@
 """
 GitHub搜索器 - 实现多种搜索策略
 """
+import heapq
+import itertools
 import random
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Optional
 from utils.logger import setup_logger
 from utils.config_loader import load_config
+from utils.keyword_scheduler import KeywordScheduler
 from .scraper import GitHubScraper
+from .search_cache import GitHubSearchCache
+from .candidate_scorer import CandidateScorer
 
 logger = setup_logger()
 
@@ -14,10 +19,13 @@ logger = setup_logger()
 class GitHubSearcher:
     """GitHub搜索器"""
     
-    def __init__(self, scraper: GitHubScraper = None, repository=None):
+    SORT_OPTIONS = ('stars', 'updated', 'forks')
+    
+    def __init__(self, scraper: GitHubScraper = None, repository=None, frontier=None):
         self.scraper = scraper or GitHubScraper()
         self.config = load_config()
         self.repository = repository  # 用于数据库去重
+        self.frontier = frontier  # 爬取边界（断点续爬），为None时不记录断点
         
         # 加载发现策略配置
         github_config = self.config.get('github', {})
@@ -32,10 +40,91 @@ class GitHubSearcher:
         self.deduplication_scope = self.strategy_config.get('deduplication_scope', 'session')
         self.discovered_developers = set() if self.enable_deduplication else None
         
+        # 候选者来源（username -> 关键词/仓库/评分），供discovery层记录discovered_from
+        self.candidate_sources = {}
+        self.keyword_sorts = {}  # 本次运行中关键词使用的排序方式
+        
         if self.enable_deduplication:
             logger.info(f"✓ 去重策略已启用 (范围: {self.deduplication_scope})")
         else:
             logger.info("⊙ 去重策略已禁用")
+        
+        # 搜索结果缓存（有数据库时跨运行复用）
+        cache_config = github_config.get('search_cache', {})
+        self.search_cache = None
+        if cache_config.get('enabled', True):
+            cache_repository = None
+            if repository is not None and getattr(repository, 'db', None) is not None:
+                from storage.repositories.github_search_cache_repository import GitHubSearchCacheRepository
+                cache_repository = GitHubSearchCacheRepository(repository.db)
+            ttl_hours = cache_config.get('ttl_hours', 24)
+            self.search_cache = GitHubSearchCache(ttl_hours=ttl_hours, repository=cache_repository)
+            logger.info(f"✓ 搜索结果缓存已启用 (TTL: {ttl_hours} 小时)")
+        
+        # 关键词调度器（按每次搜索请求的合格产出选择关键词和排序方式，有数据库时持久化）
+        scheduler_config = self.strategy_config.get('keyword_scheduler', {})
+        self.keyword_scheduler = None
+        if scheduler_config.get('enabled', True):
+            stats_repository = None
+            if repository is not None and getattr(repository, 'db', None) is not None:
+                from storage.repositories.keyword_stats_repository import KeywordStatsRepository
+                stats_repository = KeywordStatsRepository(repository.db)
+            self.keyword_scheduler = KeywordScheduler(
+                'github', stats_repository,
+                prior_alpha=scheduler_config.get('prior_alpha', 1.0),
+                prior_beta=scheduler_config.get('prior_beta', 1.0)
+            )
+            logger.info("✓ 关键词调度器已启用 (Thompson采样)")
+    
+    def _search_repositories(self, keyword: str, max_results: int = 10, sort: str = 'stars',
+                             strategy: str = 'default') -> List[Dict]:
+        """
+        搜索仓库（优先使用缓存）
+        
+        Args:
+            keyword: 搜索关键词
+            max_results: 最大结果数
+            sort: 排序方式
+            strategy: 调用的搜索策略名称（用于命中率统计）
+            
+        Returns:
+            仓库列表
+        """
+        if self.search_cache:
+            cached = self.search_cache.get(keyword, sort, max_results, strategy=strategy)
+            if cached is not None:
+                logger.info(f"  ⚡ 命中搜索缓存: {keyword} (排序: {sort}, {len(cached)} 个仓库)")
+                return cached
+        
+        repositories = self.scraper.search_repositories(keyword, max_results=max_results, sort=sort)
+        
+        if self.search_cache:
+            self.search_cache.put(keyword, sort, max_results, repositories)
+        
+        return repositories
+    
+    def log_search_cache_report(self):
+        """输出搜索缓存的分策略命中率"""
+        if self.search_cache:
+            self.search_cache.log_report()
+    
+    def record_candidate_outcome(self, username: str, qualified: bool):
+        """
+        记录候选者的分析结果，合格时计入来源关键词+排序方式的产出
+        
+        Args:
+            username: 开发者用户名
+            qualified: 是否为合格的商业开发者
+        """
+        source = self.candidate_sources.get(username)
+        if not source or not qualified or not self.keyword_scheduler:
+            return
+        self.keyword_scheduler.record_yield(source['keyword'], source.get('sort') or '')
+    
+    def log_keyword_report(self):
+        """输出关键词调度统计"""
+        if self.keyword_scheduler:
+            self.keyword_scheduler.log_report()
     
     def _should_add_developer(self, username: str) -> bool:
         """
@@ -142,10 +231,11 @@ class GitHubSearcher:
             sort = random.choice(sort_options)
             
             # 搜索仓库
-            repositories = self.scraper.search_repositories(
+            repositories = self._search_repositories(
                 keyword, 
                 max_results=max_results_per_keyword,
-                sort=sort
+                sort=sort,
+                strategy='projects'
             )
             
             # 提取owner和贡献者
@@ -230,7 +320,7 @@ class GitHubSearcher:
             logger.info(f"搜索: {topic}")
             
             # 搜索awesome仓库
-            repositories = self.scraper.search_repositories(topic, max_results=5)
+            repositories = self._search_repositories(topic, max_results=5, strategy='awesome_lists')
             
             # 获取每个仓库的贡献者和starred用户
             for repo in repositories:
@@ -286,7 +376,7 @@ class GitHubSearcher:
                 query = f"{keyword} language:{language}"
                 logger.info(f"探索: {query}")
                 
-                repositories = self.scraper.search_repositories(query, max_results=10)
+                repositories = self._search_repositories(query, max_results=10, strategy='explore')
                 
                 for repo in repositories:
                     username = repo.get('owner_username')
@@ -335,7 +425,7 @@ class GitHubSearcher:
             query = f"topic:{topic}"
             logger.info(f"搜索topic: {topic}")
             
-            repositories = self.scraper.search_repositories(query, max_results=max_per_topic)
+            repositories = self._search_repositories(query, max_results=max_per_topic, strategy='topics')
             
             for repo in repositories:
                 username = repo.get('owner_username')
@@ -407,10 +497,11 @@ class GitHubSearcher:
             sort = random.choice(sort_options)
             
             # 搜索优质项目
-            repositories = self.scraper.search_repositories(
+            repositories = self._search_repositories(
                 keyword, 
                 max_results=10,  # 增加到10个
-                sort=sort
+                sort=sort,
+                strategy='quality_projects'
             )
             
             # 随机打乱仓库顺序
@@ -493,34 +584,390 @@ class GitHubSearcher:
         return developer_list
     
     def _is_organization(self, username: str) -> bool:
+        """简单判断是否为组织账号（与分析器预筛选使用同一启发式规则）"""
+        return GitHubScraper.is_organization_account(username)
+    
+    def _order_keywords_for_resume(self, keywords: List[str]) -> List[str]:
         """
-        简单判断是否为组织账号
+        按断点状态排列关键词
+
+        - 未完成（in_progress）的关键词排在最前面，从断点继续
+        - 已完成（completed）和没有搜索结果（skipped）的关键词跳过
+        - 其余关键词随机打乱
+        - 所有关键词都已完成时清空边界，开始新一轮
+
+        只在未启用关键词调度器时使用（轮询）；启用调度器时由调度器决定重新访问哪些关键词
+        """
+        keyword_states = self.frontier.get_keyword_states()
+        
+        pending = [kw for kw in keywords if kw not in keyword_states]
+        in_progress = [kw for kw in keywords
+                       if keyword_states.get(kw, {}).get('status') == 'in_progress']
         
-        启发式规则：
-        - 包含公司常见后缀
-        - 全大写
-        - 包含数字和特殊字符组合
+        if not pending and not in_progress:
+            logger.info("✓ 上一轮所有关键词已处理完，重置断点，开始新一轮")
+            self.frontier.reset()
+            pending = keywords.copy()
+        
+        random.shuffle(pending)
+        
+        if in_progress:
+            logger.info(f"⟳ 从断点恢复: {len(in_progress)} 个未完成关键词, "
+                       f"{len(keywords) - len(pending) - len(in_progress)} 个已完成关键词将跳过")
+        
+        return in_progress + pending
+    
+    def _load_keyword_repositories(self, keyword: str):
         """
-        org_indicators = ['inc', 'corp', 'company', 'team', 'lab', 'labs', 'ai', 'tech']
-        username_lower = username.lower()
+        获取关键词的仓库列表（有未完成的断点时复用已保存的搜索结果）
         
-        # 检查是否包含组织指示词
-        for indicator in org_indicators:
-            if indicator in username_lower and len(username) > 10:
-                return True
+        Returns:
+            (repositories, sort): 仓库列表和排序方式
+        """
+        if self.frontier:
+            state = self.frontier.get_repository_state(keyword, '')
+            if state and state.get('status') != 'in_progress':
+                # 已处理完的关键词被调度器选中重新访问：清除旧进度，重新搜索
+                self.frontier.reset_keyword(keyword)
+            saved_repos = self.frontier.get_keyword_repositories(keyword)
+            if saved_repos:
+                sort = saved_repos[0].get('sort') or 'stars'
+                repositories = [{'repo_name': row['repo_name'], 'stars': row['repo_stars'] or 0}
+                               for row in saved_repos]
+                self.keyword_sorts[keyword] = sort
+                logger.info(f"⟳ 复用已保存的搜索结果: {len(repositories)} 个仓库 (排序: {sort})")
+                return repositories, sort
+        
+        # 排序方式：调度器已选定时使用调度结果，否则随机选择
+        sort = self.keyword_sorts.get(keyword) or random.choice(self.SORT_OPTIONS)
+        self.keyword_sorts[keyword] = sort
+        
+        # 记录一次搜索请求（调度器按每次请求的合格产出评估关键词）
+        # 缓存命中同样计为一次搜索（与YouTube一致）：缓存结果中的合格开发者也会计入该关键词的产出
+        if self.keyword_scheduler:
+            self.keyword_scheduler.record_request(keyword, sort)
+        
+        # 搜索仓库（一次性搜索10个，存起来）
+        repositories = self._search_repositories(
+            keyword, 
+            max_results=10,
+            sort=sort,
+            strategy='depth_first_generator'
+        )
+        
+        if self.frontier and repositories:
+            self.frontier.start_keyword(keyword, sort, repositories)
+        
+        return repositories, sort
+    
+    def _load_contributors(self, keyword: str, repo_name: str):
+        """
+        获取仓库贡献者（有断点时复用已保存的列表和偏移量）
         
-        # 全大写可能是组织
-        if username.isupper() and len(username) > 3:
-            return True
+        Returns:
+            (contributors, error_msg, offset): 贡献者列表、错误信息、已消费的偏移量
+        """
+        if self.frontier:
+            state = self.frontier.get_repository_state(keyword, repo_name)
+            if state and state.get('contributors'):
+                contributors = self.frontier.load_contributors(state)
+                offset = state.get('contributor_offset') or 0
+                if contributors:
+                    logger.info(f"  ⟳ 复用已保存的 {len(contributors)} 个贡献者，从第 {offset + 1} 个继续")
+                    return contributors, "", offset
+        
+        contributors, error_msg = self.scraper.get_repository_contributors(repo_name)
+        
+        if self.frontier and contributors:
+            self.frontier.save_contributors(keyword, repo_name, contributors)
+        
+        return contributors, error_msg, 0
+    
+    def _mark_repository(self, keyword: str, repo_name: str, status: str):
+        """记录仓库处理状态（仅在启用断点时）"""
+        if self.frontier and repo_name:
+            self.frontier.update_repository_status(keyword, repo_name, status)
+    
+    def _build_candidate_scorer(self):
+        """创建候选者评分器（加载历史合格率），未启用时返回None"""
+        priority_config = self.strategy_config.get('candidate_priority', {})
+        if not priority_config.get('enabled', True):
+            return None
+        
+        scorer = CandidateScorer(
+            weights=priority_config.get('weights'),
+            prior_strength=priority_config.get('prior_strength', 10.0)
+        )
+        
+        if self.repository is not None and hasattr(self.repository, 'get_source_statistics'):
+            try:
+                source_stats = self.repository.get_source_statistics()
+                if isinstance(source_stats, dict):
+                    scorer.load_history(source_stats)
+            except Exception as e:
+                logger.warning(f"加载历史合格率失败，仅使用贡献度评分: {e}")
+        
+        return scorer
+    
+    def _in_progress_keywords(self) -> Set[str]:
+        """断点中未完成的关键词"""
+        if not self.frontier:
+            return set()
+        return {kw for kw, row in self.frontier.get_keyword_states().items()
+                if row.get('status') == 'in_progress'}
+    
+    def _order_keywords_by_yield(self, keywords: List[str], scorer: CandidateScorer) -> List[str]:
+        """按历史合格率排列关键词（未完成的断点关键词仍排在最前，同分保持原有随机顺序）"""
+        in_progress = self._in_progress_keywords()
+        return sorted(keywords, key=lambda kw: (kw not in in_progress, -scorer.keyword_score(kw)))
+    
+    def _order_keywords_by_scheduler(self, keywords: List[str]) -> List[str]:
+        """
+        按关键词调度器（Thompson采样）排列关键词，同时选定每个关键词的排序方式
         
-        return False
+        未完成的断点关键词仍排在最前（排序方式沿用已保存的搜索结果）；
+        其余关键词（包括上一轮已完成的）都参与采样，产出高的关键词可以被更频繁地重新访问
+        """
+        in_progress = self._in_progress_keywords()
+        ranked = self.keyword_scheduler.rank(
+            [kw for kw in keywords if kw not in in_progress], sorts=self.SORT_OPTIONS
+        )
+        for keyword, sort in ranked:
+            self.keyword_sorts[keyword] = sort
+        
+        return [kw for kw in keywords if kw in in_progress] + [keyword for keyword, _ in ranked]
+    
+    def _remember_source(self, username: str, keyword: str, repo: Dict, contrib_info: Dict, score=None):
+        """记录候选者来源，供discovery层写入discovered_from"""
+        self.candidate_sources[username] = {
+            'keyword': keyword,
+            'repo_name': repo.get('repo_name'),
+            'repo_stars': repo.get('stars', 0),
+            'commits': contrib_info.get('commits', 0),
+            'rank': contrib_info.get('rank'),
+            'score': score,
+            'sort': self.keyword_sorts.get(keyword, ''),
+        }
+    
+    def get_candidate_source(self, username: str) -> Optional[Dict]:
+        """获取候选者来源（关键词、仓库、评分），未知返回None"""
+        return self.candidate_sources.get(username)
+    
+    def _prepare_repository(self, keyword: str, repo_idx: int, total_repos: int, repo: Dict):
+        """
+        准备仓库的贡献者列表
+        
+        Returns:
+            (contributors, offset)；仓库已处理、星标不足或获取失败时返回None
+        """
+        repo_name = repo.get('repo_name')
+        stars = repo.get('stars', 0)
+        
+        # 断点：跳过已处理完的仓库
+        if self.frontier and repo_name:
+            state = self.frontier.get_repository_state(keyword, repo_name)
+            if state and state.get('status') in ('completed', 'skipped', 'failed'):
+                logger.info(f"  ⊙ 仓库 [{repo_idx}/{total_repos}]: {repo_name} - 上次已处理，跳过")
+                return None
+        
+        # 过滤低星仓库（使用配置的最低星标要求）
+        if stars < self.min_repo_stars:
+            logger.info(f"  ⊙ 仓库 [{repo_idx}/{total_repos}]: {repo_name} ({stars} ⭐) - 跳过低星仓库")
+            self._mark_repository(keyword, repo_name, 'skipped')
+            return None
+        
+        logger.info(f"\n{'─'*60}")
+        logger.info(f"仓库 [{repo_idx}/{total_repos}]: {repo_name} ({stars} ⭐)")
+        logger.info(f"{'─'*60}")
+        
+        # 直接获取贡献者（不分析 Owner）
+        if not repo_name:
+            logger.info(f"  ⊙ 仓库名称无效，跳过")
+            return None
+        
+        # 打印获取贡献者的日志
+        logger.info(f"  📡 开始获取贡献者...")
+        
+        # 获取所有贡献者
+        contributors, error_msg, offset = self._load_contributors(keyword, repo_name)
+        
+        if not contributors:
+            logger.warning(f"  ✗ 获取贡献者失败: {error_msg}")
+            if "202" in error_msg:
+                logger.info(f"     说明：GitHub正在异步生成贡献者数据，这是正常现象")
+                logger.info(f"     解决：等待几分钟后，该仓库的数据会准备好")
+            logger.info(f"     查看：https://github.com/{repo_name}/graphs/contributors")
+            self._mark_repository(keyword, repo_name, 'failed')
+            return None
+        
+        logger.info(f"  ✓ 成功获取 {len(contributors)} 个贡献者")
+        return contributors, offset
+    
+    def _iterate_depth_first(self, keyword: str, repositories: List[Dict], budget: int, discovered_base: int):
+        """
+        深度优先返回关键词下的候选者：一个仓库的所有贡献者都返回完才换下一个仓库
+        
+        Returns（生成器返回值）:
+            (keyword_finished, yielded): 关键词是否已全部处理完、返回的候选者数
+        """
+        from utils.crawler_status import should_stop
+        
+        yielded = 0
+        keyword_finished = True
+        
+        for repo_idx, repo in enumerate(repositories, 1):
+            # 检查停止标志
+            if should_stop():
+                logger.warning(f"\n⚠️ 检测到停止信号，停止处理仓库")
+                return False, yielded
+            
+            if yielded >= budget:
+                logger.info(f"\n已达到最大尝试次数，停止")
+                keyword_finished = False
+                break
+            
+            prepared = self._prepare_repository(keyword, repo_idx, len(repositories), repo)
+            if not prepared:
+                continue
+            
+            contributors, offset = prepared
+            repo_name = repo['repo_name']
+            total_contributors = len(contributors)
+            
+            # 逐个返回贡献者
+            repo_yield_count = 0
+            repo_finished = True
+            for contrib_idx, contrib_info in enumerate(contributors, 1):
+                # 断点：跳过上次已消费的贡献者
+                if contrib_idx <= offset:
+                    continue
+                
+                if yielded >= budget:
+                    repo_finished = False
+                    break
+                
+                username = contrib_info['username']
+                commits = contrib_info['commits']
+                rank = contrib_info['rank']
+                
+                if not self._is_organization(username):
+                    if self._should_add_developer(username):
+                        yielded += 1
+                        repo_yield_count += 1
+                        # 显示当前仓库进度：已处理/总数
+                        remaining = total_contributors - contrib_idx
+                        source_info = f"Contributor #{rank} of {repo_name} ({commits} commits, 剩余{remaining}个)"
+                        self._remember_source(username, keyword, repo, contrib_info)
+                        logger.info(f"  → 返回贡献者 [{contrib_idx}/{total_contributors}]: {username} (排名#{rank}, {commits} commits, 剩余 {remaining} 个)")
+                        yield (username, source_info)
+                        
+                        # 调用方请求下一个 = 上一个已消费完毕
+                        # 停止时不记录断点，下次重新返回该候选者（已入库的会被discovery层跳过）
+                        if should_stop():
+                            return False, yielded
+                        if self.frontier:
+                            self.frontier.checkpoint(keyword, repo_name, contrib_idx)
+            
+            if repo_finished:
+                self._mark_repository(keyword, repo_name, 'completed')
+            else:
+                keyword_finished = False
+            
+            logger.info(f"  ✓ 该仓库返回了 {repo_yield_count} 个新开发者")
+            logger.info(f"  累计已发现: {discovered_base + yielded} 个")
+        
+        return keyword_finished, yielded
+    
+    def _iterate_by_priority(self, keyword: str, repositories: List[Dict], scorer: CandidateScorer,
+                             budget: int, discovered_base: int):
+        """
+        按预估合格率返回关键词下的候选者
+        
+        先获取关键词下所有仓库的贡献者（每个仓库一次请求），再按评分从高到低返回。
+        每个仓库的贡献者按原顺序依次进入优先队列（多路归并），
+        因此每个仓库已消费的仍是列表前缀，断点偏移量照常记录。
+        
+        Returns（生成器返回值）:
+            (keyword_finished, yielded): 关键词是否已全部处理完、返回的候选者数
+        """
+        from utils.crawler_status import should_stop
+        
+        heap = []
+        sequence = itertools.count()
+        
+        def push_next(state):
+            """把仓库的下一个贡献者放入队列，没有剩余时标记仓库完成"""
+            if state['pos'] >= len(state['contributors']):
+                self._mark_repository(keyword, state['repo']['repo_name'], 'completed')
+                logger.info(f"  ✓ 仓库 {state['repo']['repo_name']} 处理完，返回了 {state['yielded']} 个新开发者")
+                return
+            contrib_info = state['contributors'][state['pos']]
+            score = scorer.score(contrib_info, state['repo'].get('stars', 0), keyword, state['repo']['repo_name'])
+            heapq.heappush(heap, (-score, next(sequence), state))
+        
+        yielded = 0
+        total_candidates = 0
+        for repo_idx, repo in enumerate(repositories, 1):
+            if should_stop():
+                logger.warning(f"\n⚠️ 检测到停止信号，停止处理仓库")
+                return False, yielded
+            
+            prepared = self._prepare_repository(keyword, repo_idx, len(repositories), repo)
+            if not prepared:
+                continue
+            
+            contributors, offset = prepared
+            total_candidates += len(contributors) - offset
+            push_next({'repo': repo, 'contributors': contributors, 'pos': offset, 'yielded': 0})
+        
+        if heap:
+            logger.info(f"\n✓ 共 {total_candidates} 个候选者，按预估合格率排序后逐个分析...")
+        
+        while heap:
+            if yielded >= budget:
+                logger.info(f"\n已达到最大尝试次数，停止")
+                return False, yielded
+            
+            neg_score, _, state = heapq.heappop(heap)
+            repo = state['repo']
+            repo_name = repo['repo_name']
+            contrib_info = state['contributors'][state['pos']]
+            state['pos'] += 1
+            
+            username = contrib_info['username']
+            if not self._is_organization(username) and self._should_add_developer(username):
+                yielded += 1
+                state['yielded'] += 1
+                score = -neg_score
+                source_info = f"Contributor #{contrib_info['rank']} of {repo_name} ({contrib_info['commits']} commits, 优先级 {score:.2f})"
+                self._remember_source(username, keyword, repo, contrib_info, score)
+                logger.info(f"  → 返回贡献者: {username} (优先级 {score:.2f}, {repo_name} 排名#{contrib_info['rank']}, "
+                           f"{contrib_info['commits']} commits, 累计 {discovered_base + yielded} 个)")
+                yield (username, source_info)
+                
+                # 停止时不记录断点，下次重新返回该候选者
+                if should_stop():
+                    return False, yielded
+                if self.frontier:
+                    self.frontier.checkpoint(keyword, repo_name, state['pos'])
+            
+            push_next(state)
+        
+        return True, yielded
     
     def discover_developers_generator(self, target_qualified: int, max_attempts: int = 500):
         """
         发现开发者生成器 - 逐个返回候选者
         
-        策略：深度优先，一个仓库的所有贡献者都返回完才换下一个仓库
-        这样discovery层可以逐个分析，一个仓库分析完才换下一个
+        策略：
+        - 默认按预估合格率排序（贡献度、仓库星标、仓库/关键词历史合格率），
+          合格率高的候选者先分析，用更少的主页请求达到目标数量
+        - 关闭candidate_priority时为深度优先：一个仓库的所有贡献者都返回完才换下一个仓库
+        
+        断点续爬（传入frontier时启用）：
+        - 关键词的搜索结果和仓库的贡献者列表保存到数据库
+        - 每个候选者被消费后（调用方请求下一个时）记录偏移量
+        - 重新运行时从上次停止的关键词/仓库/贡献者继续，不再重复请求
         
         Args:
             target_qualified: 目标合格开发者数量
@@ -529,7 +976,9 @@ class GitHubSearcher:
         Yields:
             (username, source_info) 元组：开发者用户名和来源信息
         """
-        logger.info(f"开始深度优先发现（生成器模式），目标: {target_qualified} 个合格开发者")
+        from utils.crawler_status import should_stop
+        
+        logger.info(f"开始发现开发者（生成器模式），目标: {target_qualified} 个合格开发者")
         
         # 从配置文件读取搜索关键词
         github_config = self.config.get('github', {})
@@ -538,17 +987,32 @@ class GitHubSearcher:
             'awesome-generative-ai', 'awesome-stable-diffusion'
         ])
         
-        # 随机打乱关键词顺序
-        keywords = keywords.copy()
-        random.shuffle(keywords)
-        
-        logger.info(f"使用 {len(keywords)} 个关键词搜索（深度优先，已随机打乱）")
+        if self.frontier and self.keyword_scheduler:
+            # 断点只用于恢复未完成的关键词，重新访问哪些关键词由调度器决定（不按轮次跳过已完成的）
+            keywords = keywords.copy()
+            logger.info(f"使用 {len(keywords)} 个关键词搜索（断点续爬已启用）")
+        elif self.frontier:
+            keywords = self._order_keywords_for_resume(keywords)
+            logger.info(f"使用 {len(keywords)} 个关键词搜索（断点续爬已启用）")
+        else:
+            # 随机打乱关键词顺序
+            keywords = keywords.copy()
+            random.shuffle(keywords)
+            logger.info(f"使用 {len(keywords)} 个关键词搜索（已随机打乱）")
+        
+        scorer = self._build_candidate_scorer()
+        if self.keyword_scheduler:
+            keywords = self._order_keywords_by_scheduler(keywords)
+            logger.info(f"✓ 关键词按调度器排序: {', '.join(keywords[:5])}{'...' if len(keywords) > 5 else ''}")
+        elif scorer:
+            keywords = self._order_keywords_by_yield(keywords, scorer)
+        if scorer:
+            logger.info("✓ 候选者优先级排序已启用")
         
         discovered_count = 0
         
         for keyword_idx, keyword in enumerate(keywords, 1):
             # 检查停止标志
-            from utils.crawler_status import should_stop
             if should_stop():
                 logger.warning(f"\n⚠️ 检测到停止信号，停止搜索")
                 break
@@ -561,94 +1025,34 @@ class GitHubSearcher:
             logger.info(f"[{keyword_idx}/{len(keywords)}] 搜索关键词: {keyword}")
             logger.info(f"{'='*60}")
             
-            # 随机选择排序方式
-            sort_options = ['stars', 'updated', 'forks']
-            sort = random.choice(sort_options)
-            
-            # 搜索仓库（一次性搜索10个，存起来）
-            repositories = self.scraper.search_repositories(
-                keyword, 
-                max_results=10,
-                sort=sort
-            )
+            repositories, sort = self._load_keyword_repositories(keyword)
             
             if not repositories:
                 logger.info(f"  未找到仓库，跳过该关键词")
+                # 记录为本轮已跳过，否则该关键词一直处于待处理状态，断点永远不会重置
+                if self.frontier:
+                    self.frontier.skip_keyword(keyword, sort)
                 continue
             
-            logger.info(f"✓ 找到 {len(repositories)} 个仓库，开始逐个深度挖掘...")
+            logger.info(f"✓ 找到 {len(repositories)} 个仓库，开始挖掘...")
             
-            # 逐个处理仓库（深度优先）
-            for repo_idx, repo in enumerate(repositories, 1):
-                # 检查停止标志
-                from utils.crawler_status import should_stop
-                if should_stop():
-                    logger.warning(f"\n⚠️ 检测到停止信号，停止处理仓库")
-                    return
-                
-                if discovered_count >= max_attempts:
-                    logger.info(f"\n已达到最大尝试次数，停止")
-                    break
-                
-                repo_name = repo.get('repo_name')
-                stars = repo.get('stars', 0)
-                
-                # 过滤低星仓库（使用配置的最低星标要求）
-                if stars < self.min_repo_stars:
-                    logger.info(f"  ⊙ 仓库 [{repo_idx}/{len(repositories)}]: {repo_name} ({stars} ⭐) - 跳过低星仓库")
-                    continue
-                
-                logger.info(f"\n{'─'*60}")
-                logger.info(f"仓库 [{repo_idx}/{len(repositories)}]: {repo_name} ({stars} ⭐)")
-                logger.info(f"{'─'*60}")
-                
-                # 直接获取贡献者（不分析 Owner）
-                if not repo_name:
-                    logger.info(f"  ⊙ 仓库名称无效，跳过")
-                    continue
-                
-                # 打印获取贡献者的日志
-                logger.info(f"  📡 开始获取贡献者...")
-                
-                # 获取所有贡献者
-                contributors, error_msg = self.scraper.get_repository_contributors(repo_name)
-                
-                if not contributors:
-                    logger.warning(f"  ✗ 获取贡献者失败: {error_msg}")
-                    if "202" in error_msg:
-                        logger.info(f"     说明：GitHub正在异步生成贡献者数据，这是正常现象")
-                        logger.info(f"     解决：等待几分钟后，该仓库的数据会准备好")
-                    logger.info(f"     查看：https://github.com/{repo_name}/graphs/contributors")
-                    continue
-                
-                total_contributors = len(contributors)
-                logger.info(f"  ✓ 成功获取 {total_contributors} 个贡献者，逐个分析...")
-                
-                # 逐个返回贡献者（深度优先：一个仓库的所有贡献者都返回完才换下一个）
-                repo_yield_count = 0
-                for contrib_idx, contrib_info in enumerate(contributors, 1):
-                    if discovered_count >= max_attempts:
-                        break
-                    
-                    username = contrib_info['username']
-                    commits = contrib_info['commits']
-                    rank = contrib_info['rank']
-                    
-                    if not self._is_organization(username):
-                        if self._should_add_developer(username):
-                            discovered_count += 1
-                            repo_yield_count += 1
-                            # 显示当前仓库进度：已处理/总数
-                            remaining = total_contributors - contrib_idx
-                            source_info = f"Contributor #{rank} of {repo_name} ({commits} commits, 剩余{remaining}个)"
-                            logger.info(f"  → 返回贡献者 [{contrib_idx}/{total_contributors}]: {username} (排名#{rank}, {commits} commits, 剩余 {remaining} 个)")
-                            yield (username, source_info)
-                
-                logger.info(f"  ✓ 该仓库返回了 {repo_yield_count} 个新开发者")
-                logger.info(f"  累计已发现: {discovered_count} 个")
+            budget = max_attempts - discovered_count
+            if scorer:
+                candidates = self._iterate_by_priority(keyword, repositories, scorer, budget, discovered_count)
+            else:
+                candidates = self._iterate_depth_first(keyword, repositories, budget, discovered_count)
+            
+            keyword_finished, yielded = yield from candidates
+            discovered_count += yielded
+            
+            if should_stop():
+                return
+            
+            if self.frontier and keyword_finished:
+                self.frontier.complete_keyword(keyword)
         
         logger.info(f"\n{'='*60}")
-        logger.info(f"深度优先搜索完成，共发现 {discovered_count} 个独特的开发者")
+        logger.info(f"搜索完成，共发现 {discovered_count} 个独特的开发者")
         logger.info(f"{'='*60}")
     
     def discover_developers(self, limit: int = 100, current_qualified: int = 0) -> List[str]:
@@ -736,10 +1140,11 @@ class GitHubSearcher:
             sort = random.choice(sort_options)
             
             # 搜索仓库
-            repositories = self.scraper.search_repositories(
+            repositories = self._search_repositories(
                 keyword, 
                 max_results=10,
-                sort=sort
+                sort=sort,
+                strategy='depth_first'
             )
             
             if not repositories:
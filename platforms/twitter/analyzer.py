@@ -37,14 +37,12 @@ class TwitterAnalyzer:
         """
         logger.info(f"开始分析用户: @{username}")
         
-        # 获取用户信息
-        user_info = self.scraper.get_user_info(username)
+        # 加载一次主页，同时获取用户信息和最近推文
+        user_info, tweets = self.scraper.get_profile_with_tweets(username, limit=self.sample_tweet_count)
         if not user_info:
             logger.error(f"无法获取用户信息: @{username}")
             return {'status': 'failed', 'reason': '无法获取用户信息'}
         
-        # 获取最近推文
-        tweets = self.scraper.get_user_tweets(username, limit=self.sample_tweet_count)
         if not tweets:
             logger.warning(f"无法获取推文: @{username}")
             return {'status': 'failed', 'reason': '无法获取推文'}
@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+"""
+WebDriver浏览器池 - 复用常驻的无头Chrome，任务启动时不再重新解析驱动和启动浏览器
+
+- ChromeDriver路径只解析一次（ChromeDriverManager().install()可能访问网络），并缓存到磁盘跨运行复用；启动时版本不匹配则清除缓存重新解析
+- 保持最多size个浏览器，取出前做健康检查，失效的浏览器关闭后重建
+- 每个浏览器打开max_pages个页面后回收重建，避免内存持续增长
+- 每个任务（线程）通过checkout()独占一个浏览器，归还时清除Cookie
+"""
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+from utils.config_loader import get_project_root, load_config
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+# ChromeDriver路径的磁盘缓存
+DRIVER_PATH_CACHE = 'data/cache/chromedriver_path'
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def resolve_driver_path(cache_file: str = DRIVER_PATH_CACHE, refresh: bool = False) -> str:
+    """
+    ChromeDriver可执行文件路径（进程内只解析一次；磁盘缓存的路径仍存在时不调用webdriver-manager）
+
+    refresh=True时丢弃进程内和磁盘上的缓存，重新调用webdriver-manager解析（Chrome升级后旧驱动版本不匹配）
+    """
+    global _driver_path
+    with _driver_path_lock:
+        cache_path = cache_file if os.path.isabs(cache_file) else os.path.join(get_project_root(), cache_file)
+        if refresh:
+            _driver_path = None
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+
+        if _driver_path and os.path.exists(_driver_path):
+            return _driver_path
+
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = f.read().strip()
+            if cached and os.path.exists(cached):
+                _driver_path = cached
+                return _driver_path
+        except OSError:
+            pass
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        _driver_path = ChromeDriverManager().install()
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                f.write(_driver_path)
+        except OSError as e:
+            logger.debug(f"写入ChromeDriver路径缓存失败: {e}")
+        logger.info(f"ChromeDriver路径: {_driver_path}")
+        return _driver_path
+
+
+def create_chrome_driver():
+    """启动一个无头Chrome"""
+    from selenium import webdriver
+    from selenium.common.exceptions import SessionNotCreatedException
+    from selenium.webdriver.chrome.service import Service
+
+    options = webdriver.ChromeOptions()
+
+    # 基础选项
+    options.add_argument('--headless=new')  # 新版无头模式
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--window-size=1920,1080')
+
+    # 反检测选项
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+
+    # User Agent
+    options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+    # 禁用图片和CSS加载以提高速度
+    prefs = {
+        'profile.managed_default_content_settings.images': 2,
+        'profile.managed_default_content_settings.stylesheets': 2,
+    }
+    options.add_experimental_option('prefs', prefs)
+
+    try:
+        try:
+            driver = webdriver.Chrome(service=Service(resolve_driver_path()), options=options)
+        except SessionNotCreatedException as e:
+            # 缓存的驱动与已安装的Chrome版本不匹配：清除路径缓存，重新解析后重试一次
+            logger.warning(f"ChromeDriver与Chrome版本不匹配，重新解析驱动后重试: {e}")
+            driver = webdriver.Chrome(service=Service(resolve_driver_path(refresh=True)), options=options)
+    except Exception as e:
+        logger.error(f"Selenium WebDriver 初始化失败: {e}")
+        logger.info("提示: 请确保已安装 Chrome 浏览器")
+        raise
+
+    # 执行CDP命令隐藏webdriver特征
+    driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+        'source': '''
+            Object.defineProperty(navigator, 'webdriver', {
+                get: () => undefined
+            })
+        '''
+    })
+
+    logger.info("Selenium WebDriver 初始化成功")
+    return driver
+
+
+class PooledBrowser:
+    """池中的一个浏览器（取出期间由一个任务独占）"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.time()
+
+    def navigate(self, url: str):
+        """打开页面并计数（达到max_pages后归还时回收）"""
+        self.driver.get(url)
+        self.pages += 1
+
+
+class WebDriverPool:
+    """
+    WebDriver浏览器池（线程安全）
+
+    所有浏览器都被取出时，checkout等待其他任务归还（最多wait_timeout秒）
+    """
+
+    def __init__(self, size: int = 2, max_pages: int = 50, wait_timeout: float = 300,
+                 factory: Optional[Callable] = None):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.wait_timeout = wait_timeout
+        self._factory = factory or create_chrome_driver
+        self._idle = []
+        self._total = 0  # 空闲 + 已取出 + 正在创建
+        self._closed = False
+        self._cond = threading.Condition()
+        self.stats = {'created': 0, 'reused': 0, 'recycled': 0, 'unhealthy': 0}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'WebDriverPool':
+        """由twitter.driver_pool配置创建"""
+        return cls(
+            size=config.get('size', 2),
+            max_pages=config.get('max_pages', 50),
+            wait_timeout=config.get('wait_timeout', 300)
+        )
+
+    def _create(self) -> PooledBrowser:
+        try:
+            browser = PooledBrowser(self._factory())
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self.stats['created'] += 1
+        return browser
+
+    @staticmethod
+    def _quit(browser: PooledBrowser):
+        try:
+            browser.driver.quit()
+        except Exception as e:
+            logger.debug(f"关闭浏览器失败: {e}")
+
+    @staticmethod
+    def is_healthy(browser: PooledBrowser) -> bool:
+        """浏览器进程和会话是否仍可用"""
+        try:
+            return browser.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def warm_up(self, count: Optional[int] = None):
+        """预先启动浏览器（默认启动到size个）"""
+        count = self.size if count is None else min(count, self.size)
+        while True:
+            with self._cond:
+                if self._closed or self._total >= count:
+                    return
+                self._total += 1
+            browser = self._create()
+            self._release(browser)
+
+    def warm_up_async(self):
+        """在后台线程中预先启动浏览器"""
+        def run():
+            try:
+                self.warm_up()
+            except Exception as e:
+                logger.warning(f"预启动浏览器失败: {e}")
+
+        threading.Thread(target=run, name='webdriver-warm-up', daemon=True).start()
+
+    def _acquire(self) -> PooledBrowser:
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            with self._cond:
+                while not self._idle and self._total >= self.size:
+                    if self._closed:
+                        raise RuntimeError("浏览器池已关闭")
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"等待空闲浏览器超时（{self.wait_timeout} 秒）")
+                    self._cond.wait(remaining)
+                if self._closed:
+                    raise RuntimeError("浏览器池已关闭")
+                browser = self._idle.pop() if self._idle else None
+                if browser is None:
+                    self._total += 1
+
+            if browser is None:
+                return self._create()
+
+            if self.is_healthy(browser):
+                with self._cond:
+                    self.stats['reused'] += 1
+                return browser
+
+            logger.warning("浏览器健康检查失败，重新启动")
+            self._quit(browser)
+            with self._cond:
+                self.stats['unhealthy'] += 1
+                self._total -= 1
+                self._cond.notify()
+
+    def _release(self, browser: PooledBrowser):
+        if browser.pages >= self.max_pages:
+            logger.debug(f"浏览器已打开 {browser.pages} 个页面，回收")
+            self._discard(browser, 'recycled')
+            return
+
+        try:
+            browser.driver.delete_all_cookies()
+        except Exception:
+            self._discard(browser, 'unhealthy')
+            return
+
+        with self._cond:
+            if self._closed:
+                self._total -= 1
+            else:
+                self._idle.append(browser)
+                browser = None
+            self._cond.notify()
+        if browser is not None:
+            self._quit(browser)
+
+    def _discard(self, browser: PooledBrowser, reason: str):
+        self._quit(browser)
+        with self._cond:
+            self.stats[reason] += 1
+            self._total -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def checkout(self):
+        """取出一个浏览器独占使用，用完归还"""
+        browser = self._acquire()
+        try:
+            yield browser
+        finally:
+            self._release(browser)
+
+    def idle_count(self) -> int:
+        with self._cond:
+            return len(self._idle)
+
+    def close(self):
+        """关闭所有空闲浏览器（已取出的在归还时关闭）"""
+        with self._cond:
+            self._closed = True
+            browsers, self._idle = self._idle, []
+            self._total -= len(browsers)
+            self._cond.notify_all()
+        for browser in browsers:
+            self._quit(browser)
+
+    def log_report(self):
+        logger.info(f"浏览器池: 启动 {self.stats['created']}, 复用 {self.stats['reused']}, "
+                    f"回收 {self.stats['recycled']}, 失效 {self.stats['unhealthy']}")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> WebDriverPool:
+    """进程内共享的浏览器池（按twitter.driver_pool配置创建并在后台预启动，进程退出时关闭）"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            config = load_config().get('twitter', {}).get('driver_pool', {})
+            _pool = WebDriverPool.from_config(config)
+            atexit.register(_pool.close)
+            if config.get('warm_up', True):
+                _pool.warm_up_async()
+        return _pool
@@ -2,11 +2,12 @@
 """
 Twitter/X爬虫 - 使用Selenium爬取公开页面(无需登录)
 """
-import time
+import functools
 import re
-from typing import Dict, List, Optional
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -15,78 +16,145 @@ from utils.logger import setup_logger
 from utils.rate_limiter import RateLimiter
 from utils.retry import retry_on_failure
 from utils.contact_extractor import ContactExtractor
+from platforms.twitter.scroll_driver import ScrollDriver
+from platforms.twitter.driver_pool import WebDriverPool, get_driver_pool
 
 logger = setup_logger(__name__)
 
 
+def _uses_browser(method):
+    """方法执行期间持有一个浏览器（当前线程已持有时直接使用）"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.session():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class TwitterScraper:
-    """Twitter爬虫 - 使用Selenium爬取公开页面"""
+    """
+    Twitter爬虫 - 使用Selenium爬取公开页面
     
-    def __init__(self):
-        self.rate_limiter = RateLimiter()
+    浏览器从WebDriverPool借用：每个线程（任务）在session()期间独占一个浏览器，
+    公开方法在没有session时自动借用并在返回后归还
+    """
+    
+    def __init__(self, pool: WebDriverPool = None):
+        self.rate_limiter = RateLimiter(host='twitter.com')
         self.contact_extractor = ContactExtractor()
-        self.driver = None
-        self._init_driver()
+        self.scroller = ScrollDriver()
+        self.pool = pool
+        self._local = threading.local()
     
-    def _init_driver(self):
-        """初始化Selenium WebDriver"""
-        try:
-            from selenium.webdriver.chrome.service import Service
-            from webdriver_manager.chrome import ChromeDriverManager
-            
-            options = webdriver.ChromeOptions()
-            
-            # 基础选项
-            options.add_argument('--headless=new')  # 新版无头模式
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--window-size=1920,1080')
-            
-            # 反检测选项
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option('useAutomationExtension', False)
-            
-            # User Agent
-            options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-            
-            # 禁用图片和CSS加载以提高速度
-            prefs = {
-                'profile.managed_default_content_settings.images': 2,
-                'profile.managed_default_content_settings.stylesheets': 2,
-            }
-            options.add_experimental_option('prefs', prefs)
-            
-            # 使用 webdriver-manager 自动管理 ChromeDriver
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=options)
-            
-            # 执行CDP命令隐藏webdriver特征
-            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-                'source': '''
-                    Object.defineProperty(navigator, 'webdriver', {
-                        get: () => undefined
-                    })
-                '''
-            })
-            
-            logger.info("Selenium WebDriver 初始化成功")
-            
-        except Exception as e:
-            logger.error(f"Selenium WebDriver 初始化失败: {e}")
-            logger.info("提示: 请确保已安装 Chrome 浏览器")
-            raise
+    @property
+    def driver(self):
+        """当前线程持有的WebDriver"""
+        return getattr(self._local, 'driver', None)
     
-    def __del__(self):
-        """清理资源"""
-        if self.driver:
+    @driver.setter
+    def driver(self, value):
+        self._local.driver = value
+    
+    @contextmanager
+    def session(self):
+        """当前线程从浏览器池借用一个浏览器，期间所有请求使用同一个浏览器（可嵌套）"""
+        if self.driver is not None:
+            yield self.driver
+            return
+        
+        pool = self.pool or get_driver_pool()
+        with pool.checkout() as browser:
+            self.driver = browser.driver
+            self._local.browser = browser
             try:
-                self.driver.quit()
-            except:
-                pass
+                yield browser.driver
+            finally:
+                self.driver = None
+                self._local.browser = None
+    
+    def _navigate(self, url: str):
+        """打开页面（计入浏览器的页面数，达到上限后由浏览器池回收）"""
+        browser = getattr(self._local, 'browser', None)
+        if browser is not None:
+            browser.navigate(url)
+        else:
+            self.driver.get(url)
+    
+    PROFILE_URL = "https://twitter.com/{}"
+    
+    # 页面内一次性提取用户信息（每次find_element都是一次WebDriver请求，逐个字段提取需要7次）
+    PROFILE_SCRIPT = """
+        var q = function (sel) { return document.querySelector(sel); };
+        var firstText = function (xpath) {
+            var node = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            return node ? node.textContent : null;
+        };
+        var name = q('[data-testid="UserName"]');
+        var bio = q('[data-testid="UserDescription"]');
+        var location = q('[data-testid="UserLocation"]');
+        var website = q('[data-testid="UserUrl"]');
+        var avatar = q('[data-testid="UserAvatar-Container-unknown"] img');
+        return {
+            name: name ? name.innerText.split('\\n')[0] : null,
+            bio: bio ? bio.innerText : '',
+            location: location ? location.innerText : '',
+            website: website ? website.href : '',
+            following: firstText('//a[contains(@href, "/following")]//span'),
+            followers: firstText('//a[contains(@href, "/verified_followers")]//span'),
+            avatar_url: avatar ? avatar.src : ''
+        };
+    """
+    
+    # 页面内一次性提取新出现的推文节点（每条推文逐个find_element需要5次以上WebDriver请求），返回紧凑的JSON；
+    # 有永久链接（已渲染完成）的节点提取后加上标记属性，之后的滚动只提取未标记的新节点
+    TWEETS_SCRIPT = """
+        var metric = function (article, name) {
+            var el = article.querySelector('[data-testid="' + name + '"]');
+            return el ? (el.getAttribute('aria-label') || el.innerText || '') : '';
+        };
+        var articles = document.querySelectorAll('article[data-testid="tweet"]:not([data-kol-extracted])');
+        return Array.prototype.map.call(articles, function (article) {
+            var text = article.querySelector('[data-testid="tweetText"]');
+            var time = article.querySelector('time');
+            var permalink = time ? time.closest('a') : null;
+            var author = article.querySelector('[data-testid="User-Name"] a');
+            var authorName = article.querySelector('[data-testid="User-Name"]');
+            var href = permalink ? permalink.getAttribute('href') : '';
+            var status = href.match(/\\/status\\/(\\d+)/);
+            if (status) { article.setAttribute('data-kol-extracted', '1'); }
+            return {
+                id: status ? status[1] : null,
+                href: href,
+                author_href: author ? author.getAttribute('href') : '',
+                author_name: authorName ? authorName.innerText.split('\\n')[0] : '',
+                text: text ? text.innerText : null,
+                created_at: time ? time.getAttribute('datetime') : null,
+                reply: metric(article, 'reply'),
+                retweet: metric(article, 'retweet'),
+                like: metric(article, 'like')
+            };
+        });
+    """
+    
+    def _open_profile(self, username: str) -> str:
+        """打开用户主页并等待用户信息渲染，返回主页URL"""
+        self.rate_limiter.wait()
+        
+        url = self.PROFILE_URL.format(username)
+        self._navigate(url)
+        
+        # 等待用户名元素出现
+        wait = WebDriverWait(self.driver, 10)
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="UserName"]')))
+        return url
+    
+    def _wait_for_tweets(self, timeout: float = 10):
+        """等待推文列表出现"""
+        wait = WebDriverWait(self.driver, timeout)
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'article[data-testid="tweet"]')))
     
     @retry_on_failure(max_retries=3)
+    @_uses_browser
     def get_user_info(self, username: str) -> Optional[Dict]:
         """
         获取用户基本信息(从公开页面)
@@ -97,76 +165,9 @@ class TwitterScraper:
         Returns:
             用户信息字典
         """
-        self.rate_limiter.wait()
-        
         try:
-            url = f"https://twitter.com/{username}"
-            self.driver.get(url)
-            
-            # 等待页面加载
-            wait = WebDriverWait(self.driver, 10)
-            
-            # 等待用户名元素出现
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="UserName"]')))
-            
-            # 提取用户信息
-            user_data = {
-                'username': username,
-                'profile_url': url,
-            }
-            
-            # 提取显示名称
-            try:
-                name_elem = self.driver.find_element(By.CSS_SELECTOR, '[data-testid="UserName"]')
-                user_data['name'] = name_elem.text.split('\n')[0] if name_elem else username
-            except:
-                user_data['name'] = username
-            
-            # 提取简介
-            try:
-                bio_elem = self.driver.find_element(By.CSS_SELECTOR, '[data-testid="UserDescription"]')
-                user_data['bio'] = bio_elem.text if bio_elem else ''
-            except:
-                user_data['bio'] = ''
-            
-            # 提取位置
-            try:
-                location_elem = self.driver.find_element(By.CSS_SELECTOR, '[data-testid="UserLocation"]')
-                user_data['location'] = location_elem.text if location_elem else ''
-            except:
-                user_data['location'] = ''
-            
-            # 提取网站
-            try:
-                website_elem = self.driver.find_element(By.CSS_SELECTOR, '[data-testid="UserUrl"]')
-                user_data['website'] = website_elem.get_attribute('href') if website_elem else ''
-            except:
-                user_data['website'] = ''
-            
-            # 提取关注数据
-            try:
-                following_elem = self.driver.find_element(By.XPATH, '//a[contains(@href, "/following")]//span')
-                user_data['following_count'] = self._parse_count(following_elem.text) if following_elem else 0
-            except:
-                user_data['following_count'] = 0
-            
-            try:
-                followers_elem = self.driver.find_element(By.XPATH, '//a[contains(@href, "/verified_followers")]//span')
-                user_data['followers_count'] = self._parse_count(followers_elem.text) if followers_elem else 0
-            except:
-                user_data['followers_count'] = 0
-            
-            # 提取头像
-            try:
-                avatar_elem = self.driver.find_element(By.CSS_SELECTOR, '[data-testid="UserAvatar-Container-unknown"] img')
-                user_data['avatar_url'] = avatar_elem.get_attribute('src') if avatar_elem else ''
-            except:
-                user_data['avatar_url'] = ''
-            
-            # 提取联系方式
-            contact_info = self._extract_contact_info(user_data)
-            user_data['contact_info'] = contact_info
-            
+            url = self._open_profile(username)
+            user_data = self._extract_profile(username, url)
             logger.info(f"获取用户信息成功: @{username}")
             return user_data
             
@@ -175,6 +176,7 @@ class TwitterScraper:
             return None
     
     @retry_on_failure(max_retries=3)
+    @_uses_browser
     def get_user_tweets(self, username: str, limit: int = 20) -> List[Dict]:
         """
         获取用户最近的推文(从公开页面)
@@ -189,68 +191,114 @@ class TwitterScraper:
         self.rate_limiter.wait()
         
         try:
-            url = f"https://twitter.com/{username}"
-            self.driver.get(url)
-            
-            # 等待推文加载
-            wait = WebDriverWait(self.driver, 10)
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'article[data-testid="tweet"]')))
-            
-            tweets = []
-            scroll_attempts = 0
-            max_scrolls = 5
-            
-            while len(tweets) < limit and scroll_attempts < max_scrolls:
-                # 获取当前页面的推文
-                tweet_elements = self.driver.find_elements(By.CSS_SELECTOR, 'article[data-testid="tweet"]')
-                
-                for elem in tweet_elements:
-                    if len(tweets) >= limit:
-                        break
-                    
-                    try:
-                        # 提取推文文本
-                        text_elem = elem.find_element(By.CSS_SELECTOR, '[data-testid="tweetText"]')
-                        text = text_elem.text if text_elem else ''
-                        
-                        # 提取时间
-                        time_elem = elem.find_element(By.CSS_SELECTOR, 'time')
-                        created_at = time_elem.get_attribute('datetime') if time_elem else ''
-                        
-                        # 提取互动数据
-                        reply_count = self._extract_metric(elem, 'reply')
-                        retweet_count = self._extract_metric(elem, 'retweet')
-                        like_count = self._extract_metric(elem, 'like')
-                        
-                        tweet_data = {
-                            'username': username,
-                            'text': text,
-                            'created_at': created_at,
-                            'reply_count': reply_count,
-                            'retweet_count': retweet_count,
-                            'like_count': like_count,
-                        }
-                        
-                        # 避免重复
-                        if tweet_data not in tweets:
-                            tweets.append(tweet_data)
-                            
-                    except Exception as e:
-                        logger.debug(f"提取推文失败: {e}")
-                        continue
-                
-                # 滚动加载更多
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                scroll_attempts += 1
+            self._navigate(self.PROFILE_URL.format(username))
+            self._wait_for_tweets()
             
+            tweets = self._collect_tweets(username, limit)
             logger.info(f"获取推文成功: @{username}, 数量: {len(tweets)}")
-            return tweets[:limit]
+            return tweets
             
         except Exception as e:
             logger.error(f"获取推文失败 @{username}: {e}")
             return []
     
+    @retry_on_failure(max_retries=3)
+    @_uses_browser
+    def get_profile_with_tweets(self, username: str, limit: int = 20) -> Tuple[Optional[Dict], List[Dict]]:
+        """
+        加载一次用户主页，同时提取用户信息和最近推文
+        
+        （分别调用get_user_info和get_user_tweets需要两次页面加载和两次限速等待）
+        
+        Args:
+            username: Twitter用户名 (不带@)
+            limit: 推文数量
+            
+        Returns:
+            (用户信息字典, 推文列表)，无法加载主页时为 (None, [])
+        """
+        try:
+            url = self._open_profile(username)
+            user_data = self._extract_profile(username, url)
+        except Exception as e:
+            logger.error(f"获取用户信息失败 @{username}: {e}")
+            return None, []
+        
+        try:
+            self._wait_for_tweets()
+            tweets = self._collect_tweets(username, limit)
+        except Exception as e:
+            # 受保护或没有推文的账号：保留用户信息
+            logger.error(f"获取推文失败 @{username}: {e}")
+            tweets = []
+        
+        logger.info(f"获取用户信息和推文成功: @{username}, 推文数量: {len(tweets)}")
+        return user_data, tweets
+    
+    def _extract_profile(self, username: str, url: str) -> Dict:
+        """从当前页面提取用户信息（一次execute_script）"""
+        profile = self.driver.execute_script(self.PROFILE_SCRIPT) or {}
+        user_data = {
+            'username': username,
+            'profile_url': url,
+            'name': profile.get('name') or username,
+            'bio': profile.get('bio') or '',
+            'location': profile.get('location') or '',
+            'website': profile.get('website') or '',
+            'following_count': self._parse_count(profile.get('following') or ''),
+            'followers_count': self._parse_count(profile.get('followers') or ''),
+            'avatar_url': profile.get('avatar_url') or '',
+        }
+        
+        # 提取联系方式
+        user_data['contact_info'] = self._extract_contact_info(user_data)
+        return user_data
+    
+    def _extract_tweet_nodes(self) -> List[Dict]:
+        """
+        当前页面上次提取之后新出现的推文节点（一次execute_script）
+        
+        缺少推文ID、正文或时间的节点（如广告）跳过
+        """
+        nodes = self.driver.execute_script(self.TWEETS_SCRIPT) or []
+        return [node for node in nodes if node.get('id') and node.get('text') is not None and node.get('created_at')]
+    
+    @staticmethod
+    def _tweet_url(node: Dict) -> str:
+        """推文永久链接（twitter.com/用户名/status/推文ID）"""
+        return f"https://twitter.com{node['href']}" if node['href'].startswith('/') else node['href']
+    
+    def _collect_tweets(self, username: str, limit: int) -> List[Dict]:
+        """从当前页面提取推文（滚动加载更多）"""
+        tweets = []
+        seen = set()
+        
+        def collect():
+            # 一次提取当前页面新出现的推文，按推文ID去重
+            for node in self._extract_tweet_nodes():
+                if len(tweets) >= limit:
+                    break
+                if node['id'] in seen:
+                    continue
+                seen.add(node['id'])
+                
+                tweets.append({
+                    'tweet_id': node['id'],
+                    'username': username,
+                    'text': node['text'],
+                    'created_at': node['created_at'],
+                    'reply_count': self._parse_metric(node['reply']),
+                    'retweet_count': self._parse_metric(node['retweet']),
+                    'like_count': self._parse_metric(node['like']),
+                    'tweet_url': self._tweet_url(node),
+                })
+            return len(tweets)
+        
+        # 滚动加载更多（新推文出现即继续，加载停滞即停止）
+        self.scroller.run(self.driver, collect, limit)
+        return tweets[:limit]
+    
+    @_uses_browser
     def search_tweets(self, keyword: str, limit: int = 20) -> List[Dict]:
         """
         搜索推文(从公开搜索页面)
@@ -267,69 +315,39 @@ class TwitterScraper:
         try:
             # Twitter搜索URL
             search_url = f"https://twitter.com/search?q={keyword}&src=typed_query&f=live"
-            self.driver.get(search_url)
+            self._navigate(search_url)
             
             # 等待搜索结果加载
             wait = WebDriverWait(self.driver, 10)
             wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'article[data-testid="tweet"]')))
             
             tweets = []
-            scroll_attempts = 0
-            max_scrolls = 5
+            seen = set()
             
-            while len(tweets) < limit and scroll_attempts < max_scrolls:
-                # 获取当前页面的推文
-                tweet_elements = self.driver.find_elements(By.CSS_SELECTOR, 'article[data-testid="tweet"]')
-                
-                for elem in tweet_elements:
+            def collect():
+                # 一次提取当前页面新出现的推文，按推文ID去重
+                for node in self._extract_tweet_nodes():
                     if len(tweets) >= limit:
                         break
-                    
-                    try:
-                        # 提取用户名
-                        username_elem = elem.find_element(By.CSS_SELECTOR, '[data-testid="User-Name"] a')
-                        username = username_elem.get_attribute('href').split('/')[-1] if username_elem else ''
-                        
-                        # 提取显示名称
-                        name_elem = elem.find_element(By.CSS_SELECTOR, '[data-testid="User-Name"]')
-                        user_name = name_elem.text.split('\n')[0] if name_elem else ''
-                        
-                        # 提取推文文本
-                        text_elem = elem.find_element(By.CSS_SELECTOR, '[data-testid="tweetText"]')
-                        text = text_elem.text if text_elem else ''
-                        
-                        # 提取时间
-                        time_elem = elem.find_element(By.CSS_SELECTOR, 'time')
-                        created_at = time_elem.get_attribute('datetime') if time_elem else ''
-                        
-                        # 提取互动数据
-                        reply_count = self._extract_metric(elem, 'reply')
-                        retweet_count = self._extract_metric(elem, 'retweet')
-                        like_count = self._extract_metric(elem, 'like')
-                        
-                        tweet_data = {
-                            'username': username,
-                            'user_name': user_name,
-                            'text': text,
-                            'created_at': created_at,
-                            'reply_count': reply_count,
-                            'retweet_count': retweet_count,
-                            'like_count': like_count,
-                            'tweet_url': f"https://twitter.com/{username}/status/{created_at}"
-                        }
-                        
-                        # 避免重复
-                        if tweet_data not in tweets:
-                            tweets.append(tweet_data)
-                            
-                    except Exception as e:
-                        logger.debug(f"提取搜索结果失败: {e}")
+                    if node['id'] in seen:
                         continue
-                
-                # 滚动加载更多
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
-                scroll_attempts += 1
+                    seen.add(node['id'])
+                    
+                    tweets.append({
+                        'tweet_id': node['id'],
+                        'username': node['author_href'].rstrip('/').split('/')[-1],
+                        'user_name': node['author_name'],
+                        'text': node['text'],
+                        'created_at': node['created_at'],
+                        'reply_count': self._parse_metric(node['reply']),
+                        'retweet_count': self._parse_metric(node['retweet']),
+                        'like_count': self._parse_metric(node['like']),
+                        'tweet_url': self._tweet_url(node),
+                    })
+                return len(tweets)
+            
+            # 滚动加载更多（新推文出现即继续，加载停滞即停止）
+            self.scroller.run(self.driver, collect, limit)
             
             logger.info(f"搜索推文成功: {keyword}, 数量: {len(tweets)}")
             return tweets[:limit]
@@ -351,16 +369,11 @@ class TwitterScraper:
         except:
             return 0
     
-    def _extract_metric(self, element, metric_type: str) -> int:
-        """提取互动指标"""
-        try:
-            metric_elem = element.find_element(By.CSS_SELECTOR, f'[data-testid="{metric_type}"]')
-            text = metric_elem.get_attribute('aria-label') or metric_elem.text
-            # 从 aria-label 中提取数字
-            numbers = re.findall(r'\d+', text)
-            return int(numbers[0]) if numbers else 0
-        except:
-            return 0
+    @staticmethod
+    def _parse_metric(label: str) -> int:
+        """解析互动指标的aria-label（如 "1,234 Likes. Like"）"""
+        numbers = re.findall(r'\d[\d,]*', label or '')
+        return int(numbers[0].replace(',', '')) if numbers else 0
     
     def _extract_contact_info(self, user_data: Dict) -> str:
         """提取联系方式"""
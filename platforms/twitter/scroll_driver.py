@@ -0,0 +1,159 @@
+"""
+无限滚动加载 - 滚动后等待新推文出现或网络空闲，代替固定sleep
+
+Twitter时间线是虚拟列表（滚出屏幕的推文节点会被移除），只看推文节点数可能判断不出加载了新内容，
+因此同时比较页面高度和最后一条推文的时间。
+
+资源条目（performance resource）只在请求完成后才出现，不能反映进行中的请求，
+因此在页面中包装fetch/XMLHttpRequest统计未完成的请求数。
+"""
+import threading
+import time
+from typing import Callable, Dict, Tuple
+from utils.logger import setup_logger
+
+
+logger = setup_logger()
+
+
+class ScrollDriver:
+    """
+    滚动加载驱动
+
+    每次滚动到底部后轮询页面状态，直到：
+    - 推文节点数、页面高度或最后一条推文变化（加载了新内容）
+    - 网络空闲（没有进行中的请求，且资源请求数在idle_time内不再增加）且没有新内容：
+      加载请求可能被防抖延迟发出，先再滚动一次重新等待（最多idle_retries次），仍空闲才视为加载停滞
+    - 超过timeout仍没有新内容，视为加载停滞
+    达到数量上限、加载停滞或滚动max_scrolls次后停止
+
+    同一个实例可被多个线程（任务）同时使用：每次run的滚动次数和等待时间单独计算，
+    结束后在锁内累加到stats
+    """
+
+    # 可选滚动到底部，返回当前页面状态（首次调用时安装进行中请求计数）
+    STATE_SCRIPT = """
+        if (!window.__kolInflight) {
+            var inflight = window.__kolInflight = {count: 0};
+            var done = function () { inflight.count = Math.max(0, inflight.count - 1); };
+            if (window.fetch) {
+                var fetch = window.fetch;
+                window.fetch = function () {
+                    inflight.count++;
+                    try {
+                        return fetch.apply(this, arguments).then(
+                            function (r) { done(); return r; }, function (e) { done(); throw e; });
+                    } catch (e) { done(); throw e; }
+                };
+            }
+            var send = XMLHttpRequest.prototype.send;
+            XMLHttpRequest.prototype.send = function () {
+                inflight.count++;
+                this.addEventListener('loadend', done);
+                try { return send.apply(this, arguments); } catch (e) { done(); throw e; }
+            };
+        }
+        if (arguments[0]) { window.scrollTo(0, document.body.scrollHeight); }
+        var articles = document.querySelectorAll('article[data-testid="tweet"]');
+        var last = articles.length ? articles[articles.length - 1].querySelector('time') : null;
+        return {
+            articles: articles.length,
+            height: document.body.scrollHeight,
+            last: last ? last.getAttribute('datetime') : null,
+            resources: performance.getEntriesByType('resource').length,
+            pending: window.__kolInflight.count
+        };
+    """
+
+    def __init__(self, max_scrolls: int = 5, timeout: float = 3.0, idle_time: float = 0.5,
+                 poll_interval: float = 0.1, idle_retries: int = 1, clock=time.monotonic, sleep=time.sleep):
+        self.max_scrolls = max_scrolls
+        self.timeout = timeout
+        self.idle_time = idle_time
+        self.poll_interval = poll_interval
+        self.idle_retries = idle_retries
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.stats = {'scrolls': 0, 'stalls': 0, 'wait_seconds': 0.0}
+
+    @staticmethod
+    def _content(state: Dict):
+        return state['articles'], state['height'], state['last']
+
+    def _record(self, scrolls: int, stalls: int, wait_seconds: float):
+        """累加到实例的统计"""
+        with self._lock:
+            self.stats['scrolls'] += scrolls
+            self.stats['stalls'] += stalls
+            self.stats['wait_seconds'] += wait_seconds
+
+    def _wait_for_content(self, driver) -> Tuple[bool, float]:
+        """滚动到底部并等待新内容，返回 (是否加载了新内容, 等待秒数)"""
+        before = driver.execute_script(self.STATE_SCRIPT, True)
+        start = self._clock()
+        resources, idle_since = before['resources'], start
+        retries, scroll = 0, False
+        while True:
+            self._sleep(self.poll_interval)
+            state = driver.execute_script(self.STATE_SCRIPT, scroll)
+            scroll = False
+            now = self._clock()
+            if self._content(state) != self._content(before):
+                return True, now - start
+            if state['resources'] != resources or state['pending']:
+                resources, idle_since = state['resources'], now
+            elif now - idle_since >= self.idle_time:
+                if retries >= self.idle_retries:
+                    return False, now - start
+                # 空闲时还没有发出加载请求：再滚动一次，重新等待
+                retries, scroll, idle_since = retries + 1, True, now
+            if now - start >= self.timeout:
+                return False, now - start
+
+    def scroll_and_wait(self, driver) -> bool:
+        """滚动到底部并等待新内容，返回是否加载了新内容"""
+        loaded, waited = self._wait_for_content(driver)
+        self._record(1, 0, waited)
+        return loaded
+
+    def run(self, driver, collect: Callable[[], int], limit: int) -> Dict:
+        """
+        提取当前页面 -> 滚动 -> 提取新内容，直到满足停止条件
+
+        Args:
+            driver: WebDriver（已打开页面）
+            collect: 提取当前页面的推文，返回累计收集数
+            limit: 需要的推文数
+
+        Returns:
+            本次的 {'scrolls', 'stalled', 'wait_seconds'}
+        """
+        scrolls, wait_seconds = 0, 0.0
+        stalled = False
+        try:
+            collected = collect()
+            while collected < limit and scrolls < self.max_scrolls:
+                loaded, waited = self._wait_for_content(driver)
+                scrolls += 1
+                wait_seconds += waited
+                if not loaded:
+                    stalled = True
+                    break
+                collected = collect()
+        finally:
+            self._record(scrolls, int(stalled), wait_seconds)
+
+        result = {'scrolls': scrolls, 'stalled': stalled, 'wait_seconds': wait_seconds}
+        logger.debug(f"滚动加载: {result['scrolls']} 次, 等待 {result['wait_seconds']:.1f} 秒"
+                     f"{'（加载停滞）' if stalled else ''}, 收集 {collected}/{limit}")
+        return result
+
+    def log_report(self):
+        """输出累计滚动等待时间"""
+        with self._lock:
+            stats = dict(self.stats)
+        if not stats['scrolls']:
+            return
+        logger.info(f"滚动加载: {stats['scrolls']} 次, 等待共 {stats['wait_seconds']:.1f} 秒 "
+                    f"(平均 {stats['wait_seconds'] / stats['scrolls']:.2f} 秒), 停滞 {stats['stalls']} 次")
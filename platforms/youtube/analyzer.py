@@ -1,13 +1,12 @@
 """
 KOL分析模块
 """
-import json
 from datetime import datetime, timedelta
 from utils.text_matcher import TextMatcher
 from utils.exclusion_rules import ExclusionRules
 from utils.contact_extractor import ContactExtractor
 from utils.logger import setup_logger
-from utils.config_loader import get_absolute_path
+from utils.config_loader import get_config_snapshot
 
 
 logger = setup_logger()
@@ -16,18 +15,23 @@ logger = setup_logger()
 class KOLAnalyzer:
     """KOL分析器"""
     
+    QUALIFY_AI_RATIO = 0.3  # 合格的AI视频占比
+    UNAVAILABLE_VIDEOS = ('subscriber_only', 'premium_only', 'needs_auth')
+    
     def __init__(self, scraper, config_path='config/config.json'):
         self.scraper = scraper
         self.text_matcher = TextMatcher(config_path)
         self.exclusion_rules = ExclusionRules(config_path)
         self.contact_extractor = ContactExtractor()
         
-        config_path = get_absolute_path(config_path)
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = get_config_snapshot(config_path)
         
         self.sample_size = config['crawler']['sample_video_count']
         self.active_days_threshold = config['crawler']['active_days_threshold']
+        # 合格频道完整提取的视频数（用于点赞/评论数），其余视频使用频道视频列表中的数据
+        self.engagement_sample_size = config['crawler'].get('engagement_sample_videos', 2)
+        # 并发提取视频详情的线程数（1为逐个提取），请求速率仍受共享限速器控制
+        self.fetch_workers = config['crawler'].get('video_fetch_workers', 1)
         
         # 互动率权重配置
         engagement_config = config.get('engagement', {})
@@ -79,102 +83,87 @@ class KOLAnalyzer:
             
             logger.info(f"  成功获取 {len(videos)} 个视频")
             
-            # 4. 分析每个视频
+            # 4. 分析每个视频（AI判断只用标题和描述，视频列表中已有，不需要逐个完整提取）
             logger.info(f"")
             logger.info(f"▶ 阶段 3/4: 分析视频内容")
             logger.info(f"{'-'*70}")
             ai_videos = 0
-            total_views = 0
-            total_likes = 0
-            total_comments = 0
             video_data_list = []
-            last_video_date = None
-            failed_videos = 0
+            skipped_videos = 0
             
             for idx, video in enumerate(videos, 1):
                 video_id = video.get('id', '')
                 if not video_id:
                     continue
-                    
+                
                 title = video.get('title', '')
+                
+                # 会员专属等无法观看的视频不计入样本
+                if video.get('availability') in self.UNAVAILABLE_VIDEOS:
+                    skipped_videos += 1
+                    logger.info(f"  视频 {idx}/{len(videos)} ⚠ 跳过（{video.get('availability')}）")
+                    logger.info(f"    标题: {title[:60]}...")
+                    continue
+                
                 description = video.get('description', '')
                 
                 # 判断是否AI相关
                 is_ai, matched_keywords = self.text_matcher.is_ai_related(title, description)
                 
-                # 获取详细信息
-                try:
-                    video_info = self.scraper.get_video_info(video_id)
-                    total_views += (video_info['views'] or 0)
-                    total_likes += (video_info['likes'] or 0)
-                    total_comments += (video_info['comments'] or 0)
-                    
-                    # 记录最新视频日期
-                    if last_video_date is None or video_info['published_at'] > last_video_date:
-                        last_video_date = video_info['published_at']
-                    
-                    video_info['is_ai_related'] = is_ai
-                    video_info['matched_keywords'] = matched_keywords
-                    video_data_list.append(video_info)
-                    
-                    # 详细日志输出
-                    if is_ai:
-                        ai_videos += 1
-                        logger.info(f"  视频 {idx}/{len(videos)} ✓ AI相关")
-                        logger.info(f"    标题: {title[:60]}...")
-                        logger.info(f"    匹配关键词: {', '.join(matched_keywords[:3])}")
-                        logger.info(f"    数据: 观看 {video_info['views']:,} | 点赞 {video_info['likes']:,}")
-                        logger.info(f"    链接: {video_info['video_url']}")
-                    else:
-                        logger.info(f"  视频 {idx}/{len(videos)} ✗ 非AI内容")
-                        logger.info(f"    标题: {title[:60]}...")
-                        logger.info(f"    原因: 标题和描述中未找到AI关键词")
-                        logger.info(f"    数据: 观看 {video_info['views']:,} | 点赞 {video_info['likes']:,}")
-                        logger.info(f"    链接: {video_info['video_url']}")
-                    
-                except Exception as e:
-                    failed_videos += 1
-                    logger.warning(f"  视频 {idx}/{len(videos)} ⚠ 获取失败")
-                    logger.warning(f"    标题: {title[:60]}...")
-                    logger.warning(f"    原因: {str(e)}")
-                    continue
+                video_info = self.scraper.video_from_entry(video, channel_id)
+                video_info['is_ai_related'] = is_ai
+                video_info['matched_keywords'] = matched_keywords
+                video_data_list.append(video_info)
+                
+                # 详细日志输出
+                if is_ai:
+                    ai_videos += 1
+                    logger.info(f"  视频 {idx}/{len(videos)} ✓ AI相关")
+                    logger.info(f"    标题: {title[:60]}...")
+                    logger.info(f"    匹配关键词: {', '.join(matched_keywords[:3])}")
+                else:
+                    logger.info(f"  视频 {idx}/{len(videos)} ✗ 非AI内容")
+                    logger.info(f"    标题: {title[:60]}...")
+                    logger.info(f"    原因: 标题和描述中未找到AI关键词")
+                logger.info(f"    数据: 观看 {self._format_count(video_info['views'])}")
+                logger.info(f"    链接: {video_info['video_url']}")
             
             # 输出统计
             logger.info(f"")
-            logger.info(f"  统计: 成功 {len(video_data_list)} | AI相关 {ai_videos} | 非AI {len(video_data_list)-ai_videos} | 失败 {failed_videos}")
+            logger.info(f"  统计: 分析 {len(video_data_list)} | AI相关 {ai_videos} | 非AI {len(video_data_list)-ai_videos} | 跳过 {skipped_videos}")
             
-            # 如果没有成功获取任何视频详情，返回None
+            # 如果没有可分析的视频，返回None
             if not video_data_list:
-                logger.warning(f"  └─ ✗ 无法获取任何视频详情，跳过")
+                logger.warning(f"  └─ ✗ 没有可分析的视频，跳过")
                 return None
             
-            # 4. 计算指标
-            logger.info(f"  计算分析指标...")
+            # 5. 判断状态（只取决于AI占比和排除规则，此时已经确定）
             analyzed_videos = len(video_data_list)
             ai_ratio = ai_videos / analyzed_videos if analyzed_videos > 0 else 0
-            avg_views = total_views // analyzed_videos if analyzed_videos > 0 else 0
-            avg_likes = total_likes // analyzed_videos if analyzed_videos > 0 else 0
-            avg_comments = total_comments // analyzed_videos if analyzed_videos > 0 else 0
+            status = 'qualified' if ai_ratio >= self.QUALIFY_AI_RATIO else 'rejected'
             
-            # 新的互动率计算公式: (平均点赞*like_weight + 平均评论*comment_weight) / 平均观看数
-            if avg_views > 0:
-                engagement_rate = (avg_likes * self.like_weight + avg_comments * self.comment_weight) / avg_views
+            # 检查排除规则
+            video_titles = [v.get('title', '') for v in video_data_list]
+            if self.exclusion_rules.should_exclude_channel(channel_info['channel_name'], video_titles):
+                status = 'rejected'
+            
+            # 补全指标：只有合格频道需要点赞/评论数，完整提取少量视频；不合格频道直接使用列表数据
+            if status == 'qualified':
+                self._fill_video_metrics(video_data_list)
             else:
-                engagement_rate = 0
+                logger.info(f"  结果已确定（不合格），跳过视频详情提取")
+            
+            # 计算指标
+            logger.info(f"  计算分析指标...")
+            avg_views, avg_likes, avg_comments, engagement_rate = self._compute_engagement(video_data_list)
             
             # 计算距离最后视频的天数
+            published_dates = [v['published_at'] for v in video_data_list if v['published_at']]
+            last_video_date = max(published_dates) if published_dates else None
             days_since_last_video = None
             if last_video_date:
                 days_since_last_video = (datetime.now() - last_video_date).days
             
-            # 5. 判断状态
-            status = 'qualified' if ai_ratio >= 0.3 else 'rejected'
-            
-            # 检查排除规则
-            video_titles = [v.get('title', '') for v in video_data_list]
-            if self.exclusion_rules.should_exclude_channel(channel_info['channel_name'], video_titles):
-                status = 'rejected'
-            
             # 6. 输出分析结果
             logger.info(f"")
             logger.info(f"{'='*70}")
@@ -219,6 +208,74 @@ class KOLAnalyzer:
             logger.error(f"✗✗✗ 分析频道失败: {channel_id}, 错误: {str(e)}")
             return None
     
+    @staticmethod
+    def _format_count(value):
+        return f"{value:,}" if value is not None else "未知"
+    
+    def _fill_video_metrics(self, video_data_list):
+        """
+        完整提取少量视频，补全点赞/评论数（以及列表中缺失的观看数、发布时间）
+        
+        优先提取最新的视频（用于计算最后更新时间），其次是缺少观看数的视频；
+        成功提取engagement_sample_size个后停止，失败的视频保留列表数据
+        """
+        if self.engagement_sample_size <= 0:
+            return
+        
+        order = sorted(range(len(video_data_list)),
+                       key=lambda i: (i != 0, video_data_list[i]['views'] is not None, i))
+        extracted = 0
+        failed = 0
+        while order and extracted < self.engagement_sample_size and failed <= self.engagement_sample_size:
+            # 每轮并发提取还差的数量，失败的由后面的视频补上
+            batch = order[:self.engagement_sample_size - extracted]
+            order = order[len(batch):]
+            results = self.scraper.fetch_videos_info([video_data_list[i]['video_id'] for i in batch],
+                                                     max_workers=self.fetch_workers)
+            
+            for i, video_info in zip(batch, results):
+                if video_info is None:
+                    failed += 1
+                    continue
+                
+                video = video_data_list[i]
+                video_info['is_ai_related'] = video['is_ai_related']
+                video_info['matched_keywords'] = video['matched_keywords']
+                video_data_list[i] = video_info
+                extracted += 1
+                logger.info(f"  视频详情: {video_info['title'][:40]}... | 观看 {video_info['views']:,} | "
+                           f"点赞 {video_info['likes']:,} | 评论 {video_info['comments']:,}")
+        
+        logger.info(f"  完整提取 {extracted} 个视频（失败 {failed} 个），其余使用列表数据")
+    
+    def _compute_engagement(self, video_data_list):
+        """
+        计算平均观看/点赞/评论数和互动率
+        
+        指标缺失（None）的视频不参与对应平均值；互动率只用有点赞和评论数的视频计算，
+        分子分母来自同一批视频
+        
+        返回: (avg_views, avg_likes, avg_comments, engagement_rate)
+        """
+        views = [v['views'] for v in video_data_list if v['views'] is not None]
+        avg_views = sum(views) // len(views) if views else 0
+        
+        measured = [v for v in video_data_list if v['likes'] is not None and v['comments'] is not None]
+        if not measured:
+            return avg_views, 0, 0, 0
+        
+        avg_likes = sum(v['likes'] for v in measured) // len(measured)
+        avg_comments = sum(v['comments'] for v in measured) // len(measured)
+        measured_views = sum(v['views'] or 0 for v in measured) // len(measured)
+        
+        # 互动率计算公式: (平均点赞*like_weight + 平均评论*comment_weight) / 平均观看数
+        if measured_views > 0:
+            engagement_rate = (avg_likes * self.like_weight + avg_comments * self.comment_weight) / measured_views
+        else:
+            engagement_rate = 0
+        
+        return avg_views, avg_likes, avg_comments, engagement_rate
+    
     def is_active(self, days_since_last_video):
         """判断KOL是否活跃"""
         if days_since_last_video is None:
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+YouTube频道信息缓存 - 同一频道在一次运行中只解析一次，并记住可用的频道URL格式
+"""
+import time
+from typing import Dict, Optional
+from utils.ttl_cache import TTLCache
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class YouTubeChannelCache:
+    """
+    YouTube频道信息缓存
+
+    两级缓存：
+    - 内存（本次运行内复用，竞对检查和频道分析共用一次解析结果）
+    - 数据库（传入repository时启用，跨运行复用）
+
+    另外记录每个频道可用的URL格式（channel / @ / c），下次请求该频道时直接使用，
+    不再依次尝试其他格式。URL格式不随频道信息过期。
+    """
+
+    def __init__(self, ttl_hours: float = 24, repository=None):
+        self.ttl_seconds = ttl_hours * 3600
+        self.repository = repository
+        self.memory = TTLCache(ttl_seconds=self.ttl_seconds, max_entries=5000)
+        self.url_forms = {}
+
+    def get(self, channel_id: str) -> Optional[Dict]:
+        """获取频道信息（返回副本），不存在或已过期返回None"""
+        channel_data = self.memory.get(channel_id)
+        if channel_data is None and self.repository:
+            saved = self.repository.get(channel_id)
+            if saved:
+                if saved['url_form']:
+                    self.url_forms.setdefault(channel_id, saved['url_form'])
+                if saved['channel_data'] and time.time() - saved['fetched_ts'] < self.ttl_seconds:
+                    channel_data = saved['channel_data']
+                    self.memory.set(channel_id, channel_data, stored_at=saved['fetched_ts'])
+
+        self.memory.record('channel_info', channel_data is not None)
+        return dict(channel_data) if channel_data is not None else None
+
+    def put(self, channel_id: str, channel_data: Dict, url_form: Optional[str] = None, persist: bool = True):
+        """
+        写入频道信息
+
+        Args:
+            url_form: 解析成功的URL格式
+            persist: 是否写入数据库（所有URL都失败时的占位信息只在本次运行内复用）
+        """
+        fetched_ts = time.time()
+        self.memory.set(channel_id, dict(channel_data), stored_at=fetched_ts)
+        if url_form:
+            self.url_forms[channel_id] = url_form
+
+        if persist and self.repository:
+            self.repository.save(channel_id, channel_data, self.url_forms.get(channel_id), fetched_ts)
+
+    def get_url_form(self, channel_id: str) -> Optional[str]:
+        """获取频道可用的URL格式"""
+        if channel_id not in self.url_forms and self.repository:
+            saved = self.repository.get(channel_id)
+            if saved and saved['url_form']:
+                self.url_forms[channel_id] = saved['url_form']
+        return self.url_forms.get(channel_id)
+
+    def set_url_form(self, channel_id: str, url_form: str):
+        """记录频道可用的URL格式（如获取视频列表时发现的）"""
+        if self.url_forms.get(channel_id) == url_form:
+            return
+        self.url_forms[channel_id] = url_form
+        if self.repository:
+            self.repository.save_url_form(channel_id, url_form)
+
+    def get_stats(self) -> Dict:
+        """获取命中率统计 {'hits', 'misses', 'hit_rate'}"""
+        return self.memory.get_stats().get('channel_info', {'hits': 0, 'misses': 0, 'hit_rate': 0.0})
+
+    def log_report(self):
+        """输出频道信息缓存命中率"""
+        stats = self.get_stats()
+        total = stats['hits'] + stats['misses']
+        if not total:
+            return
+        logger.info(f"频道信息缓存命中率: {stats['hits']}/{total} ({stats['hit_rate']:.1%})，"
+                   f"节省 {stats['hits']} 次频道解析")
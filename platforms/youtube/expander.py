@@ -1,9 +1,8 @@
 """
 扩散模块 - 从已有KOL发现新KOL
 """
-import json
 from utils.logger import setup_logger
-from utils.config_loader import get_absolute_path
+from utils.config_loader import get_config_snapshot
 
 
 logger = setup_logger()
@@ -15,12 +14,13 @@ class KOLExpander:
     def __init__(self, scraper, config_path='config/config.json'):
         self.scraper = scraper
         
-        config_path = get_absolute_path(config_path)
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = get_config_snapshot(config_path)
         
         self.expand_batch_size = config['crawler']['expand_batch_size']
         self.recommended_videos_count = config['crawler']['expand_recommended_videos']
+        
+        # 扩散统计：queries为发起的推荐查询数，coalesced为同一频道内搜索词重复而跳过的视频数
+        self.stats = {'queries': 0, 'coalesced': 0}
     
     def expand_from_kol(self, channel_id):
         """
@@ -35,12 +35,24 @@ class KOLExpander:
             # 1. 获取该频道的最近视频
             videos = self.scraper.get_channel_videos(channel_id, limit=10)
             
-            # 2. 对每个视频获取推荐列表
+            # 2. 对每个视频获取推荐列表（标题已在视频列表中，搜索词相同的视频只搜索一次）
+            queries = set()
             for video in videos[:self.recommended_videos_count]:
                 video_id = video.get('id', '')
+                title = video.get('title')
+                
+                query = self.scraper.recommendation_query(title) if title else None
+                query_key = ' '.join(query.lower().split()) if query else None
+                if query_key and query_key in queries:
+                    self.stats['coalesced'] += 1
+                    logger.debug(f"搜索词重复，跳过: {query} ({video_id})")
+                    continue
+                if query_key:
+                    queries.add(query_key)
+                self.stats['queries'] += 1
                 
                 try:
-                    recommended = self.scraper.get_recommended_videos(video_id)
+                    recommended = self.scraper.get_recommended_videos(video_id, title=title)
                     
                     # 3. 从推荐视频中提取频道
                     for rec_video in recommended:
@@ -75,6 +87,17 @@ class KOLExpander:
         logger.info(f"批量扩散完成，共发现 {len(all_discovered)} 个新频道")
         return list(all_discovered)
     
+    def log_query_report(self):
+        """输出推荐查询的去重和缓存统计"""
+        cache_stats = self.scraper.related_search_cache.get_stats().get('related_search')
+        hits = cache_stats['hits'] if cache_stats else 0
+        searches = cache_stats['misses'] if cache_stats else 0
+        total = self.stats['queries'] + self.stats['coalesced']
+        if not total:
+            return
+        logger.info(f"推荐查询: 视频 {total} 个, 实际搜索 {searches} 次 "
+                   f"(同频道重复搜索词 {self.stats['coalesced']} 个, 跨频道缓存命中 {hits} 次)")
+    
     def extract_channels_from_recommendations(self, video_list):
         """从推荐视频列表中提取频道"""
         channels = set()
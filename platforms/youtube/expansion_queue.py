@@ -0,0 +1,107 @@
+"""
+扩散队列 - 基于租约的多worker工作队列
+
+多个扩散worker（线程或进程）可以同时消费youtube_expansion_queue：
+领取条目时原子地写入持有者和租约到期时间，处理期间定期续租；
+worker崩溃后租约过期，条目自动重新排队，多次失败的条目进入死信（dead）不再领取
+"""
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from utils.logger import setup_logger
+
+
+logger = setup_logger()
+
+
+class ExpansionQueue:
+    """
+    扩散队列客户端（每个worker一个实例，worker_id默认为 主机名-进程号-随机后缀）
+
+    - lease_seconds: 租约时长，持有者在此时间内没有续租则条目被回收
+    - max_attempts: 最多领取次数（包括租约过期），超过后进入死信
+    - heartbeat_interval: lease()处理期间后台续租的间隔，默认为租约时长的1/3
+    """
+
+    def __init__(self, repository, worker_id: Optional[str] = None, lease_seconds: float = 900,
+                 max_attempts: int = 3, heartbeat_interval: Optional[float] = None, clock=time.time):
+        self.repository = repository
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.heartbeat_interval = heartbeat_interval or max(lease_seconds / 3, 1)
+        self._clock = clock
+        self.stats = {'claimed': 0, 'completed': 0, 'retried': 0, 'dead': 0, 'requeued': 0, 'lost': 0}
+
+    def requeue_expired(self) -> int:
+        """回收过期租约，返回回收的条目数"""
+        rows = self.repository.requeue_expired_expansions(self._clock(), self.max_attempts)
+        dead = sum(1 for row in rows if row['status'] == 'dead')
+        self.stats['requeued'] += len(rows) - dead
+        self.stats['dead'] += dead
+        if rows:
+            logger.warning(f"回收过期的扩散租约 {len(rows)} 条（其中 {dead} 条进入死信）")
+        return len(rows)
+
+    def claim(self, limit: int = 1) -> List[Dict]:
+        """领取最多limit个条目（先回收过期租约）"""
+        self.requeue_expired()
+        items = self.repository.claim_expansion_items(self.worker_id, limit, self.lease_seconds, self._clock())
+        self.stats['claimed'] += len(items)
+        return items
+
+    def heartbeat(self, queue_id: str) -> bool:
+        """续租，返回是否仍持有该条目"""
+        return self.repository.heartbeat_expansion(queue_id, self.worker_id, self.lease_seconds, self._clock())
+
+    def complete(self, queue_id: str) -> bool:
+        if self.repository.complete_expansion(queue_id, self.worker_id):
+            self.stats['completed'] += 1
+            return True
+        self.stats['lost'] += 1
+        logger.warning(f"扩散条目 {queue_id} 的租约已失效，结果不再提交")
+        return False
+
+    def fail(self, queue_id: str, error) -> Optional[str]:
+        """记录失败，返回新状态（pending为稍后重试，dead为进入死信）"""
+        status = self.repository.fail_expansion(queue_id, self.worker_id, error, self.max_attempts)
+        if status == 'dead':
+            self.stats['dead'] += 1
+        elif status == 'pending':
+            self.stats['retried'] += 1
+        else:
+            self.stats['lost'] += 1
+        return status
+
+    @contextmanager
+    def lease(self, queue_id: str):
+        """处理条目期间在后台线程中定期续租"""
+        stop = threading.Event()
+
+        def keep_alive():
+            while not stop.wait(self.heartbeat_interval):
+                try:
+                    if not self.heartbeat(queue_id):
+                        logger.warning(f"扩散条目 {queue_id} 续租失败（租约已被回收）")
+                        return
+                except Exception as e:
+                    logger.debug(f"扩散条目续租出错: {e}")
+
+        thread = threading.Thread(target=keep_alive, name=f"expansion-lease-{queue_id[:8]}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def log_report(self):
+        queue_stats = self.repository.get_expansion_queue_stats()
+        logger.info(f"扩散队列 [{self.worker_id}]: 领取 {self.stats['claimed']}, 完成 {self.stats['completed']}, "
+                    f"重试 {self.stats['retried']}, 死信 {self.stats['dead']}, 回收 {self.stats['requeued']}; "
+                    f"队列剩余 {queue_stats.get('pending', 0)}, 处理中 {queue_stats.get('processing', 0)}, "
+                    f"死信 {queue_stats.get('dead', 0)}")
@@ -1,9 +1,8 @@
 """
 过滤模块
 """
-import json
 from utils.logger import setup_logger
-from utils.config_loader import get_absolute_path
+from utils.config_loader import get_config_snapshot
 
 
 logger = setup_logger()
@@ -14,10 +13,9 @@ class KOLFilter:
     
     def __init__(self, repository, config_path='config/config.json'):
         self.repository = repository
+        self.config_path = config_path
         
-        config_path = get_absolute_path(config_path)
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = get_config_snapshot(config_path)
         
         self.threshold = config['crawler']['ai_ratio_threshold']
         youtube_config = config.get('youtube', {})
@@ -25,6 +23,7 @@ class KOLFilter:
         self.competitor_names = youtube_exclusion.get('competitor_names', [])
         # 转换为小写以便不区分大小写匹配
         self.competitor_names_lower = [name.lower() for name in self.competitor_names]
+        self.competitor_matcher = config.matcher('youtube', 'exclusion_rules', 'competitor_names')
     
     def is_competitor(self, channel_name):
         """
@@ -34,12 +33,9 @@ class KOLFilter:
         if not channel_name:
             return False
         
-        channel_name_lower = channel_name.lower()
-        
-        for competitor in self.competitor_names_lower:
-            if competitor in channel_name_lower:
-                logger.info(f"排除竞对频道: {channel_name}")
-                return True
+        if self.competitor_matcher.contains_any(channel_name):
+            logger.info(f"排除竞对频道: {channel_name}")
+            return True
         
         return False
     
@@ -68,10 +64,8 @@ class KOLFilter:
         """
         qualified_count = self.repository.count_qualified_kols()
         
-        with open('config/config.json', 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        
-        max_kols = config['crawler']['max_qualified_kols']
+        # 配置快照：文件未修改时不读取文件，规则页修改上限后立即生效
+        max_kols = get_config_snapshot(self.config_path)['crawler']['max_qualified_kols']
         
         if qualified_count >= max_kols:
             logger.info(f"已达到最大KOL数量: {qualified_count}/{max_kols}")
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+yt-dlp提取结果磁盘缓存 - 视频/频道信息跨运行复用，重新分析、更新和扩散时不再重复提取
+
+每条记录按 (类型, ID) 的SHA1寻址存放在两级子目录中，内容为zlib压缩的JSON；
+只保存用到的字段（yt-dlp完整结果中的formats等大字段不保存）
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, Optional
+from utils.config_loader import get_project_root
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class YouTubeInfoCache:
+    """
+    yt-dlp提取结果磁盘缓存（线程安全；多进程共用同一目录时写入为原子替换）
+
+    字段分两类，分别设置有效期：
+    - immutable: 标题、发布时间、时长等基本不变的字段（immutable_ttl_hours）
+    - volatile: 观看数、点赞数等随时间变化的字段（volatile_ttl_hours）
+
+    get(fields='volatile')要求两类字段都未过期（需要最新指标时使用）；
+    get(fields='immutable')只要求不变字段未过期，返回结果不含变化字段。
+    缓存总大小超过max_bytes时按最近访问时间淘汰最旧的记录。
+    """
+
+    FIELDS = {
+        'video': {
+            'immutable': ('id', 'channel_id', 'channel', 'uploader_id', 'title', 'description',
+                          'timestamp', 'upload_date', 'duration', 'availability'),
+            'volatile': ('view_count', 'like_count', 'comment_count'),
+        },
+        'channel': {
+            'immutable': ('id', 'channel_id', 'channel', 'uploader', 'title', 'description'),
+            'volatile': ('channel_follower_count', 'playlist_count', 'view_count'),
+        },
+    }
+
+    def __init__(self, cache_dir: str = 'data/cache/youtube_info', max_bytes: int = 200 * 1024 * 1024,
+                 immutable_ttl_hours: float = 720, volatile_ttl_hours: float = 24, clock=time.time):
+        self.cache_dir = cache_dir if os.path.isabs(cache_dir) else os.path.join(get_project_root(), cache_dir)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = {'immutable': immutable_ttl_hours * 3600, 'volatile': volatile_ttl_hours * 3600}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._total_bytes = None  # 首次写入时扫描目录得到
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'writes': 0, 'evictions': 0}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['YouTubeInfoCache']:
+        """由youtube.info_cache配置创建，未启用时返回None"""
+        if not config.get('enabled', True):
+            return None
+        return cls(
+            cache_dir=config.get('cache_dir', 'data/cache/youtube_info'),
+            max_bytes=int(config.get('max_size_mb', 200) * 1024 * 1024),
+            immutable_ttl_hours=config.get('immutable_ttl_hours', 720),
+            volatile_ttl_hours=config.get('volatile_ttl_hours', 24)
+        )
+
+    def _path(self, kind: str, key: str) -> str:
+        digest = hashlib.sha1(f"{kind}:{key}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest + '.json.z')
+
+    def _read(self, path: str) -> Optional[Dict]:
+        try:
+            with open(path, 'rb') as f:
+                return json.loads(zlib.decompress(f.read()).decode('utf-8'))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, zlib.error) as e:
+            logger.debug(f"读取信息缓存失败: {path}, {e}")
+            return None
+
+    def get(self, kind: str, key: str, fields: str = 'volatile') -> Optional[Dict]:
+        """
+        获取缓存的信息字典
+
+        Args:
+            kind: 'video' 或 'channel'
+            key: video_id / channel_id
+            fields: 'volatile'（需要最新指标）或 'immutable'（只需要基本信息）
+
+        Returns:
+            信息字典，不存在或所需字段已过期返回None
+        """
+        path = self._path(kind, key)
+        record = self._read(path)
+        if record is None or record.get('key') != key:
+            self.stats['misses'] += 1
+            return None
+
+        age = self._clock() - record['fetched_ts']
+        if age >= self.ttl_seconds['immutable'] or (fields == 'volatile' and age >= self.ttl_seconds['volatile']):
+            self.stats['stale'] += 1
+            return None
+
+        self.stats['hits'] += 1
+        try:
+            now = self._clock()
+            os.utime(path, (now, now))  # 记录访问时间，淘汰时保留常用的记录
+        except OSError:
+            pass
+        info = dict(record['immutable'])
+        if fields == 'volatile':
+            info.update(record['volatile'])
+        return info
+
+    def get_many(self, kind: str, keys: Iterable[str], fields: str = 'volatile') -> Dict[str, Dict]:
+        """批量获取，返回 {key: 信息字典}（只包含命中的key）"""
+        found = {}
+        for key in keys:
+            info = self.get(kind, key, fields)
+            if info is not None:
+                found[key] = info
+        return found
+
+    def put(self, kind: str, key: str, info: Dict, fetched_ts: Optional[float] = None):
+        """写入yt-dlp提取结果（只保存FIELDS中的字段）"""
+        fields = self.FIELDS[kind]
+        record = {
+            'kind': kind,
+            'key': key,
+            'fetched_ts': fetched_ts if fetched_ts is not None else self._clock(),
+            'immutable': {name: info[name] for name in fields['immutable'] if info.get(name) is not None},
+            'volatile': {name: info[name] for name in fields['volatile'] if info.get(name) is not None},
+        }
+        data = zlib.compress(json.dumps(record, ensure_ascii=False).encode('utf-8'))
+
+        path = self._path(kind, key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            os.utime(path, (record['fetched_ts'], record['fetched_ts']))
+        except OSError as e:
+            logger.debug(f"写入信息缓存失败: {kind} {key}, {e}")
+            return
+
+        with self._lock:
+            self.stats['writes'] += 1
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(data) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        """[(访问时间, 大小, 路径)]"""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json.z'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """淘汰最久未访问的记录，直到总大小降到max_bytes的90%（调用方持有锁）"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.stats['evictions'] += 1
+        self._total_bytes = total
+
+    def get_stats(self) -> Dict:
+        stats = dict(self.stats)
+        lookups = stats['hits'] + stats['misses'] + stats['stale']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def log_report(self):
+        """输出信息缓存命中率"""
+        stats = self.get_stats()
+        lookups = stats['hits'] + stats['misses'] + stats['stale']
+        if not lookups:
+            return
+        logger.info(f"yt-dlp信息缓存命中率: {stats['hits']}/{lookups} ({stats['hit_rate']:.1%})，"
+                   f"过期 {stats['stale']}，写入 {stats['writes']}，淘汰 {stats['evictions']}")
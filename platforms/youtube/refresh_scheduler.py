@@ -0,0 +1,108 @@
+"""
+KOL刷新调度器 - 按更新频率、数据变化速度和优先级计算每个频道的下次刷新时间
+"""
+import time
+from typing import Dict, List, Optional
+from utils.logger import setup_logger
+
+
+logger = setup_logger()
+
+
+class RefreshScheduler:
+    """
+    KOL刷新调度器
+
+    每个合格KOL有一个下次刷新时间（youtube_refresh_schedule表，按时间建索引），
+    更新任务每次只处理已到期的KOL。刷新间隔：
+        基础间隔 = 距离最后一个视频的天数 × cadence_factor（每天更新的频道间隔短，长期不更新的间隔长）
+        × 变化系数（上次刷新后指标变化大则缩短，几乎不变则延长）
+        × 优先级系数（优先级0~100，对应1.5~0.5倍）
+    最后限制在 [min_interval_hours, max_interval_hours] 之间。
+
+    刷新失败的KOL按 min_interval_hours × 2^连续失败次数 退避重试（不超过max_interval_hours）。
+    """
+
+    def __init__(self, repository, min_interval_hours: float = 24, max_interval_hours: float = 720,
+                 cadence_factor: float = 0.5, low_change: float = 0.05, high_change: float = 0.3,
+                 max_per_run: Optional[int] = None):
+        self.repository = repository
+        self.min_interval_hours = min_interval_hours
+        self.max_interval_hours = max_interval_hours
+        self.cadence_factor = cadence_factor
+        self.low_change = low_change
+        self.high_change = high_change
+        self.max_per_run = max_per_run or None
+
+    def get_due_kols(self, now: Optional[float] = None) -> List[Dict]:
+        """获取本次需要刷新的KOL（没有刷新计划的新KOL优先，其余按到期时间）"""
+        return self.repository.get_due_kols(now if now is not None else time.time(), self.max_per_run)
+
+    @staticmethod
+    def change_score(old_kol: Dict, update_data: Dict) -> float:
+        """
+        上次刷新以来指标的变化程度（各指标相对变化的最大值）
+
+        AI占比使用绝对变化（本身就是比例）
+        """
+        score = 0.0
+        for key in ('avg_views', 'avg_likes', 'avg_comments', 'engagement_rate'):
+            if key not in update_data:
+                continue
+            old = old_kol.get(key) or 0
+            new = update_data[key] or 0
+            if old == new:
+                continue
+            score = max(score, abs(new - old) / max(abs(old), 1e-9) if old else 1.0)
+        if 'ai_ratio' in update_data and old_kol.get('ai_ratio') is not None:
+            score = max(score, abs(update_data['ai_ratio'] - old_kol['ai_ratio']))
+        return score
+
+    def interval_hours(self, days_since_last_video: Optional[int], change: float, priority: float) -> float:
+        """计算刷新间隔（小时）"""
+        if days_since_last_video is None:
+            base = self.max_interval_hours
+        else:
+            base = max(days_since_last_video, 1) * 24 * self.cadence_factor
+
+        if change >= self.high_change:
+            base *= 0.5
+        elif change < self.low_change:
+            base *= 1.5
+
+        priority = min(max(priority or 0, 0), 100)
+        base *= 1.5 - priority / 100
+
+        return min(max(base, self.min_interval_hours), self.max_interval_hours)
+
+    def schedule(self, channel_id: str, days_since_last_video: Optional[int], change: float, priority: float,
+                 now: Optional[float] = None) -> float:
+        """
+        记录本次刷新并计算下次刷新时间
+
+        Returns:
+            刷新间隔（小时）
+        """
+        now = now if now is not None else time.time()
+        hours = self.interval_hours(days_since_last_video, change, priority)
+        self.repository.save_refresh_schedule(channel_id, now + hours * 3600, hours, round(change, 4), now)
+        return hours
+
+    def retry_interval_hours(self, failures: int) -> float:
+        """第failures+1次连续失败后的重试间隔（小时）"""
+        return min(self.min_interval_hours * 2 ** max(failures or 0, 0), self.max_interval_hours)
+
+    def schedule_retry(self, channel_id: str, failures: int = 0, now: Optional[float] = None) -> float:
+        """
+        刷新失败时安排退避重试（失败的KOL不会一直停留在到期状态，也不会被永久跳过）
+
+        Args:
+            failures: 本次失败之前的连续失败次数
+
+        Returns:
+            重试间隔（小时）
+        """
+        now = now if now is not None else time.time()
+        hours = self.retry_interval_hours(failures)
+        self.repository.save_refresh_failure(channel_id, now + hours * 3600, hours)
+        return hours
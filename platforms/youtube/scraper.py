@@ -1,11 +1,15 @@
 """
 yt-dlp爬虫核心模块
 """
-import yt_dlp
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from utils.rate_limiter import RateLimiter
 from utils.retry import retry_on_failure
 from utils.logger import setup_logger
+from utils.ttl_cache import TTLCache
+from platforms.youtube.channel_cache import YouTubeChannelCache
+from platforms.youtube.ydl_pool import YoutubeDLPool
+from platforms.youtube.info_cache import YouTubeInfoCache
 
 
 logger = setup_logger()
@@ -14,8 +18,32 @@ logger = setup_logger()
 class YouTubeScraper:
     """YouTube爬虫（基于yt-dlp）"""
     
-    def __init__(self):
+    # 频道URL格式（按尝试顺序），频道信息缓存会记住每个频道可用的格式
+    CHANNEL_URL_FORMS = [
+        ('channel', 'https://www.youtube.com/channel/{}'),
+        ('@', 'https://www.youtube.com/@{}'),
+        ('c', 'https://www.youtube.com/c/{}'),
+    ]
+    
+    # YoutubeDL选项配置（在ydl_opts基础上覆盖的选项），相同配置的实例在实例池中复用
+    YDL_PROFILES = {
+        'flat': {},                                                   # 搜索
+        'in_playlist': {'extract_flat': 'in_playlist', 'ignoreerrors': True, 'socket_timeout': 15},  # 频道信息
+        'channel_videos': {'ignoreerrors': True},                     # 频道视频列表
+        'full': {'extract_flat': False, 'ignoreerrors': True},        # 视频详情
+        'full_strict': {'extract_flat': False},                       # 推荐视频的来源标题（出错时抛出异常）
+    }
+    
+    def __init__(self, channel_cache: YouTubeChannelCache = None, ydl_pool: YoutubeDLPool = None,
+                 info_cache: YouTubeInfoCache = None):
         self.rate_limiter = RateLimiter()
+        # 未传入时使用本实例的内存缓存；传入共享缓存时同一频道在整个运行中只解析一次
+        self.channel_cache = channel_cache or YouTubeChannelCache()
+        self.ydl_pool = ydl_pool or YoutubeDLPool()
+        # yt-dlp提取结果磁盘缓存（可选），请求网络前先查询
+        self.info_cache = info_cache
+        # 相关视频搜索结果（扩散时同一运行内不同视频/频道的相同搜索词复用）
+        self.related_search_cache = TTLCache(ttl_seconds=None, max_entries=2000)
         self.ydl_opts = {
             'quiet': True,
             'no_warnings': True,
@@ -35,6 +63,18 @@ class YouTubeScraper:
             }
         }
     
+    def _ydl(self, profile, **overrides):
+        """
+        从实例池取出指定配置的YoutubeDL实例（with语句中使用，用完自动放回）
+        
+        Args:
+            profile: YDL_PROFILES中的配置名
+            overrides: 额外覆盖的选项（如playlistend），不同取值使用不同的实例
+        """
+        opts = dict(self.ydl_opts, **self.YDL_PROFILES[profile], **overrides)
+        key = (profile,) + tuple(sorted(overrides.items()))
+        return self.ydl_pool.checkout(key, opts)
+    
     @retry_on_failure()
     def search_videos(self, keyword, max_results=50):
         """
@@ -45,7 +85,7 @@ class YouTubeScraper:
         
         search_query = f"ytsearch{max_results}:{keyword}"
         
-        with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
+        with self._ydl('flat') as ydl:
             try:
                 result = ydl.extract_info(search_query, download=False)
                 videos = result.get('entries', [])
@@ -53,6 +93,7 @@ class YouTubeScraper:
                 logger.info(f"搜索关键词 '{keyword}' 找到 {len(videos)} 个视频")
                 return videos
             except Exception as e:
+                self.rate_limiter.observe_error(e)
                 logger.error(f"搜索失败: {keyword}, 错误: {str(e)}")
                 raise
     
@@ -62,45 +103,44 @@ class YouTubeScraper:
         获取频道基本信息
         返回: 频道信息字典
         """
+        cached = self.channel_cache.get(channel_id)
+        if cached is not None:
+            logger.info(f"  获取频道信息成功（缓存）: {cached['channel_name']}")
+            return cached
+        
+        if self.info_cache:
+            info = self.info_cache.get('channel', channel_id)
+            if info is not None:
+                url_form, channel_url = self._channel_urls(channel_id)[0]
+                channel_data = self._build_channel_data(channel_id, channel_url, info)
+                self.channel_cache.put(channel_id, channel_data, url_form=url_form)
+                logger.info(f"  获取频道信息成功（磁盘缓存）: {channel_data['channel_name']}")
+                return dict(channel_data)
+        
         self.rate_limiter.wait()
         
-        # 尝试多种URL格式
-        urls = [
-            f"https://www.youtube.com/channel/{channel_id}",
-            f"https://www.youtube.com/@{channel_id}",
-            f"https://www.youtube.com/c/{channel_id}"
-        ]
-        
-        for channel_url in urls:
-            opts = self.ydl_opts.copy()
-            opts['extract_flat'] = 'in_playlist'
-            opts['ignoreerrors'] = True
-            opts['socket_timeout'] = 15  # 15秒超时
-            
-            with yt_dlp.YoutubeDL(opts) as ydl:
+        # 尝试多种URL格式（已知可用的格式优先）
+        for url_form, channel_url in self._channel_urls(channel_id):
+            with self._ydl('in_playlist') as ydl:
                 try:
                     info = ydl.extract_info(channel_url, download=False)
                     
                     if info:
-                        channel_data = {
-                            'channel_id': channel_id,
-                            'channel_name': info.get('channel', info.get('uploader', info.get('title', ''))),
-                            'channel_url': channel_url,
-                            'subscribers': info.get('channel_follower_count', 0),
-                            'total_videos': info.get('playlist_count', 0),
-                            'total_views': info.get('view_count', 0),
-                            'description': info.get('description', ''),  # 添加频道描述
-                        }
+                        channel_data = self._build_channel_data(channel_id, channel_url, info)
+                        if self.info_cache:
+                            self.info_cache.put('channel', channel_id, info)
                         
+                        self.channel_cache.put(channel_id, channel_data, url_form=url_form)
                         logger.info(f"  获取频道信息成功: {channel_data['channel_name']}")
                         return channel_data
                 except Exception as e:
+                    self.rate_limiter.observe_error(e)
                     logger.debug(f"尝试URL失败: {channel_url}, 错误: {str(e)}")
                     continue
         
         # 如果所有URL都失败，返回基本信息
         logger.warning(f"无法获取频道详细信息: {channel_id}，使用基本信息")
-        return {
+        channel_data = {
             'channel_id': channel_id,
             'channel_name': f'Channel_{channel_id[:8]}',
             'channel_url': f"https://www.youtube.com/channel/{channel_id}",
@@ -109,6 +149,36 @@ class YouTubeScraper:
             'total_views': 0,
             'description': '',
         }
+        # 本次运行内不再重复尝试，但不写入数据库（下次运行重新解析）
+        self.channel_cache.put(channel_id, channel_data, persist=False)
+        return dict(channel_data)
+    
+    @staticmethod
+    def _build_channel_data(channel_id, channel_url, info):
+        """频道提取结果 -> 频道信息字典"""
+        return {
+            'channel_id': channel_id,
+            'channel_name': info.get('channel', info.get('uploader', info.get('title', ''))),
+            'channel_url': channel_url,
+            'subscribers': info.get('channel_follower_count', 0),
+            'total_videos': info.get('playlist_count', 0),
+            'total_views': info.get('view_count', 0),
+            'description': info.get('description', ''),  # 添加频道描述
+        }
+    
+    def _channel_urls(self, channel_id, suffix='', forms=None):
+        """
+        频道URL列表 [(格式, URL)]，已知可用的格式排在最前面
+        
+        Args:
+            suffix: URL后缀（如 '/videos'）
+            forms: 只使用这些格式
+        """
+        urls = [(form, template.format(channel_id) + suffix) for form, template in self.CHANNEL_URL_FORMS
+                if forms is None or form in forms]
+        known_form = self.channel_cache.get_url_form(channel_id)
+        urls.sort(key=lambda item: item[0] != known_form)
+        return urls
     
     @retry_on_failure()
     def get_channel_videos(self, channel_id, limit=50):
@@ -118,81 +188,64 @@ class YouTubeScraper:
         """
         self.rate_limiter.wait()
         
-        # 尝试多种URL格式
-        urls = [
-            f"https://www.youtube.com/channel/{channel_id}/videos",
-            f"https://www.youtube.com/@{channel_id}/videos"
-        ]
-        
-        for channel_url in urls:
-            opts = self.ydl_opts.copy()
-            opts['playlistend'] = limit
-            opts['ignoreerrors'] = True
-            
-            with yt_dlp.YoutubeDL(opts) as ydl:
+        # 尝试多种URL格式（已知可用的格式优先）
+        for url_form, channel_url in self._channel_urls(channel_id, '/videos', forms=('channel', '@')):
+            with self._ydl('channel_videos', playlistend=limit) as ydl:
                 try:
                     result = ydl.extract_info(channel_url, download=False)
                     
                     if result and 'entries' in result:
                         videos = [v for v in result.get('entries', []) if v is not None]
+                        self.channel_cache.set_url_form(channel_id, url_form)
                         logger.info(f"获取频道 {channel_id} 的 {len(videos)} 个视频")
                         return videos[:limit]
                 except Exception as e:
+                    self.rate_limiter.observe_error(e)
                     logger.debug(f"尝试URL失败: {channel_url}, 错误: {str(e)}")
                     continue
         
         logger.error(f"获取频道视频失败: {channel_id}")
         return []
     
-    @retry_on_failure()
     def get_video_info(self, video_id):
         """
-        获取单个视频详细信息
+        获取单个视频详细信息（先查询磁盘缓存）
         返回: 视频信息字典
         """
+        if self.info_cache:
+            info = self.info_cache.get('video', video_id)
+            if info is not None:
+                return self._build_cached_video_data(video_id, info)
+        return self._extract_video_info(video_id)
+    
+    def _build_cached_video_data(self, video_id, info):
+        """缓存的提取结果 -> 视频信息字典（与网络提取相同的会员视频检查）"""
+        if info.get('availability') == 'subscriber_only':
+            raise Exception("会员专属视频，跳过")
+        return self._build_video_data(video_id, info)
+    
+    @retry_on_failure()
+    def _extract_video_info(self, video_id):
+        """完整提取单个视频信息（网络请求），结果写入磁盘缓存"""
         self.rate_limiter.wait()
         
         video_url = f"https://www.youtube.com/watch?v={video_id}"
         
-        opts = self.ydl_opts.copy()
-        opts['extract_flat'] = False
-        opts['ignoreerrors'] = True
-        opts['quiet'] = True  # 抑制错误输出
-        opts['no_warnings'] = True
-        
-        with yt_dlp.YoutubeDL(opts) as ydl:
+        with self._ydl('full') as ydl:
             try:
                 info = ydl.extract_info(video_url, download=False)
                 
                 if not info:
                     raise Exception("无法获取视频信息")
                 
+                if self.info_cache:
+                    self.info_cache.put('video', video_id, info)
+                
                 # 检查是否是会员专属视频
                 if info.get('availability') == 'subscriber_only':
                     raise Exception("会员专属视频，跳过")
                 
-                # 处理时间戳
-                published_at = None
-                if info.get('timestamp'):
-                    published_at = datetime.fromtimestamp(info.get('timestamp'))
-                elif info.get('upload_date'):
-                    from datetime import datetime as dt
-                    published_at = dt.strptime(info.get('upload_date'), '%Y%m%d')
-                
-                video_data = {
-                    'video_id': video_id,
-                    'channel_id': info.get('channel_id', ''),
-                    'title': info.get('title', ''),
-                    'description': info.get('description', ''),
-                    'published_at': published_at or datetime.now(),
-                    'duration': info.get('duration', 0),
-                    'views': info.get('view_count') or 0,
-                    'likes': info.get('like_count') or 0,
-                    'comments': info.get('comment_count') or 0,
-                    'video_url': video_url,
-                }
-                
-                return video_data
+                return self._build_video_data(video_id, info)
             except Exception as e:
                 error_msg = str(e)
                 # 简化错误信息
@@ -202,54 +255,166 @@ class YouTubeScraper:
                     logger.error(f"✗ 获取视频信息失败: {video_id}")
                 raise
     
+    def fetch_videos_info(self, video_ids, max_workers=1):
+        """
+        批量获取视频详细信息
+        
+        max_workers大于1时用有界线程池并发提取（网络等待重叠），每个请求仍经过共享限速器，
+        总请求速率不超过配置；单个视频失败不影响其他视频
+        
+        磁盘缓存中的视频先一次性取出，只有未命中的视频发起请求
+        
+        返回: 与video_ids顺序一致的列表，获取失败的视频为None
+        """
+        video_ids = list(video_ids)
+        cached = self.info_cache.get_many('video', video_ids) if self.info_cache else {}
+        # 已批量查询过缓存，未命中的视频直接提取（不再逐个查询缓存）
+        extract = self._extract_video_info if self.info_cache else self.get_video_info
+        
+        def fetch(video_id):
+            try:
+                if video_id in cached:
+                    return self._build_cached_video_data(video_id, cached[video_id])
+                return extract(video_id)
+            except Exception as e:
+                logger.warning(f"  ⚠ 获取视频详情失败: {video_id}, {str(e)}")
+                return None
+        
+        missing = len(video_ids) - len(cached)
+        if max_workers <= 1 or missing <= 1:
+            return [fetch(video_id) for video_id in video_ids]
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, missing),
+                                thread_name_prefix='youtube-video') as executor:
+            return list(executor.map(fetch, video_ids))
+    
+    @staticmethod
+    def _parse_published_at(info):
+        """从yt-dlp信息中解析发布时间，没有时间信息返回None"""
+        if info.get('timestamp'):
+            return datetime.fromtimestamp(info['timestamp'])
+        if info.get('upload_date'):
+            return datetime.strptime(info['upload_date'], '%Y%m%d')
+        return None
+    
+    def _build_video_data(self, video_id, info):
+        """完整提取结果 -> 视频信息字典"""
+        return {
+            'video_id': video_id,
+            'channel_id': info.get('channel_id', ''),
+            'title': info.get('title', ''),
+            'description': info.get('description', ''),
+            'published_at': self._parse_published_at(info) or datetime.now(),
+            'duration': info.get('duration', 0),
+            'views': info.get('view_count') or 0,
+            'likes': info.get('like_count') or 0,
+            'comments': info.get('comment_count') or 0,
+            'video_url': f"https://www.youtube.com/watch?v={video_id}",
+            'full_metadata': True,
+        }
+    
+    def video_from_entry(self, entry, channel_id=''):
+        """
+        频道视频列表（extract_flat）中的条目 -> 视频信息字典，不发起请求
+        
+        列表条目通常带有观看数，部分带有发布时间，没有点赞数和评论数；
+        缺失的指标为None（full_metadata为False），需要时再用get_video_info完整提取
+        """
+        video_id = entry.get('id', '')
+        return {
+            'video_id': video_id,
+            'channel_id': entry.get('channel_id') or channel_id,
+            'title': entry.get('title') or '',
+            'description': entry.get('description') or '',
+            'published_at': self._parse_published_at(entry),
+            'duration': entry.get('duration') or 0,
+            'views': entry.get('view_count'),
+            'likes': entry.get('like_count'),
+            'comments': entry.get('comment_count'),
+            'video_url': f"https://www.youtube.com/watch?v={video_id}",
+            'full_metadata': False,
+        }
+    
+    @staticmethod
+    def recommendation_query(title):
+        """由视频标题生成相关视频搜索词（取前3个词）"""
+        return ' '.join((title or '').split()[:3])
+    
     @retry_on_failure()
-    def get_recommended_videos(self, video_id, limit=10):
+    def search_related_videos(self, query, limit=10):
+        """
+        搜索相关视频（结果按规范化的搜索词缓存，本次运行内相同搜索词只请求一次）
+        
+        返回: 视频列表（extract_flat条目，含channel_id）
+        """
+        key = (' '.join(query.lower().split()), limit)
+        cached = self.related_search_cache.get(key, label='related_search')
+        if cached is not None:
+            logger.debug(f"相关视频搜索命中缓存: {query}")
+            return list(cached)
+        
+        self.rate_limiter.wait()
+        
+        with self._ydl('flat') as ydl:
+            try:
+                result = ydl.extract_info(f"ytsearch{limit}:{query}", download=False)
+            except Exception as e:
+                self.rate_limiter.observe_error(e)
+                raise
+        
+        videos = [v for v in (result or {}).get('entries', []) if v]
+        self.related_search_cache.set(key, videos)
+        return list(videos)
+    
+    def get_recommended_videos(self, video_id, limit=10, title=None):
         """
         获取视频的推荐列表
         
         注意: yt-dlp不直接支持推荐视频API
         这里使用替代策略：通过搜索相关视频来模拟推荐
         
+        Args:
+            title: 视频标题（调用方已知时传入，省去一次视频详情提取）
+        
         返回: 推荐视频列表
         """
-        self.rate_limiter.wait()
-        
         try:
-            # 策略1: 获取视频信息，然后基于标题搜索相关视频
-            video_url = f"https://www.youtube.com/watch?v={video_id}"
+            if title is None:
+                title = self._get_video_title(video_id)
             
-            opts = self.ydl_opts.copy()
-            opts['extract_flat'] = False
-            opts['quiet'] = True
-            opts['no_warnings'] = True
+            # 提取视频标题中的关键词，基于关键词搜索相关视频
+            keywords = self.recommendation_query(title)
+            if not keywords:
+                return []
+            
+            # 过滤掉原视频
+            recommended = [v for v in self.search_related_videos(keywords, limit) if v.get('id') != video_id]
+            
+            logger.debug(f"通过搜索找到 {len(recommended)} 个相关视频: {video_id}")
+            return recommended[:limit]
             
-            with yt_dlp.YoutubeDL(opts) as ydl:
-                info = ydl.extract_info(video_url, download=False)
-                
-                if not info:
-                    return []
-                
-                # 提取视频标题中的关键词（取前3个词）
-                title = info.get('title', '')
-                keywords = ' '.join(title.split()[:3])
-                
-                # 基于关键词搜索相关视频
-                if keywords:
-                    search_query = f"ytsearch{limit}:{keywords}"
-                    search_result = ydl.extract_info(search_query, download=False)
-                    recommended = search_result.get('entries', [])
-                    
-                    # 过滤掉原视频
-                    recommended = [v for v in recommended if v and v.get('id') != video_id]
-                    
-                    logger.debug(f"通过搜索找到 {len(recommended)} 个相关视频: {video_id}")
-                    return recommended[:limit]
-                
         except Exception as e:
+            self.rate_limiter.observe_error(e)
             logger.debug(f"获取推荐视频失败: {video_id}, {str(e)}")
         
         return []
     
+    @retry_on_failure()
+    def _get_video_title(self, video_id):
+        """完整提取视频信息，只取标题（磁盘缓存中的标题不随观看数过期）"""
+        if self.info_cache:
+            info = self.info_cache.get('video', video_id, fields='immutable')
+            if info is not None and info.get('title'):
+                return info['title']
+        
+        self.rate_limiter.wait()
+        
+        with self._ydl('full_strict') as ydl:
+            info = ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
+        if info and self.info_cache:
+            self.info_cache.put('video', video_id, info)
+        return (info or {}).get('title', '')
+    
     def extract_channel_id(self, video_info):
         """从视频信息中提取频道ID"""
         return video_info.get('channel_id', video_info.get('uploader_id', ''))
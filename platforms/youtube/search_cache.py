@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+YouTube关键词搜索结果缓存 - 按规范化后的搜索词缓存，支持TTL
+"""
+import re
+import time
+import unicodedata
+from typing import List, Dict, Optional
+from utils.ttl_cache import TTLCache
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class YouTubeSearchCache:
+    """
+    YouTube搜索结果缓存
+
+    两级缓存：
+    - 内存（本次运行内复用）
+    - 数据库（传入repository时启用，跨运行复用）
+
+    缓存键为规范化后的搜索词（"Sora AI"、"sora  ai"、"Sora-AI" 为同一个键）；
+    只保存提取频道用到的字段。
+    """
+
+    # 搜索结果中保留的字段
+    RESULT_FIELDS = ('id', 'title', 'channel_id', 'uploader_id', 'channel')
+
+    def __init__(self, ttl_hours: float = 24, repository=None):
+        self.ttl_seconds = ttl_hours * 3600
+        self.repository = repository
+        self.memory = TTLCache(ttl_seconds=self.ttl_seconds, max_entries=1000)
+
+        if self.repository:
+            self.repository.purge_expired(time.time() - self.ttl_seconds)
+
+    @staticmethod
+    def normalize_query(keyword: str) -> str:
+        """规范化搜索词：全角转半角、不区分大小写、标点视为空白、重复的词只保留一次"""
+        text = unicodedata.normalize('NFKC', keyword or '').lower()
+        tokens = re.sub(r'[^\w]+', ' ', text).split()
+        return ' '.join(dict.fromkeys(tokens))
+
+    def get(self, keyword: str, max_results: int) -> Optional[List[Dict]]:
+        """
+        查询缓存
+
+        缓存的结果数不少于本次请求数时才命中，或者上次搜索结果本身就不足（说明搜索结果已取尽）
+
+        Returns:
+            命中返回视频列表（最多max_results个），未命中返回None
+        """
+        key = self.normalize_query(keyword)
+
+        entry = self.memory.get(key)
+        if entry is None and self.repository:
+            saved = self.repository.get(key)
+            if saved and time.time() - saved['fetched_ts'] < self.ttl_seconds:
+                entry = saved
+                self.memory.set(key, entry, stored_at=saved['fetched_ts'])
+
+        if entry is not None and (entry['max_results'] >= max_results or len(entry['results']) < entry['max_results']):
+            self.memory.record('keyword_search', True)
+            return [dict(video) for video in entry['results'][:max_results]]
+
+        self.memory.record('keyword_search', False)
+        return None
+
+    def put(self, keyword: str, max_results: int, videos: List[Dict]):
+        """写入缓存（空结果可能是限流导致的，不缓存）"""
+        if not videos:
+            return
+
+        key = self.normalize_query(keyword)
+        results = [{field: video.get(field) for field in self.RESULT_FIELDS if video.get(field) is not None}
+                   for video in videos if video]
+        fetched_ts = time.time()
+        entry = {'results': results, 'max_results': max_results, 'fetched_ts': fetched_ts}
+        self.memory.set(key, entry, stored_at=fetched_ts)
+
+        if self.repository:
+            self.repository.save(key, max_results, results, fetched_ts)
+
+    def get_stats(self) -> Dict:
+        """获取命中率统计 {'hits', 'misses', 'hit_rate'}"""
+        return self.memory.get_stats().get('keyword_search', {'hits': 0, 'misses': 0, 'hit_rate': 0.0})
+
+    def log_report(self):
+        """输出搜索缓存命中率"""
+        stats = self.get_stats()
+        total = stats['hits'] + stats['misses']
+        if not total:
+            return
+        logger.info(f"搜索缓存命中率 (TTL: {self.ttl_seconds / 3600:g} 小时): {stats['hits']}/{total} "
+                   f"({stats['hit_rate']:.1%})，节省 {stats['hits']} 次搜索请求")
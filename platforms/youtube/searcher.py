@@ -1,10 +1,9 @@
 """
 关键词搜索模块
 """
-import json
 import random
 from utils.logger import setup_logger
-from utils.config_loader import get_absolute_path
+from utils.config_loader import get_config_snapshot
 
 
 logger = setup_logger()
@@ -13,12 +12,16 @@ logger = setup_logger()
 class KeywordSearcher:
     """关键词搜索器"""
     
-    def __init__(self, scraper, config_path='config/config.json'):
+    def __init__(self, scraper, config_path='config/config.json', scheduler=None, search_cache=None,
+                 overlap_tracker=None, is_known_channel=None):
         self.scraper = scraper
+        self.scheduler = scheduler  # 关键词调度器（KeywordScheduler），为None时随机选择关键词
+        self.search_cache = search_cache  # 搜索结果缓存（YouTubeSearchCache），按规范化搜索词复用
+        self.overlap_tracker = overlap_tracker  # 关键词重叠度（KeywordOverlapTracker），跳过结果高度重叠的关键词
+        self.is_known_channel = is_known_channel  # channel_id -> 是否已入库（统计关键词的新频道产出）
+        self.channel_sources = {}  # channel_id -> 发现该频道的关键词
         
-        config_path = get_absolute_path(config_path)
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = get_config_snapshot(config_path)
         
         self.keywords = self._load_keywords(config)
         self.max_results = config['crawler']['search_results_per_keyword']
@@ -33,44 +36,95 @@ class KeywordSearcher:
     def search_by_keywords(self, keyword_limit=30):
         """
         按关键词搜索，返回候选频道列表
-        使用随机关键词避免每次都是相同的
+        有调度器时按历史产出率（Thompson采样）选择关键词，否则随机选择
         """
-        logger.info(f"开始关键词搜索，从 {len(self.keywords)} 个关键词中随机选择 {keyword_limit} 个")
+        if self.scheduler:
+            logger.info(f"开始关键词搜索，从 {len(self.keywords)} 个关键词中按调度器选择 {keyword_limit} 个")
+            ranked_keywords = [kw for kw, _ in self.scheduler.rank(self.keywords)]
+        else:
+            logger.info(f"开始关键词搜索，从 {len(self.keywords)} 个关键词中随机选择 {keyword_limit} 个")
+            
+            # 随机选择关键词
+            ranked_keywords = random.sample(self.keywords, len(self.keywords))
         
-        # 随机选择关键词
-        if keyword_limit >= len(self.keywords):
-            selected_keywords = self.keywords
+        # 结果高度重叠的关键词对只搜索新频道产出高的一个
+        if self.overlap_tracker:
+            new_channel_rate = self.scheduler.new_channel_rate if self.scheduler else None
+            selected_keywords = self.overlap_tracker.select(ranked_keywords, keyword_limit, new_channel_rate)
         else:
-            selected_keywords = random.sample(self.keywords, keyword_limit)
+            selected_keywords = ranked_keywords[:keyword_limit]
         
         logger.info(f"本次使用的关键词: {', '.join(selected_keywords[:5])}{'...' if len(selected_keywords) > 5 else ''}")
         
         all_channels = set()
+        keyword_channels = {}  # keyword -> 返回的频道集合（计算关键词重叠度）
         
         for i, keyword in enumerate(selected_keywords):
             logger.info(f"搜索关键词 [{i+1}/{len(selected_keywords)}]: '{keyword}'")
             
             try:
-                videos = self.scraper.search_videos(keyword, self.max_results)
+                videos = self.search_cache.get(keyword, self.max_results) if self.search_cache else None
+                cached = videos is not None
+                if not cached:
+                    videos = self.scraper.search_videos(keyword, self.max_results)
+                    if self.search_cache:
+                        self.search_cache.put(keyword, self.max_results, videos)
+                
+                # 缓存命中也计为一次搜索（与GitHub一致）：缓存结果中的频道同样会计入该关键词的产出，
+                # 请求数与产出要按同一口径统计，否则 (alpha + 产出) / (beta + 请求数) 的估计偏高
+                if self.scheduler:
+                    self.scheduler.record_request(keyword)
                 
                 # 提取频道ID
                 channels_found = 0
+                channels = set()
                 for video in videos:
                     channel_id = self.scraper.extract_channel_id(video)
                     if channel_id:
-                        all_channels.add(channel_id)
+                        channels.add(channel_id)
                         channels_found += 1
                 
-                logger.info(f"  └─ 从 {len(videos)} 个视频中提取 {channels_found} 个频道")
+                # 新频道：本次运行中其他关键词没找到过、也没有入库的频道
+                new_channels = {c for c in channels - all_channels
+                                if not (self.is_known_channel and self.is_known_channel(c))}
+                for channel_id in channels:
+                    self.channel_sources.setdefault(channel_id, keyword)
+                all_channels.update(channels)
+                keyword_channels[keyword] = channels
+                
+                if self.scheduler:
+                    self.scheduler.record_channels(keyword, len(channels), len(new_channels))
+                
+                logger.info(f"  └─ 从 {len(videos)} 个视频中提取 {channels_found} 个频道，其中新频道 {len(new_channels)} 个"
+                           f"{'（缓存）' if cached else ''}")
                 
             except Exception as e:
                 logger.error(f"  └─ 搜索失败: {str(e)}")
                 continue
         
+        if self.overlap_tracker:
+            self.overlap_tracker.observe(keyword_channels)
+        
         logger.info(f"关键词搜索完成，发现 {len(all_channels)} 个唯一频道")
         logger.info(f"说明: 3个关键词 × 10个视频/关键词 = 最多30个视频，来自 {len(all_channels)} 个不同频道")
         return list(all_channels)
     
+    def record_channel_outcome(self, channel_id, qualified):
+        """记录频道分析结果，合格时计入发现该频道的关键词产出"""
+        keyword = self.channel_sources.get(channel_id)
+        if keyword and qualified and self.scheduler:
+            self.scheduler.record_yield(keyword)
+    
+    def log_keyword_report(self):
+        """输出关键词调度统计"""
+        if self.scheduler:
+            self.scheduler.log_report()
+        if self.search_cache:
+            self.search_cache.log_report()
+        if self.overlap_tracker:
+            for row in self.overlap_tracker.get_redundant_pairs()[:5]:
+                logger.info(f"  重叠关键词: {' / '.join(row['keywords'])} 重叠度 {row['overlap']:.0%}（{row['samples']} 次）")
+    
     def extract_channels_from_videos(self, videos):
         """从视频列表提取唯一的频道列表"""
         channels = set()
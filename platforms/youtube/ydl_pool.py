@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+YoutubeDL实例池 - 按选项配置复用长期存活的YoutubeDL实例
+
+每次新建YoutubeDL都会重新初始化提取器、Cookie和HTTP处理器；
+同一组选项的实例可以在多次请求之间复用（Cookie和连接也随之复用）
+"""
+import threading
+from contextlib import contextmanager
+from typing import Dict, Hashable
+import yt_dlp
+from utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class YoutubeDLPool:
+    """
+    YoutubeDL实例池（线程安全）
+
+    实例按key（选项配置）分组；checkout时取出一个空闲实例独占使用，用完放回。
+    没有空闲实例时新建，因此多个线程并发请求时各自使用不同的实例；
+    每组最多保留max_idle_per_key个空闲实例，多余的关闭。
+    """
+
+    def __init__(self, max_idle_per_key: int = 2, factory=None):
+        self.max_idle_per_key = max_idle_per_key
+        self._factory = factory
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.stats = {'created': 0, 'reused': 0}
+
+    @contextmanager
+    def checkout(self, key: Hashable, opts: Dict):
+        """
+        取出一个实例
+
+        Args:
+            key: 选项配置的标识（相同key的opts必须相同）
+            opts: 新建实例时使用的选项
+        """
+        with self._lock:
+            idle = self._idle.get(key)
+            ydl = idle.pop() if idle else None
+            self.stats['reused' if ydl is not None else 'created'] += 1
+
+        if ydl is None:
+            ydl = (self._factory or yt_dlp.YoutubeDL)(dict(opts))
+
+        try:
+            yield ydl
+        finally:
+            self._release(key, ydl)
+
+    def _release(self, key, ydl):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_key:
+                idle.append(ydl)
+                return
+        self._close(ydl)
+
+    @staticmethod
+    def _close(ydl):
+        close = getattr(ydl, 'close', None)
+        if close:
+            try:
+                close()
+            except Exception as e:
+                logger.debug(f"关闭YoutubeDL实例失败: {e}")
+
+    def close(self):
+        """关闭所有空闲实例"""
+        with self._lock:
+            instances = [ydl for idle in self._idle.values() for ydl in idle]
+            self._idle.clear()
+        for ydl in instances:
+            self._close(ydl)
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(idle) for idle in self._idle.values())
@@ -5,6 +5,7 @@
 import sqlite3
 import os
 import json
+from contextlib import contextmanager
 from utils.config_loader import get_project_root
 
 
@@ -86,8 +87,54 @@ class Database:
         self._init_youtube_tables()
         self._init_github_tables()
         self._init_twitter_tables()
+        self._init_common_tables()
         self.conn.commit()
     
+    def _ensure_columns(self, table, columns):
+        """为旧数据库中已存在的表补充新增的列（CREATE TABLE IF NOT EXISTS不会修改已有表）"""
+        existing = {row[1] for row in self.cursor.execute(f"PRAGMA table_info({table})").fetchall()}
+        for name, definition in columns.items():
+            if name not in existing:
+                self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+    
+    def _init_common_tables(self):
+        """初始化跨平台通用表"""
+        # 搜索关键词收益统计表（关键词调度器使用，sort为空表示该平台没有排序方式）
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS search_keyword_stats (
+                id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
+                platform TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                sort TEXT NOT NULL DEFAULT '',
+                requests INTEGER DEFAULT 0,
+                yield_total REAL DEFAULT 0,
+                results_total INTEGER DEFAULT 0,
+                new_channels INTEGER DEFAULT 0,
+                last_requested_at TEXT,
+                updated_at TEXT DEFAULT (datetime('now', '+8 hours')),
+                UNIQUE (platform, keyword, sort)
+            )
+        """)
+        # results_total/new_channels: 搜索结果中的频道总数/之前未见过的新频道数
+        self._ensure_columns('search_keyword_stats', {
+            'results_total': 'INTEGER DEFAULT 0',
+            'new_channels': 'INTEGER DEFAULT 0',
+        })
+        
+        # 关键词结果重叠度（同一次运行中两个关键词返回的频道重叠比例的滑动平均，keyword_a < keyword_b）
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS search_keyword_overlap (
+                id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
+                platform TEXT NOT NULL,
+                keyword_a TEXT NOT NULL,
+                keyword_b TEXT NOT NULL,
+                overlap REAL DEFAULT 0,
+                samples INTEGER DEFAULT 0,
+                updated_at TEXT DEFAULT (datetime('now', '+8 hours')),
+                UNIQUE (platform, keyword_a, keyword_b)
+            )
+        """)
+    
     def _init_youtube_tables(self):
         """初始化YouTube表"""
         # YouTube KOL表
@@ -145,7 +192,8 @@ class Database:
             )
         """)
         
-        # YouTube扩散队列
+        # YouTube扩散队列（status: pending/processing/completed/dead；
+        # processing的条目由worker_id持有租约，lease_expires_ts为Unix时间戳，attempts为领取次数）
         self.cursor.execute("""
             CREATE TABLE IF NOT EXISTS youtube_expansion_queue (
                 id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
@@ -153,7 +201,59 @@ class Database:
                 priority INTEGER DEFAULT 0,
                 status TEXT DEFAULT 'pending',
                 created_at TEXT DEFAULT (datetime('now', '+8 hours')),
-                processed_at TEXT
+                processed_at TEXT,
+                worker_id TEXT,
+                lease_expires_ts REAL,
+                attempts INTEGER DEFAULT 0,
+                last_error TEXT
+            )
+        """)
+        self._ensure_columns('youtube_expansion_queue', {
+            'worker_id': 'TEXT',
+            'lease_expires_ts': 'REAL',
+            'attempts': 'INTEGER DEFAULT 0',
+            'last_error': 'TEXT',
+        })
+        
+        # YouTube KOL刷新计划（更新任务只处理到期的KOL，next_refresh_ts为Unix时间戳）
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS youtube_refresh_schedule (
+                id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
+                channel_id TEXT UNIQUE NOT NULL,
+                next_refresh_ts REAL NOT NULL,
+                interval_hours REAL,
+                change_score REAL,
+                last_refreshed_ts REAL,
+                failures INTEGER DEFAULT 0,
+                updated_at TEXT DEFAULT (datetime('now', '+8 hours'))
+            )
+        """)
+        # failures: 连续刷新失败次数（成功刷新后清零）
+        self._ensure_columns('youtube_refresh_schedule', {
+            'failures': 'INTEGER DEFAULT 0',
+        })
+        
+        # YouTube搜索结果缓存（query为规范化后的搜索词，results为JSON，fetched_ts为Unix时间戳）
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS youtube_search_cache (
+                id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
+                query TEXT UNIQUE NOT NULL,
+                max_results INTEGER DEFAULT 0,
+                results TEXT,
+                fetched_ts REAL NOT NULL,
+                updated_at TEXT DEFAULT (datetime('now', '+8 hours'))
+            )
+        """)
+        
+        # YouTube频道信息缓存（channel_data为JSON，url_form为可用的频道URL格式，fetched_ts为Unix时间戳）
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS youtube_channel_cache (
+                id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
+                channel_id TEXT UNIQUE NOT NULL,
+                channel_data TEXT,
+                url_form TEXT,
+                fetched_ts REAL NOT NULL DEFAULT 0,
+                updated_at TEXT DEFAULT (datetime('now', '+8 hours'))
             )
         """)
         
@@ -162,6 +262,8 @@ class Database:
         self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_youtube_kols_ai_ratio ON youtube_kols(ai_ratio)")
         self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_youtube_videos_channel ON youtube_videos(channel_id)")
         self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_youtube_expansion_status ON youtube_expansion_queue(status)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_youtube_expansion_lease ON youtube_expansion_queue(status, lease_expires_ts)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_youtube_refresh_due ON youtube_refresh_schedule(next_refresh_ts)")
     
     def _init_github_tables(self):
         """初始化GitHub表"""
@@ -262,6 +364,40 @@ class Database:
             )
         """)
         
+        # GitHub爬取边界表（断点续爬）
+        # repo_name为空的行记录关键词本身的状态和排序方式，其余行记录该关键词下每个仓库的进度
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS github_crawl_frontier (
+                id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
+                keyword TEXT NOT NULL,
+                sort TEXT,
+                repo_name TEXT NOT NULL DEFAULT '',
+                repo_index INTEGER DEFAULT 0,
+                repo_stars INTEGER DEFAULT 0,
+                contributors TEXT,
+                contributor_offset INTEGER DEFAULT 0,
+                total_contributors INTEGER DEFAULT 0,
+                status TEXT DEFAULT 'pending',
+                created_at TEXT DEFAULT (datetime('now', '+8 hours')),
+                updated_at TEXT DEFAULT (datetime('now', '+8 hours')),
+                UNIQUE (keyword, repo_name)
+            )
+        """)
+
+        # GitHub仓库搜索结果缓存表（按 关键词+排序方式 缓存，fetched_ts为Unix时间戳，用于TTL判断）
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS github_search_cache (
+                id TEXT PRIMARY KEY DEFAULT (lower(hex(randomblob(16)))),
+                keyword TEXT NOT NULL,
+                sort TEXT NOT NULL,
+                max_results INTEGER DEFAULT 0,
+                results TEXT,
+                fetched_ts REAL NOT NULL,
+                updated_at TEXT DEFAULT (datetime('now', '+8 hours')),
+                UNIQUE (keyword, sort)
+            )
+        """)
+
         # 创建索引
         self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_github_developers_status ON github_developers(status)")
         self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_github_developers_indie ON github_developers(is_indie_developer)")
@@ -348,6 +484,26 @@ class Database:
             self.cursor.execute(query)
         self.conn.commit()
     
+    def executemany(self, query, params_list):
+        """批量执行SQL（一次提交）"""
+        self.cursor.executemany(query, params_list)
+        self.conn.commit()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        在一个事务中执行多条语句，全部成功才提交，出错时回滚
+        
+        连接为自动提交模式，事务内直接使用返回的cursor（execute/executemany每条语句都会提交）
+        """
+        self.cursor.execute("BEGIN")
+        try:
+            yield self.cursor
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+    
     def fetchone(self, query, params=None):
         """查询单条记录"""
         max_retries = 3
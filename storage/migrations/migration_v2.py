@@ -193,7 +193,8 @@ class MigrationV2:
             self._log("   2.3 迁移 expansion_queue -> youtube_expansion_queue")
             cursor.execute("""
                 INSERT OR IGNORE INTO youtube_expansion_queue 
-                SELECT * FROM expansion_queue
+                    (id, channel_id, priority, status, created_at, processed_at)
+                SELECT id, channel_id, priority, status, created_at, processed_at FROM expansion_queue
             """)
             migrated_queue = cursor.rowcount
             self._log(f"       迁移了 {migrated_queue} 条队列记录")
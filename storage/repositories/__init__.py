@@ -5,5 +5,12 @@
 from .youtube_repository import YouTubeRepository
 from .github_repository import GitHubRepository
 from .github_academic_repository import GitHubAcademicRepository
+from .github_frontier_repository import GitHubFrontierRepository
+from .github_search_cache_repository import GitHubSearchCacheRepository
+from .keyword_stats_repository import KeywordStatsRepository
+from .youtube_channel_cache_repository import YouTubeChannelCacheRepository
+from .youtube_search_cache_repository import YouTubeSearchCacheRepository
 
-__all__ = ['YouTubeRepository', 'GitHubRepository', 'GitHubAcademicRepository']
+__all__ = ['YouTubeRepository', 'GitHubRepository', 'GitHubAcademicRepository', 'GitHubFrontierRepository',
+           'GitHubSearchCacheRepository', 'KeywordStatsRepository', 'YouTubeChannelCacheRepository',
+           'YouTubeSearchCacheRepository']
@@ -124,3 +124,33 @@ class GitHubAcademicRepository:
         except Exception as e:
             print(f"更新学术人士状态失败: {e}")
             return False
+    
+    def get_all_academic_developers(self) -> List[Dict]:
+        """获取所有学术人士（离线重新判定用）"""
+        return self.db.fetchall("SELECT * FROM github_academic_developers") or []
+    
+    def update_academic_qualification(self, username: str, status: str, academic_indicators: List[str],
+                                      research_areas: List[str], contact_info: str) -> bool:
+        """更新学术人士的判定结果"""
+        try:
+            query = """
+                UPDATE github_academic_developers
+                SET status = ?, academic_indicators = ?, research_areas = ?, contact_info = ?,
+                    last_updated = datetime('now', '+8 hours')
+                WHERE username = ?
+            """
+            self.db.execute(query, (status, json.dumps(academic_indicators), json.dumps(research_areas),
+                                    contact_info, username))
+            return True
+        except Exception as e:
+            print(f"更新学术人士判定结果失败: {e}")
+            return False
+    
+    def delete_academic_developer(self, username: str) -> bool:
+        """删除学术人士（不删除其仓库，重新分类为商业开发者时使用）"""
+        try:
+            self.db.execute("DELETE FROM github_academic_developers WHERE username = ?", (username,))
+            return True
+        except Exception as e:
+            print(f"删除学术人士失败: {e}")
+            return False
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+GitHub爬取边界数据访问层 - 断点续爬
+"""
+from typing import List, Dict, Optional
+import json
+
+
+class GitHubFrontierRepository:
+    """GitHub爬取边界仓库
+
+    记录深度优先发现过程中每个关键词、仓库的处理进度：
+    - 关键词行（repo_name为空）：排序方式和状态
+    - 仓库行：仓库星标、贡献者列表、已消费的贡献者偏移量和状态
+
+    状态取值: pending / in_progress / completed / skipped / failed
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def get_keyword_states(self) -> Dict[str, Dict]:
+        """获取所有关键词的状态 {keyword: row}"""
+        query = "SELECT * FROM github_crawl_frontier WHERE repo_name = ''"
+        rows = self.db.fetchall(query) or []
+        return {row['keyword']: row for row in rows}
+
+    def start_keyword(self, keyword: str, sort: str, repositories: List[Dict]) -> bool:
+        """记录关键词的搜索结果，后续运行直接复用，不再请求搜索页"""
+        try:
+            self.db.execute(
+                """
+                INSERT OR REPLACE INTO github_crawl_frontier (keyword, sort, repo_name, status, updated_at)
+                VALUES (?, ?, '', 'in_progress', datetime('now', '+8 hours'))
+                """,
+                (keyword, sort)
+            )
+            for repo_index, repo in enumerate(repositories):
+                repo_name = repo.get('repo_name')
+                if not repo_name:
+                    continue
+                self.db.execute(
+                    """
+                    INSERT OR IGNORE INTO github_crawl_frontier (keyword, sort, repo_name, repo_index, repo_stars)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (keyword, sort, repo_name, repo_index, repo.get('stars', 0))
+                )
+            return True
+        except Exception as e:
+            print(f"保存爬取边界失败: {e}")
+            return False
+
+    def get_keyword_repositories(self, keyword: str) -> List[Dict]:
+        """获取关键词下记录的仓库（按搜索结果顺序）"""
+        query = """
+            SELECT * FROM github_crawl_frontier
+            WHERE keyword = ? AND repo_name != ''
+            ORDER BY repo_index ASC
+        """
+        return self.db.fetchall(query, (keyword,)) or []
+
+    def get_repository_state(self, keyword: str, repo_name: str) -> Optional[Dict]:
+        """获取单个仓库的进度"""
+        query = "SELECT * FROM github_crawl_frontier WHERE keyword = ? AND repo_name = ?"
+        return self.db.fetchone(query, (keyword, repo_name))
+
+    def save_contributors(self, keyword: str, repo_name: str, contributors: List[Dict]) -> bool:
+        """保存仓库贡献者列表，恢复时不再重新获取"""
+        try:
+            self.db.execute(
+                """
+                UPDATE github_crawl_frontier
+                SET contributors = ?, total_contributors = ?, status = 'in_progress',
+                    updated_at = datetime('now', '+8 hours')
+                WHERE keyword = ? AND repo_name = ?
+                """,
+                (json.dumps(contributors, ensure_ascii=False), len(contributors), keyword, repo_name)
+            )
+            return True
+        except Exception as e:
+            print(f"保存贡献者列表失败: {e}")
+            return False
+
+    def load_contributors(self, row: Dict) -> List[Dict]:
+        """从仓库行解析贡献者列表"""
+        try:
+            return json.loads(row.get('contributors') or '[]')
+        except (TypeError, ValueError):
+            return []
+
+    def checkpoint(self, keyword: str, repo_name: str, contributor_offset: int) -> bool:
+        """记录已消费的贡献者偏移量"""
+        try:
+            self.db.execute(
+                """
+                UPDATE github_crawl_frontier
+                SET contributor_offset = ?, updated_at = datetime('now', '+8 hours')
+                WHERE keyword = ? AND repo_name = ?
+                """,
+                (contributor_offset, keyword, repo_name)
+            )
+            return True
+        except Exception as e:
+            print(f"保存断点失败: {e}")
+            return False
+
+    def update_repository_status(self, keyword: str, repo_name: str, status: str) -> bool:
+        """更新仓库状态"""
+        try:
+            self.db.execute(
+                """
+                UPDATE github_crawl_frontier
+                SET status = ?, updated_at = datetime('now', '+8 hours')
+                WHERE keyword = ? AND repo_name = ?
+                """,
+                (status, keyword, repo_name)
+            )
+            return True
+        except Exception as e:
+            print(f"更新仓库状态失败: {e}")
+            return False
+
+    def complete_keyword(self, keyword: str) -> bool:
+        """标记关键词已处理完"""
+        return self.update_repository_status(keyword, '', 'completed')
+
+    def skip_keyword(self, keyword: str, sort: str) -> bool:
+        """标记关键词没有搜索到仓库（本轮视为已处理，下一轮重新搜索）"""
+        try:
+            self.db.execute(
+                """
+                INSERT OR REPLACE INTO github_crawl_frontier (keyword, sort, repo_name, status, updated_at)
+                VALUES (?, ?, '', 'skipped', datetime('now', '+8 hours'))
+                """,
+                (keyword, sort)
+            )
+            return True
+        except Exception as e:
+            print(f"保存爬取边界失败: {e}")
+            return False
+
+    def reset_keyword(self, keyword: str) -> bool:
+        """清除单个关键词的进度（重新访问已处理完的关键词时使用）"""
+        try:
+            self.db.execute("DELETE FROM github_crawl_frontier WHERE keyword = ?", (keyword,))
+            return True
+        except Exception as e:
+            print(f"重置爬取边界失败: {e}")
+            return False
+
+    def reset(self) -> bool:
+        """清空爬取边界（所有关键词处理完后开始新一轮）"""
+        try:
+            self.db.execute("DELETE FROM github_crawl_frontier")
+            return True
+        except Exception as e:
+            print(f"重置爬取边界失败: {e}")
+            return False
+
+    def get_statistics(self) -> Dict:
+        """获取断点统计"""
+        stats = {}
+
+        result = self.db.fetchone(
+            "SELECT COUNT(*) as count FROM github_crawl_frontier WHERE repo_name = '' AND status = 'completed'"
+        )
+        stats['completed_keywords'] = result['count'] if result else 0
+
+        result = self.db.fetchone(
+            "SELECT COUNT(*) as count FROM github_crawl_frontier WHERE repo_name = '' AND status = 'in_progress'"
+        )
+        stats['in_progress_keywords'] = result['count'] if result else 0
+
+        result = self.db.fetchone(
+            "SELECT COUNT(*) as count FROM github_crawl_frontier WHERE repo_name != '' AND status IN ('completed', 'skipped', 'failed')"
+        )
+        stats['finished_repositories'] = result['count'] if result else 0
+
+        return stats
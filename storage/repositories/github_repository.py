@@ -95,7 +95,90 @@ class GitHubRepository:
         except Exception as e:
             print(f"保存仓库失败: {e}")
             return False
+
+    def save_repositories(self, username: str, repositories: List[Dict]) -> bool:
+        """
+        批量保存开发者分析时抓取的仓库列表（替换该开发者之前保存的仓库）
+        
+        商业开发者和学术人士的仓库都存在github_repositories表，用于离线重新判定；
+        删除和写入在同一个事务中，写入失败时保留原有的仓库
+        """
+        try:
+            params_list = [
+                (
+                    repo.get('repo_id'),
+                    repo.get('repo_name'),
+                    repo.get('repo_url', ''),
+                    username,
+                    repo.get('description', ''),
+                    repo.get('stars', 0),
+                    repo.get('forks', 0),
+                    repo.get('language', ''),
+                    1 if repo.get('is_fork') else 0,
+                    repo.get('created_at'),
+                    repo.get('updated_at')
+                )
+                for repo in repositories if repo.get('repo_id') is not None and repo.get('repo_name')
+            ]
+            
+            with self.db.transaction() as cursor:
+                cursor.execute("DELETE FROM github_repositories WHERE username = ?", (username,))
+                if params_list:
+                    cursor.executemany("""
+                        INSERT OR REPLACE INTO github_repositories (
+                            repo_id, repo_name, repo_url, username, description,
+                            stars, forks, language, is_fork, created_at, updated_at
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, params_list)
+            return True
+            
+        except Exception as e:
+            print(f"批量保存仓库失败: {e}")
+            return False
     
+    def get_repositories_by_username(self, username: str) -> List[Dict]:
+        """获取开发者已保存的仓库"""
+        query = "SELECT * FROM github_repositories WHERE username = ? ORDER BY stars DESC"
+        return self.db.fetchall(query, (username,)) or []
+
+    def get_all_repositories_grouped(self) -> Dict[str, List[Dict]]:
+        """一次性读取所有已保存的仓库，按开发者分组（离线重新判定用）"""
+        rows = self.db.fetchall("SELECT * FROM github_repositories ORDER BY username, stars DESC") or []
+        grouped = {}
+        for row in rows:
+            row['is_fork'] = bool(row.get('is_fork'))
+            for field in ('description', 'language', 'repo_name'):
+                row[field] = row.get(field) or ''
+            grouped.setdefault(row['username'], []).append(row)
+        return grouped
+
+    def get_all_developers(self) -> List[Dict]:
+        """获取所有商业开发者（离线重新判定用）"""
+        return self.db.fetchall("SELECT * FROM github_developers") or []
+
+    def update_qualification(self, username: str, status: str, is_indie_developer: bool, contact_info: str) -> bool:
+        """更新开发者的判定结果"""
+        try:
+            query = """
+                UPDATE github_developers
+                SET status = ?, is_indie_developer = ?, contact_info = ?, last_updated = datetime('now', '+8 hours')
+                WHERE username = ?
+            """
+            self.db.execute(query, (status, 1 if is_indie_developer else 0, contact_info, username))
+            return True
+        except Exception as e:
+            print(f"更新开发者判定结果失败: {e}")
+            return False
+
+    def delete_developer(self, username: str) -> bool:
+        """删除开发者（不删除其仓库，重新分类为学术人士时使用）"""
+        try:
+            self.db.execute("DELETE FROM github_developers WHERE username = ?", (username,))
+            return True
+        except Exception as e:
+            print(f"删除开发者失败: {e}")
+            return False
+
     def get_developer_by_username(self, username: str) -> Optional[Dict]:
         """根据用户名获取开发者"""
         query = "SELECT * FROM github_developers WHERE username = ?"
@@ -143,6 +226,25 @@ class GitHubRepository:
         
         return stats
     
+    def get_source_statistics(self) -> Dict[str, Dict]:
+        """
+        按来源统计已分析开发者数和合格数（用于候选者优先级排序）
+
+        Returns:
+            {discovered_from: {'total': int, 'qualified': int}}
+        """
+        query = """
+            SELECT discovered_from,
+                   COUNT(*) as total,
+                   SUM(CASE WHEN status = 'qualified' AND is_indie_developer = 1 THEN 1 ELSE 0 END) as qualified
+            FROM github_developers
+            WHERE discovered_from IS NOT NULL AND discovered_from != ''
+            GROUP BY discovered_from
+        """
+        rows = self.db.fetchall(query) or []
+        return {row['discovered_from']: {'total': row['total'], 'qualified': row['qualified'] or 0}
+                for row in rows}
+
     def update_developer_status(self, username: str, status: str) -> bool:
         """更新开发者状态"""
         try:
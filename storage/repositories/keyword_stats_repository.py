@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+搜索关键词收益统计数据访问层
+"""
+from typing import Dict, Tuple
+
+
+class KeywordStatsRepository:
+    """搜索关键词收益统计（关键词调度器的持久化状态）"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def load(self, platform: str) -> Dict[Tuple[str, str], Dict]:
+        """
+        加载平台的所有关键词统计
+
+        返回: {(keyword, sort): {'requests': int, 'yield_total': float, 'results_total': int, 'new_channels': int}}
+        """
+        rows = self.db.fetchall(
+            """
+            SELECT keyword, sort, requests, yield_total, results_total, new_channels
+            FROM search_keyword_stats WHERE platform = ?
+            """,
+            (platform,)
+        ) or []
+        return {
+            (row['keyword'], row['sort']): {
+                'requests': row['requests'] or 0,
+                'yield_total': row['yield_total'] or 0,
+                'results_total': row['results_total'] or 0,
+                'new_channels': row['new_channels'] or 0,
+            }
+            for row in rows
+        }
+
+    def record_request(self, platform: str, keyword: str, sort: str = '') -> bool:
+        """记录一次搜索请求"""
+        try:
+            self.db.execute(
+                """
+                INSERT INTO search_keyword_stats (platform, keyword, sort, requests, last_requested_at)
+                VALUES (?, ?, ?, 1, datetime('now', '+8 hours'))
+                ON CONFLICT (platform, keyword, sort) DO UPDATE SET
+                    requests = requests + 1,
+                    last_requested_at = datetime('now', '+8 hours'),
+                    updated_at = datetime('now', '+8 hours')
+                """,
+                (platform, keyword, sort or '')
+            )
+            return True
+        except Exception as e:
+            print(f"记录关键词请求失败: {e}")
+            return False
+
+    def record_yield(self, platform: str, keyword: str, sort: str = '', amount: float = 1) -> bool:
+        """记录关键词产出（如合格开发者/KOL数）"""
+        try:
+            self.db.execute(
+                """
+                INSERT INTO search_keyword_stats (platform, keyword, sort, yield_total)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (platform, keyword, sort) DO UPDATE SET
+                    yield_total = yield_total + excluded.yield_total,
+                    updated_at = datetime('now', '+8 hours')
+                """,
+                (platform, keyword, sort or '', amount)
+            )
+            return True
+        except Exception as e:
+            print(f"记录关键词产出失败: {e}")
+            return False
+
+    def record_channels(self, platform: str, keyword: str, sort: str, results: int, new_channels: int) -> bool:
+        """记录一次搜索返回的频道数和其中的新频道数"""
+        try:
+            self.db.execute(
+                """
+                INSERT INTO search_keyword_stats (platform, keyword, sort, results_total, new_channels)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (platform, keyword, sort) DO UPDATE SET
+                    results_total = results_total + excluded.results_total,
+                    new_channels = new_channels + excluded.new_channels,
+                    updated_at = datetime('now', '+8 hours')
+                """,
+                (platform, keyword, sort or '', results, new_channels)
+            )
+            return True
+        except Exception as e:
+            print(f"记录关键词新频道数失败: {e}")
+            return False
+
+    def load_overlaps(self, platform: str) -> Dict[Tuple[str, str], Dict]:
+        """
+        加载关键词结果重叠度
+
+        返回: {(keyword_a, keyword_b): {'overlap': float, 'samples': int}}，keyword_a < keyword_b
+        """
+        rows = self.db.fetchall(
+            "SELECT keyword_a, keyword_b, overlap, samples FROM search_keyword_overlap WHERE platform = ?",
+            (platform,)
+        ) or []
+        return {
+            (row['keyword_a'], row['keyword_b']): {'overlap': row['overlap'] or 0, 'samples': row['samples'] or 0}
+            for row in rows
+        }
+
+    def save_overlap(self, platform: str, keyword_a: str, keyword_b: str, overlap: float, samples: int) -> bool:
+        """保存两个关键词的结果重叠度"""
+        try:
+            self.db.execute(
+                """
+                INSERT INTO search_keyword_overlap (platform, keyword_a, keyword_b, overlap, samples)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (platform, keyword_a, keyword_b) DO UPDATE SET
+                    overlap = excluded.overlap,
+                    samples = excluded.samples,
+                    updated_at = datetime('now', '+8 hours')
+                """,
+                (platform, keyword_a, keyword_b, overlap, samples)
+            )
+            return True
+        except Exception as e:
+            print(f"保存关键词重叠度失败: {e}")
+            return False
+
+    def reset(self, platform: str) -> bool:
+        """清空平台的关键词统计"""
+        try:
+            self.db.execute("DELETE FROM search_keyword_stats WHERE platform = ?", (platform,))
+            self.db.execute("DELETE FROM search_keyword_overlap WHERE platform = ?", (platform,))
+            return True
+        except Exception as e:
+            print(f"重置关键词统计失败: {e}")
+            return False
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+YouTube频道信息缓存数据访问层
+"""
+from typing import Dict, Optional
+import json
+
+
+class YouTubeChannelCacheRepository:
+    """YouTube频道信息缓存（跨运行复用）"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def get(self, channel_id: str) -> Optional[Dict]:
+        """
+        获取缓存的频道信息
+
+        返回: {'channel_data': Dict或None, 'url_form': str或None, 'fetched_ts': float}，不存在返回None
+        """
+        row = self.db.fetchone(
+            "SELECT * FROM youtube_channel_cache WHERE channel_id = ?",
+            (channel_id,)
+        )
+        if not row:
+            return None
+
+        try:
+            channel_data = json.loads(row['channel_data']) if row.get('channel_data') else None
+        except (TypeError, ValueError):
+            channel_data = None
+
+        return {
+            'channel_data': channel_data,
+            'url_form': row.get('url_form'),
+            'fetched_ts': row.get('fetched_ts') or 0,
+        }
+
+    def save(self, channel_id: str, channel_data: Dict, url_form: Optional[str], fetched_ts: float) -> bool:
+        """保存频道信息（同一频道覆盖旧数据）"""
+        try:
+            self.db.execute(
+                """
+                INSERT OR REPLACE INTO youtube_channel_cache (channel_id, channel_data, url_form, fetched_ts, updated_at)
+                VALUES (?, ?, ?, ?, datetime('now', '+8 hours'))
+                """,
+                (channel_id, json.dumps(channel_data, ensure_ascii=False), url_form, fetched_ts)
+            )
+            return True
+        except Exception as e:
+            print(f"保存频道缓存失败: {e}")
+            return False
+
+    def save_url_form(self, channel_id: str, url_form: str) -> bool:
+        """只更新频道可用的URL格式（没有记录时新建，频道信息留空）"""
+        try:
+            self.db.execute(
+                """
+                INSERT INTO youtube_channel_cache (channel_id, url_form, fetched_ts, updated_at)
+                VALUES (?, ?, 0, datetime('now', '+8 hours'))
+                ON CONFLICT(channel_id) DO UPDATE SET url_form = excluded.url_form, updated_at = excluded.updated_at
+                """,
+                (channel_id, url_form)
+            )
+            return True
+        except Exception as e:
+            print(f"保存频道URL格式失败: {e}")
+            return False
+
+    def get_statistics(self) -> Dict:
+        """获取缓存统计"""
+        result = self.db.fetchone("SELECT COUNT(*) as count FROM youtube_channel_cache")
+        return {'cached_channels': result['count'] if result else 0}
@@ -58,6 +58,51 @@ class YouTubeRepository:
             query += f" LIMIT {limit}"
         return self.db.fetchall(query)
     
+    def get_due_kols(self, now_ts, limit=None):
+        """
+        获取到期需要刷新的合格KOL（没有刷新计划的视为已到期，最早到期的在前）
+        
+        Args:
+            now_ts: 当前Unix时间戳
+        """
+        query = """
+            SELECT k.*, s.next_refresh_ts, s.interval_hours, s.failures AS refresh_failures FROM youtube_kols k
+            LEFT JOIN youtube_refresh_schedule s ON s.channel_id = k.channel_id
+            WHERE k.status = 'qualified' AND (s.next_refresh_ts IS NULL OR s.next_refresh_ts <= ?)
+            ORDER BY s.next_refresh_ts IS NOT NULL, s.next_refresh_ts, k.ai_ratio DESC
+        """
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        return self.db.fetchall(query, (now_ts,))
+    
+    def save_refresh_schedule(self, channel_id, next_refresh_ts, interval_hours, change_score, refreshed_ts):
+        """保存KOL的下次刷新时间"""
+        query = """
+            INSERT INTO youtube_refresh_schedule (channel_id, next_refresh_ts, interval_hours, change_score, last_refreshed_ts)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(channel_id) DO UPDATE SET
+                next_refresh_ts = excluded.next_refresh_ts,
+                interval_hours = excluded.interval_hours,
+                change_score = excluded.change_score,
+                last_refreshed_ts = excluded.last_refreshed_ts,
+                failures = 0,
+                updated_at = datetime('now', '+8 hours')
+        """
+        self.db.execute(query, (channel_id, next_refresh_ts, interval_hours, change_score, refreshed_ts))
+    
+    def save_refresh_failure(self, channel_id, next_refresh_ts, interval_hours):
+        """记录KOL刷新失败（连续失败次数加一）并保存重试时间"""
+        query = """
+            INSERT INTO youtube_refresh_schedule (channel_id, next_refresh_ts, interval_hours, failures)
+            VALUES (?, ?, ?, 1)
+            ON CONFLICT(channel_id) DO UPDATE SET
+                next_refresh_ts = excluded.next_refresh_ts,
+                interval_hours = excluded.interval_hours,
+                failures = COALESCE(failures, 0) + 1,
+                updated_at = datetime('now', '+8 hours')
+        """
+        self.db.execute(query, (channel_id, next_refresh_ts, interval_hours))
+    
     def get_pending_kols(self):
         """获取待分析的KOL"""
         query = "SELECT * FROM youtube_kols WHERE status = 'pending'"
@@ -94,6 +139,44 @@ class YouTubeRepository:
         )
         self.db.execute(query, params)
     
+    def get_videos_by_ids(self, video_ids, stale_after_hours=None):
+        """
+        批量获取已入库的视频
+        
+        Args:
+            stale_after_hours: 抓取时间早于该小时数的视频标记为过期（is_stale=1）
+        
+        返回: {video_id: 视频数据}
+        """
+        video_ids = list(video_ids)
+        stale_expr = "scraped_at < datetime('now', '+8 hours', ?)" if stale_after_hours is not None else "0"
+        videos = {}
+        # SQLite单条语句的参数数量有限，分批查询
+        for start in range(0, len(video_ids), 500):
+            chunk = video_ids[start:start + 500]
+            query = f"""
+                SELECT *, ({stale_expr}) AS is_stale FROM youtube_videos
+                WHERE video_id IN ({', '.join('?' * len(chunk))})
+            """
+            params = ([f'-{stale_after_hours} hours'] if stale_after_hours is not None else []) + chunk
+            for row in self.db.fetchall(query, params):
+                videos[row['video_id']] = row
+        return videos
+    
+    def update_video_stats(self, video_data):
+        """更新视频的播放/互动数据，并刷新抓取时间"""
+        query = """
+            UPDATE youtube_videos
+            SET title = ?, description = ?, published_at = ?, duration = ?,
+                views = ?, likes = ?, comments = ?, scraped_at = datetime('now', '+8 hours')
+            WHERE video_id = ?
+        """
+        params = (
+            video_data['title'], video_data['description'], video_data['published_at'], video_data['duration'],
+            video_data['views'], video_data['likes'], video_data['comments'], video_data['video_id']
+        )
+        self.db.execute(query, params)
+    
     def get_videos_by_channel(self, channel_id, limit=None):
         """获取频道的视频"""
         query = "SELECT * FROM youtube_videos WHERE channel_id = ? ORDER BY published_at DESC"
@@ -128,6 +211,87 @@ class YouTubeRepository:
         """
         self.db.execute(query, (status, queue_id))
     
+    def requeue_expired_expansions(self, now_ts, max_attempts=3):
+        """
+        回收租约过期的条目（持有者崩溃或失联）
+
+        领取次数已达max_attempts的进入死信（dead），其余重新排队；
+        没有租约时间的processing条目（旧版本遗留）同样视为过期
+        """
+        query = """
+            UPDATE youtube_expansion_queue
+            SET status = CASE WHEN attempts >= ? THEN 'dead' ELSE 'pending' END,
+                worker_id = NULL, lease_expires_ts = NULL,
+                last_error = COALESCE(last_error, 'lease expired')
+            WHERE status = 'processing' AND (lease_expires_ts IS NULL OR lease_expires_ts < ?)
+            RETURNING id, status
+        """
+        return self.db.fetchall(query, (max_attempts, now_ts))
+
+    def claim_expansion_items(self, worker_id, limit, lease_seconds, now_ts):
+        """
+        原子领取待扩散条目：按优先级选出pending条目并在同一条UPDATE中标记为processing、
+        记录持有者和租约到期时间，多个worker（线程或进程）并发领取时不会拿到同一条目
+        """
+        query = """
+            UPDATE youtube_expansion_queue
+            SET status = 'processing', worker_id = ?, lease_expires_ts = ?,
+                attempts = COALESCE(attempts, 0) + 1
+            WHERE id IN (
+                SELECT id FROM youtube_expansion_queue
+                WHERE status = 'pending'
+                ORDER BY priority DESC, created_at ASC
+                LIMIT ?
+            )
+            RETURNING *
+        """
+        items = self.db.fetchall(query, (worker_id, now_ts + lease_seconds, limit))
+        return sorted(items, key=lambda item: (-(item['priority'] or 0), item['created_at'] or ''))
+
+    def heartbeat_expansion(self, queue_id, worker_id, lease_seconds, now_ts):
+        """续租，返回是否仍持有该条目（租约已被回收时返回False）"""
+        query = """
+            UPDATE youtube_expansion_queue
+            SET lease_expires_ts = ?
+            WHERE id = ? AND worker_id = ? AND status = 'processing'
+            RETURNING id
+        """
+        return self.db.fetchone(query, (now_ts + lease_seconds, queue_id, worker_id)) is not None
+
+    def complete_expansion(self, queue_id, worker_id):
+        """标记完成，返回是否成功（只有当前持有者可以提交）"""
+        query = """
+            UPDATE youtube_expansion_queue
+            SET status = 'completed', lease_expires_ts = NULL, last_error = NULL,
+                processed_at = datetime('now', '+8 hours')
+            WHERE id = ? AND worker_id = ? AND status = 'processing'
+            RETURNING id
+        """
+        return self.db.fetchone(query, (queue_id, worker_id)) is not None
+
+    def fail_expansion(self, queue_id, worker_id, error, max_attempts=3):
+        """
+        记录处理失败：未达到max_attempts时重新排队，否则进入死信
+
+        Returns:
+            新状态（pending/dead），不是当前持有者时返回None
+        """
+        query = """
+            UPDATE youtube_expansion_queue
+            SET status = CASE WHEN attempts >= ? THEN 'dead' ELSE 'pending' END,
+                worker_id = NULL, lease_expires_ts = NULL, last_error = ?,
+                processed_at = datetime('now', '+8 hours')
+            WHERE id = ? AND worker_id = ? AND status = 'processing'
+            RETURNING status
+        """
+        result = self.db.fetchone(query, (max_attempts, str(error)[:500], queue_id, worker_id))
+        return result['status'] if result else None
+
+    def get_expansion_queue_stats(self):
+        """扩散队列各状态的条目数"""
+        rows = self.db.fetchall("SELECT status, COUNT(*) as count FROM youtube_expansion_queue GROUP BY status")
+        return {row['status']: row['count'] for row in rows}
+    
     def get_statistics(self):
         """获取统计信息"""
         stats = {}
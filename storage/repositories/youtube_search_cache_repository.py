@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+YouTube搜索结果缓存数据访问层
+"""
+from typing import List, Dict, Optional
+import json
+
+
+class YouTubeSearchCacheRepository:
+    """YouTube关键词搜索结果缓存（跨运行复用）"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def get(self, query: str) -> Optional[Dict]:
+        """
+        获取缓存的搜索结果
+
+        返回: {'results': List[Dict], 'max_results': int, 'fetched_ts': float}，不存在返回None
+        """
+        row = self.db.fetchone("SELECT * FROM youtube_search_cache WHERE query = ?", (query,))
+        if not row:
+            return None
+
+        try:
+            results = json.loads(row.get('results') or '[]')
+        except (TypeError, ValueError):
+            return None
+
+        return {
+            'results': results,
+            'max_results': row.get('max_results') or 0,
+            'fetched_ts': row.get('fetched_ts') or 0,
+        }
+
+    def save(self, query: str, max_results: int, results: List[Dict], fetched_ts: float) -> bool:
+        """保存搜索结果（同一搜索词覆盖旧结果）"""
+        try:
+            self.db.execute(
+                """
+                INSERT OR REPLACE INTO youtube_search_cache (query, max_results, results, fetched_ts, updated_at)
+                VALUES (?, ?, ?, ?, datetime('now', '+8 hours'))
+                """,
+                (query, max_results, json.dumps(results, ensure_ascii=False), fetched_ts)
+            )
+            return True
+        except Exception as e:
+            print(f"保存YouTube搜索缓存失败: {e}")
+            return False
+
+    def purge_expired(self, min_fetched_ts: float) -> bool:
+        """删除过期的缓存"""
+        try:
+            self.db.execute("DELETE FROM youtube_search_cache WHERE fetched_ts < ?", (min_fetched_ts,))
+            return True
+        except Exception as e:
+            print(f"清理YouTube搜索缓存失败: {e}")
+            return False
+
+    def get_statistics(self) -> Dict:
+        """获取缓存统计"""
+        result = self.db.fetchone("SELECT COUNT(*) as count FROM youtube_search_cache")
+        return {'cached_queries': result['count'] if result else 0}
@@ -4,5 +4,6 @@ GitHub任务模块
 """
 from .discovery import GitHubDiscoveryTask
 from .export import GitHubExportTask
+from .requalify import GitHubRequalifyTask
 
-__all__ = ['GitHubDiscoveryTask', 'GitHubExportTask']
+__all__ = ['GitHubDiscoveryTask', 'GitHubExportTask', 'GitHubRequalifyTask']
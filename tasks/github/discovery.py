@@ -5,7 +5,9 @@ GitHub开发者发现任务
 from typing import List
 from utils.logger import setup_logger
 from utils.config_loader import load_config
+from utils.rate_limiter import get_rate_limiter_registry
 from platforms.github import GitHubPlatform
+from platforms.github.candidate_scorer import build_source_tag
 
 logger = setup_logger()
 
@@ -35,6 +37,15 @@ class GitHubDiscoveryTask:
         """检查开发者是否在黑名单中"""
         return username.lower() in self.exclusion_developers
     
+    def _get_discovered_from(self, username: str) -> str:
+        """生成开发者的来源标记（search|关键词|仓库名），来源未知时为'search'"""
+        source = None
+        if hasattr(self.searcher, 'get_candidate_source'):
+            source = self.searcher.get_candidate_source(username)
+        if isinstance(source, dict) and source.get('keyword') and source.get('repo_name'):
+            return build_source_tag(source['keyword'], source['repo_name'])
+        return 'search'
+    
     def run(self, max_developers: int = 50):
         """
         运行发现任务 - 深度优先爬取直到达到目标合格数量
@@ -123,14 +134,15 @@ class GitHubDiscoveryTask:
                 rejected_count += 1
                 continue
             
-            # 根据类型保存到不同的表
-            result['discovered_from'] = 'search'
+            # 根据类型保存到不同的表（来源记录关键词和仓库，用于统计历史合格率）
+            result['discovered_from'] = self._get_discovered_from(username)
             developer_type = result.get('developer_type', 'commercial')
             
             if developer_type == 'academic':
                 # 保存到学术人士表
                 if self.academic_repository:
                     self.academic_repository.save_academic_developer(result)
+                    self.repository.save_repositories(username, result.get('repositories', []))
                     qualified_academic_count += 1
                     logger.info(f"  🎓 学术人士 [总计: {qualified_academic_count}]")
                     logger.info(f"    - Followers: {result.get('followers', 0)}")
@@ -143,6 +155,10 @@ class GitHubDiscoveryTask:
             else:
                 # 保存到商业开发者表
                 self.repository.save_developer(result)
+                self.repository.save_repositories(username, result.get('repositories', []))
+                
+                if hasattr(self.searcher, 'record_candidate_outcome'):
+                    self.searcher.record_candidate_outcome(username, bool(result.get('is_indie_developer')))
                 
                 if result.get('is_indie_developer'):
                     qualified_commercial_count += 1
@@ -187,4 +203,12 @@ class GitHubDiscoveryTask:
         if qualified_academic_count > 0:
             logger.info(f"✓ 额外识别: {qualified_academic_count} 个学术人士")
         
+        if hasattr(self.searcher, 'log_search_cache_report'):
+            self.searcher.log_search_cache_report()
+        if hasattr(self.searcher, 'log_keyword_report'):
+            self.searcher.log_keyword_report()
+        if hasattr(self.analyzer, 'log_prescreen_report'):
+            self.analyzer.log_prescreen_report()
+        get_rate_limiter_registry().log_report()
+        
         logger.info("=" * 60)
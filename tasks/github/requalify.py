@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+GitHub开发者离线重新判定任务
+
+修改筛选阈值或core_ai_keywords后，用已入库的主页信息和仓库列表重新运行判定规则，
+不发起任何网络请求
+"""
+import json
+from typing import Dict, List
+from utils.logger import setup_logger
+from utils.config_loader import load_config
+from platforms.github.qualification import GitHubQualificationRules
+from platforms.github.analyzer import GitHubAnalyzer
+
+logger = setup_logger()
+
+
+# 判定规则需要的主页字段
+PROFILE_TEXT_FIELDS = ['username', 'name', 'bio', 'company', 'location', 'blog', 'twitter', 'email', 'contact_info']
+PROFILE_COUNT_FIELDS = ['public_repos', 'followers', 'following']
+
+
+class GitHubRequalifyTask:
+    """GitHub开发者离线重新判定任务"""
+
+    def __init__(self, repository, academic_repository=None, rules: GitHubQualificationRules = None):
+        self.repository = repository  # 商业开发者仓库（同时负责github_repositories表）
+        self.academic_repository = academic_repository  # 学术人士仓库
+        self.rules = rules or GitHubQualificationRules()
+
+    def _load_developers(self) -> List[tuple]:
+        """读取所有已入库开发者，返回 [(当前类型, 数据行)]"""
+        developers = [('commercial', row) for row in self.repository.get_all_developers()]
+        if self.academic_repository:
+            developers += [('academic', row) for row in self.academic_repository.get_all_academic_developers()]
+        return developers
+
+    def _evaluate(self, user_info: Dict, repositories: List[Dict], config: Dict) -> Dict:
+        """
+        用当前规则判定一个开发者（与GitHubAnalyzer.analyze_developer的分类顺序一致：先学术后商业）
+
+        Returns:
+            {'developer_type', 'qualified', 'contact_info', 'academic_indicators', 'research_areas', 'needs_contact'}
+        """
+        contact_info = user_info.get('contact_info') or GitHubAnalyzer.extract_contact_info(user_info)
+
+        is_academic, academic_indicators, research_areas = self.rules.check_is_academic(user_info, repositories, config)
+        if is_academic:
+            return {
+                'developer_type': 'academic',
+                'qualified': bool(contact_info),
+                'contact_info': contact_info,
+                'academic_indicators': academic_indicators,
+                'research_areas': research_areas,
+                'needs_contact': not contact_info,
+            }
+
+        is_indie = self.rules.check_is_indie_developer(user_info, repositories, config)
+        return {
+            'developer_type': 'commercial',
+            'qualified': is_indie and bool(contact_info),
+            # 与在线分析一致：不合格的商业开发者不记录联系方式
+            'contact_info': contact_info if is_indie else '',
+            'academic_indicators': [],
+            'research_areas': [],
+            'needs_contact': is_indie and not contact_info,
+        }
+
+    def _build_developer_data(self, row: Dict, evaluation: Dict) -> Dict:
+        """重新分类到另一张表时，用原数据行和新判定结果构建入库数据"""
+        data = dict(row)
+        try:
+            data['top_languages'] = json.loads(row.get('top_languages') or '[]')
+        except (TypeError, ValueError):
+            data['top_languages'] = []
+        data['contact_info'] = evaluation['contact_info']
+        data['status'] = 'qualified' if evaluation['qualified'] else 'rejected'
+        data['is_indie_developer'] = evaluation['qualified']
+        data['academic_indicators'] = evaluation['academic_indicators']
+        data['research_areas'] = evaluation['research_areas']
+        return data
+
+    def _apply(self, current_type: str, row: Dict, evaluation: Dict):
+        """写入新的判定结果（类型变化时在两张表之间移动）"""
+        username = row['username']
+        status = 'qualified' if evaluation['qualified'] else 'rejected'
+        new_type = evaluation['developer_type']
+
+        if new_type == current_type:
+            if new_type == 'academic':
+                self.academic_repository.update_academic_qualification(
+                    username, status, evaluation['academic_indicators'],
+                    evaluation['research_areas'], evaluation['contact_info'])
+            else:
+                self.repository.update_qualification(username, status, evaluation['qualified'],
+                                                     evaluation['contact_info'])
+            return
+
+        data = self._build_developer_data(row, evaluation)
+        if new_type == 'academic':
+            if self.academic_repository.save_academic_developer(data):
+                self.repository.delete_developer(username)
+        else:
+            if self.repository.save_developer(data):
+                self.academic_repository.delete_academic_developer(username)
+
+    def run(self, dry_run: bool = False) -> Dict:
+        """
+        重新判定所有已入库的开发者
+
+        Args:
+            dry_run: 只统计变化，不写入数据库
+
+        Returns:
+            统计结果，changes为发生变化的开发者列表
+        """
+        config = load_config()
+        repositories_by_user = self.repository.get_all_repositories_grouped()
+        developers = self._load_developers()
+
+        summary = {
+            'total': len(developers),
+            'evaluated': 0,
+            'unchanged': 0,
+            'newly_qualified': 0,
+            'newly_rejected': 0,
+            'moved': 0,
+            'skipped_missing_repos': 0,  # 有分析过的仓库但没有入库（本功能上线前的旧数据）
+            'needs_refetch': 0,          # 之前在预筛选阶段淘汰（未抓仓库），新规则下预筛选可通过
+            'needs_contact': 0,          # 新规则下合格但没有联系方式（离线无法从commit提取邮箱）
+            'changes': [],
+        }
+
+        logger.info(f"开始离线重新判定: {len(developers)} 个开发者, "
+                   f"{sum(len(repos) for repos in repositories_by_user.values())} 个已入库仓库"
+                   f"{'（仅预览）' if dry_run else ''}")
+
+        for current_type, row in developers:
+            username = row['username']
+            user_info = {field: row.get(field) or '' for field in PROFILE_TEXT_FIELDS}
+            user_info.update({field: row.get(field) or 0 for field in PROFILE_COUNT_FIELDS})
+
+            repositories = repositories_by_user.get(username)
+            if repositories is None:
+                if row.get('analyzed_repos'):
+                    summary['skipped_missing_repos'] += 1
+                    continue
+                repositories = []
+                # 没有仓库记录且analyzed_repos为0：可能是预筛选阶段淘汰、从未抓取仓库
+                if self.rules.prescreen_indie_developer(user_info, config)[0]:
+                    summary['needs_refetch'] += 1
+
+            evaluation = self._evaluate(user_info, repositories, config)
+            summary['evaluated'] += 1
+            if evaluation['needs_contact']:
+                summary['needs_contact'] += 1
+
+            old_status = row.get('status')
+            new_status = 'qualified' if evaluation['qualified'] else 'rejected'
+            new_type = evaluation['developer_type']
+
+            if new_type == current_type and new_status == old_status:
+                summary['unchanged'] += 1
+                continue
+
+            # 没有学术人士仓库时无法在两张表之间移动
+            if new_type != current_type and not self.academic_repository:
+                summary['unchanged'] += 1
+                continue
+
+            if new_status == 'qualified' and old_status != 'qualified':
+                summary['newly_qualified'] += 1
+            elif new_status != 'qualified' and old_status == 'qualified':
+                summary['newly_rejected'] += 1
+            if new_type != current_type:
+                summary['moved'] += 1
+
+            summary['changes'].append({
+                'username': username,
+                'from_type': current_type,
+                'from_status': old_status,
+                'to_type': new_type,
+                'to_status': new_status,
+            })
+
+            if not dry_run:
+                self._apply(current_type, row, evaluation)
+
+        logger.info(f"离线重新判定完成: 判定 {summary['evaluated']} 个, 变化 {len(summary['changes'])} 个 "
+                   f"(新合格 {summary['newly_qualified']}, 新不合格 {summary['newly_rejected']}, "
+                   f"商业/学术互转 {summary['moved']})")
+        if summary['skipped_missing_repos']:
+            logger.info(f"  跳过 {summary['skipped_missing_repos']} 个没有已入库仓库的旧数据")
+        if summary['needs_refetch']:
+            logger.info(f"  {summary['needs_refetch']} 个开发者从未抓取仓库，新规则下需要重新在线分析")
+        if summary['needs_contact']:
+            logger.info(f"  {summary['needs_contact']} 个开发者满足标准但缺少联系方式")
+
+        return summary
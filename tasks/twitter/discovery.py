@@ -2,25 +2,53 @@
 """
 Twitter用户发现任务
 """
-from typing import List, Dict
+import functools
+import threading
+from typing import List, Dict, Optional
 from utils.logger import setup_logger
 from platforms.factory import PlatformFactory
 from storage.database import Database
 from storage.repositories.twitter_repository import TwitterRepository
+from platforms.twitter.driver_pool import get_driver_pool
 
 logger = setup_logger(__name__)
 
+_shared_repository = None
+_shared_repository_lock = threading.Lock()
+
+
+def get_shared_repository() -> TwitterRepository:
+    """进程内共享的Twitter数据仓库（所有未传入repository的任务复用同一个数据库连接）"""
+    global _shared_repository
+    with _shared_repository_lock:
+        if _shared_repository is None:
+            db = Database()
+            db.connect()
+            db.init_tables()
+            _shared_repository = TwitterRepository(db)
+        return _shared_repository
+
+
+def _browser_session(method):
+    """整个任务使用同一个浏览器（从浏览器池借用，任务结束后归还）"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.platform.scraper.session():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class TwitterDiscoveryTask:
     """Twitter用户发现任务"""
     
-    def __init__(self):
+    def __init__(self, repository: Optional[TwitterRepository] = None):
+        # 平台（爬虫）由PlatformFactory缓存复用，浏览器从共享的浏览器池借用（首次使用时在后台预启动）
         self.platform = PlatformFactory.get_platform('twitter')
-        self.db = Database()
-        self.db.connect()
-        self.db.init_tables()
-        self.repository = TwitterRepository(self.db)
+        get_driver_pool()
+        # 数据库连接由调用方（UI会话）或进程内共享仓库提供，任务不再各自打开连接
+        self.repository = repository or get_shared_repository()
     
+    @_browser_session
     def discover_by_keywords(self, keywords: List[str], max_results_per_keyword: int = 10) -> Dict:
         """
         通过关键词发现用户
@@ -106,8 +134,11 @@ class TwitterDiscoveryTask:
                 stats['failed'] += 1
         
         logger.info(f"发现任务完成: {stats}")
+        self.platform.scraper.scroller.log_report()
+        get_driver_pool().log_report()
         return stats
     
+    @_browser_session
     def discover_by_hashtags(self, hashtags: List[str], max_results: int = 20) -> Dict:
         """
         通过话题标签发现用户
@@ -188,9 +219,6 @@ class TwitterDiscoveryTask:
                 stats['failed'] += 1
         
         logger.info(f"话题发现任务完成: {stats}")
+        self.platform.scraper.scroller.log_report()
+        get_driver_pool().log_report()
         return stats
-    
-    def __del__(self):
-        """清理资源"""
-        if hasattr(self, 'db'):
-            self.db.close()
@@ -12,11 +12,12 @@ logger = setup_logger()
 class YouTubeDiscoveryTask:
     """YouTube发现任务"""
     
-    def __init__(self, searcher, analyzer, filter_module, repository):
+    def __init__(self, searcher, analyzer, filter_module, repository, parallel=None):
         self.searcher = searcher
         self.analyzer = analyzer
         self.filter = filter_module
         self.repository = repository
+        self.parallel = parallel  # ShardedChannelCrawler，设置时候选频道分发到多个进程分析
         self.config = load_config()
         self.exclusion_channels = self._load_exclusion_channels()
     
@@ -35,6 +36,19 @@ class YouTubeDiscoveryTask:
         """检查频道是否在黑名单中"""
         return channel_id.lower() in self.exclusion_channels
     
+    def _analyze_parallel(self, channels):
+        """多进程分析候选频道，返回(合格数, 不合格数)"""
+        channels = [c for c in channels if not self._is_in_exclusion_list(c)]
+        
+        def on_result(result):
+            # 反馈给关键词调度器
+            if result['status'] in ('qualified', 'rejected') and hasattr(self.searcher, 'record_channel_outcome'):
+                self.searcher.record_channel_outcome(result['channel_id'], result['status'] == 'qualified')
+        
+        self.parallel.run(channels, 'keyword_search', on_result=on_result,
+                          should_stop=self.filter.should_stop_discovery)
+        return self.parallel.stats['qualified'], self.parallel.stats['rejected']
+    
     def run(self, keyword_limit=30):
         """
         执行发现任务
@@ -71,6 +85,10 @@ class YouTubeDiscoveryTask:
         qualified_count = 0
         rejected_count = 0
         
+        if self.parallel:
+            qualified_count, rejected_count = self._analyze_parallel(new_channels)
+            new_channels = []
+        
         for i, channel_id in enumerate(new_channels):
             # 检查是否达到上限
             if self.filter.should_stop_discovery():
@@ -85,10 +103,8 @@ class YouTubeDiscoveryTask:
                 continue
             
             try:
-                # 先获取频道基本信息，检查是否为竞对
-                from platforms.youtube.scraper import YouTubeScraper
-                temp_scraper = YouTubeScraper()
-                channel_info = temp_scraper.get_channel_info(channel_id)
+                # 先获取频道基本信息，检查是否为竞对（结果进入频道缓存，分析时不再重复解析）
+                channel_info = self.analyzer.scraper.get_channel_info(channel_id)
                 
                 # 检查是否为竞对（提前过滤，节省资源）
                 if self.filter.is_competitor(channel_info['channel_name']):
@@ -114,6 +130,10 @@ class YouTubeDiscoveryTask:
                 for video_data in video_data_list:
                     self.repository.add_video(video_data)
                 
+                # 反馈给关键词调度器
+                if hasattr(self.searcher, 'record_channel_outcome'):
+                    self.searcher.record_channel_outcome(channel_id, kol_data['status'] == 'qualified')
+                
                 # 如果合格，加入扩散队列
                 if kol_data['status'] == 'qualified':
                     qualified_count += 1
@@ -132,4 +152,12 @@ class YouTubeDiscoveryTask:
         logger.info(f"合格KOL: {qualified_count}")
         logger.info(f"不合格KOL: {rejected_count}")
         logger.info(f"总计KOL数: {self.repository.count_qualified_kols()}")
+        channel_cache = getattr(self.analyzer.scraper, 'channel_cache', None)
+        if channel_cache:
+            channel_cache.log_report()
+        info_cache = getattr(self.analyzer.scraper, 'info_cache', None)
+        if info_cache:
+            info_cache.log_report()
+        if hasattr(self.searcher, 'log_keyword_report'):
+            self.searcher.log_keyword_report()
         logger.info("=" * 50)
@@ -3,6 +3,7 @@
 """
 from utils.logger import setup_logger
 from utils.config_loader import load_config
+from platforms.youtube.expansion_queue import ExpansionQueue
 
 
 logger = setup_logger()
@@ -11,13 +12,23 @@ logger = setup_logger()
 class YouTubeExpandTask:
     """扩散任务"""
     
-    def __init__(self, expander, analyzer, filter_module, repository):
+    def __init__(self, expander, analyzer, filter_module, repository, expansion_queue=None, parallel=None):
         self.expander = expander
         self.analyzer = analyzer
         self.filter = filter_module
         self.repository = repository
+        self.parallel = parallel  # ShardedChannelCrawler，设置时新频道分发到多个进程分析
         self.config = load_config()
         self.exclusion_channels = self._load_exclusion_channels()
+        
+        # 扩散队列按租约领取，多个扩散任务可以同时运行（线程或进程）
+        queue_config = self.config.get('youtube', {}).get('expansion_queue', {})
+        self.batch_size = queue_config.get('batch_size', 10)
+        self.expansion_queue = expansion_queue or ExpansionQueue(
+            repository,
+            lease_seconds=queue_config.get('lease_seconds', 900),
+            max_attempts=queue_config.get('max_attempts', 3)
+        )
     
     def _load_exclusion_channels(self) -> set:
         """加载频道黑名单"""
@@ -56,37 +67,36 @@ class YouTubeExpandTask:
             logger.info("已达到KOL数量上限，停止扩散")
             return
         
-        # 1. 获取待扩散的KOL
-        expansion_queue = self.repository.get_expansion_queue(limit=10)
-        
-        if not expansion_queue:
-            logger.info("扩散队列为空，无法执行扩散")
-            return
-        
-        logger.info(f"待扩散KOL数: {len(expansion_queue)}")
-        
+        # 1-2. 逐个领取待扩散的KOL并扩散（每次领取一个，其他worker可以同时领取剩余条目）
         all_discovered = set()
+        processed = 0
         
-        # 2. 对每个KOL进行扩散
-        for queue_item in expansion_queue:
+        while processed < self.batch_size:
+            claimed = self.expansion_queue.claim(limit=1)
+            if not claimed:
+                break
+            queue_item = claimed[0]
             channel_id = queue_item['channel_id']
             queue_id = queue_item['id']
-            
-            # 更新状态为处理中
-            self.repository.update_expansion_status(queue_id, 'processing')
+            processed += 1
+            logger.info(f"扩散KOL [{processed}/{self.batch_size}]: {channel_id}（第{queue_item['attempts']}次尝试）")
             
             try:
-                # 扩散
-                discovered = self.expander.expand_from_kol(channel_id)
-                all_discovered.update(discovered)
+                with self.expansion_queue.lease(queue_id):
+                    discovered = self.expander.expand_from_kol(channel_id)
                 
-                # 更新状态为完成
-                self.repository.update_expansion_status(queue_id, 'completed')
+                if self.expansion_queue.complete(queue_id):
+                    all_discovered.update(discovered)
                 
             except Exception as e:
-                logger.error(f"扩散失败: {channel_id}, {str(e)}")
+                status = self.expansion_queue.fail(queue_id, e)
+                logger.error(f"扩散失败: {channel_id}, {str(e)}" + ("（已进入死信）" if status == 'dead' else ""))
                 continue
         
+        if not processed:
+            logger.info("扩散队列为空，无法执行扩散")
+            return
+        
         # 3. 去重
         new_channels = self.filter.deduplicate(list(all_discovered))
         logger.info(f"扩散发现新频道数: {len(new_channels)}")
@@ -95,6 +105,12 @@ class YouTubeExpandTask:
         qualified_count = 0
         rejected_count = 0
         
+        if self.parallel:
+            channels = [c for c in new_channels if not self._is_in_exclusion_list(c)]
+            self.parallel.run(channels, 'expansion', should_stop=self.filter.should_stop_discovery)
+            qualified_count, rejected_count = self.parallel.stats['qualified'], self.parallel.stats['rejected']
+            new_channels = []
+        
         for i, channel_id in enumerate(new_channels):
             # 检查是否达到上限
             if self.filter.should_stop_discovery():
@@ -109,10 +125,8 @@ class YouTubeExpandTask:
                 continue
             
             try:
-                # 先获取频道基本信息，检查是否为竞对
-                from platforms.youtube.scraper import YouTubeScraper
-                temp_scraper = YouTubeScraper()
-                channel_info = temp_scraper.get_channel_info(channel_id)
+                # 先获取频道基本信息，检查是否为竞对（结果进入频道缓存，分析时不再重复解析）
+                channel_info = self.analyzer.scraper.get_channel_info(channel_id)
                 
                 # 检查是否为竞对（提前过滤，节省资源）
                 if self.filter.is_competitor(channel_info['channel_name']):
@@ -158,4 +172,13 @@ class YouTubeExpandTask:
         logger.info(f"新增合格KOL: {qualified_count}")
         logger.info(f"新增不合格KOL: {rejected_count}")
         logger.info(f"总计KOL数: {self.repository.count_qualified_kols()}")
+        self.expansion_queue.log_report()
+        if hasattr(self.expander, 'log_query_report'):
+            self.expander.log_query_report()
+        channel_cache = getattr(self.analyzer.scraper, 'channel_cache', None)
+        if channel_cache:
+            channel_cache.log_report()
+        info_cache = getattr(self.analyzer.scraper, 'info_cache', None)
+        if info_cache:
+            info_cache.log_report()
         logger.info("=" * 50)
@@ -1,12 +1,12 @@
 """
 导出任务 - 导出KOL列表到Excel
 """
-import json
 import os
 from datetime import datetime
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill
 from utils.logger import setup_logger
+from utils.config_loader import get_config_snapshot
 
 
 logger = setup_logger()
@@ -18,8 +18,7 @@ class YouTubeExportTask:
     def __init__(self, repository, config_path='config/config.json'):
         self.repository = repository
         
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = get_config_snapshot(config_path)
         
         self.export_config = config['export']
     
@@ -0,0 +1,181 @@
+"""
+多进程分片分析 - 把候选频道分发到多个工作进程分析入库
+
+yt-dlp解析页面JSON和正则提取是CPU密集的，单线程运行时受GIL限制只能用一个核。
+多进程模式下每个工作进程有自己的爬虫、分析器和数据库连接（SQLite WAL允许多进程写入），
+限速器是进程内共享的，每个工作进程只分得每个主机配置速率的1/N，所有进程合计不超过配置的速率；
+协调进程负责分发频道、汇总结果、输出进度，以及达到KOL上限或收到停止信号时取消剩余频道
+"""
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional
+from utils.logger import setup_logger
+
+
+logger = setup_logger()
+
+# 工作进程内的组件（由_init_worker创建，每个进程一份）
+_worker = {}
+
+
+def build_worker_components(repository, config_path='config/config.json'):
+    """
+    工作进程中创建爬虫和分析组件
+
+    Returns:
+        (analyzer, filter)
+    """
+    from utils.config_loader import get_config_snapshot
+    from platforms.youtube.scraper import YouTubeScraper
+    from platforms.youtube.analyzer import KOLAnalyzer
+    from platforms.youtube.filter import KOLFilter
+    from platforms.youtube.channel_cache import YouTubeChannelCache
+    from platforms.youtube.info_cache import YouTubeInfoCache
+
+    youtube_config = get_config_snapshot(config_path).get('youtube', {})
+    channel_cache_config = youtube_config.get('channel_cache', {})
+    channel_cache_repository = None
+    if channel_cache_config.get('persist', True):
+        from storage.repositories.youtube_channel_cache_repository import YouTubeChannelCacheRepository
+        channel_cache_repository = YouTubeChannelCacheRepository(repository.db)
+    channel_cache = YouTubeChannelCache(
+        ttl_hours=channel_cache_config.get('ttl_hours', 24),
+        repository=channel_cache_repository
+    )
+    info_cache = YouTubeInfoCache.from_config(youtube_config.get('info_cache', {}))
+    scraper = YouTubeScraper(channel_cache=channel_cache, info_cache=info_cache)
+    return KOLAnalyzer(scraper, config_path), KOLFilter(repository, config_path)
+
+
+def _init_worker(db_path, config_path, component_factory, rate_share=1.0):
+    """工作进程初始化：按份额设置限速，打开独立的数据库连接并创建组件"""
+    from storage.database import Database
+    from storage.repositories.youtube_repository import YouTubeRepository
+    from utils.rate_limiter import get_rate_limiter_registry
+
+    get_rate_limiter_registry().set_rate_share(rate_share)
+
+    db = Database()
+    db.db_path = db_path
+    db.connect()
+    repository = YouTubeRepository(db)
+    analyzer, filter_module = component_factory(repository, config_path)
+    _worker.update(db=db, repository=repository, analyzer=analyzer, filter=filter_module)
+
+
+def _analyze_channel(channel_id: str, discovered_from: str) -> Dict:
+    """
+    在工作进程中分析一个频道并入库（合格的加入扩散队列）
+
+    Returns:
+        {'channel_id', 'status', 'channel_name', 'ai_ratio', 'error', 'pid'}，
+        status为qualified/rejected，跳过（竞对/无结果）为skipped，出错为failed
+    """
+    analyzer = _worker['analyzer']
+    repository = _worker['repository']
+    result = {'channel_id': channel_id, 'status': 'skipped', 'channel_name': None,
+              'ai_ratio': None, 'error': None, 'pid': os.getpid()}
+    try:
+        channel_info = analyzer.scraper.get_channel_info(channel_id)
+        result['channel_name'] = channel_info['channel_name']
+        if _worker['filter'].is_competitor(channel_info['channel_name']):
+            result['error'] = 'competitor'
+            return result
+
+        analysis = analyzer.analyze_channel(channel_id, discovered_from=discovered_from)
+        if not analysis:
+            return result
+
+        kol_data = analysis['kol_data']
+        repository.add_kol(kol_data)
+        for video_data in analysis['video_data_list']:
+            repository.add_video(video_data)
+
+        if kol_data['status'] == 'qualified':
+            repository.add_to_expansion_queue(channel_id, analyzer.calculate_priority(kol_data))
+
+        result.update(status=kol_data['status'], channel_name=kol_data['channel_name'], ai_ratio=kol_data['ai_ratio'])
+    except Exception as e:
+        result.update(status='failed', error=str(e))
+    return result
+
+
+class ShardedChannelCrawler:
+    """
+    多进程频道分析协调器
+
+    频道逐个分发给进程池（空闲的工作进程领取下一个频道，慢频道不会拖住整个分片），
+    每完成一个频道回调on_result并输出进度
+    """
+
+    def __init__(self, db_path: str, workers: Optional[int] = None, config_path: str = 'config/config.json',
+                 component_factory: Callable = build_worker_components, mp_context: str = 'spawn'):
+        self.db_path = db_path
+        self.workers = workers or os.cpu_count() or 1
+        self.config_path = config_path
+        self.component_factory = component_factory
+        self.mp_context = mp_context
+        self.stats = {'qualified': 0, 'rejected': 0, 'skipped': 0, 'failed': 0, 'cancelled': 0}
+
+    def run(self, channel_ids: Iterable[str], discovered_from: str,
+            on_result: Optional[Callable[[Dict], None]] = None,
+            should_stop: Optional[Callable[[], bool]] = None) -> List[Dict]:
+        """
+        并行分析频道
+
+        Args:
+            channel_ids: 待分析频道（已去重、已排除黑名单）
+            discovered_from: 写入KOL记录的来源
+            on_result: 每个频道完成后在协调进程中调用
+            should_stop: 返回True时取消尚未开始的频道（如达到KOL上限）
+
+        Returns:
+            已完成频道的结果列表（按完成顺序）
+        """
+        channel_ids = list(channel_ids)
+        if not channel_ids:
+            return []
+
+        workers = min(self.workers, len(channel_ids))
+        logger.info(f"多进程分析: {len(channel_ids)} 个频道, {workers} 个工作进程")
+
+        results = []
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context(self.mp_context),
+            initializer=_init_worker,
+            initargs=(self.db_path, self.config_path, self.component_factory, 1.0 / workers)
+        )
+        try:
+            futures = [executor.submit(_analyze_channel, channel_id, discovered_from) for channel_id in channel_ids]
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                result = future.result()
+                results.append(result)
+                self.stats[result['status']] = self.stats.get(result['status'], 0) + 1
+                self._log_result(result, len(results), len(channel_ids))
+                if on_result:
+                    on_result(result)
+                if should_stop and should_stop():
+                    cancelled = sum(1 for f in futures if f.cancel())
+                    self.stats['cancelled'] += cancelled
+                    logger.info(f"停止分析，取消剩余 {cancelled} 个频道")
+                    break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return results
+
+    @staticmethod
+    def _log_result(result: Dict, done: int, total: int):
+        prefix = f"分析进度: [{done}/{total}] (进程{result['pid']})"
+        name = result['channel_name'] or result['channel_id']
+        if result['status'] == 'qualified':
+            logger.info(f"{prefix} ✓ 合格: {name} - AI占比: {result['ai_ratio']:.1%}")
+        elif result['status'] == 'rejected':
+            logger.info(f"{prefix} ✗ 不合格: {name} - AI占比: {result['ai_ratio']:.1%}")
+        elif result['status'] == 'failed':
+            logger.error(f"{prefix} 分析频道失败: {result['channel_id']}, {result['error']}")
+        elif result['error'] == 'competitor':
+            logger.info(f"{prefix} ✗ 跳过竞对频道: {name}")
@@ -1,9 +1,10 @@
 """
 更新任务 - 更新已有KOL的数据
 """
-import json
 from datetime import datetime
 from utils.logger import setup_logger
+from utils.config_loader import get_config_snapshot
+from platforms.youtube.refresh_scheduler import RefreshScheduler
 
 
 logger = setup_logger()
@@ -12,33 +13,122 @@ logger = setup_logger()
 class YouTubeUpdateTask:
     """更新任务"""
     
-    def __init__(self, scraper, analyzer, repository, config_path='config/config.json'):
+    def __init__(self, scraper, analyzer, repository, config_path='config/config.json', refresh_scheduler=None):
         self.scraper = scraper
         self.analyzer = analyzer
         self.repository = repository
         
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = get_config_snapshot(config_path)
         
         self.update_video_count = config['crawler']['update_recent_videos']
+        self.fetch_workers = config['crawler'].get('video_fetch_workers', 1)
         
-        # 互动率权重配置
-        engagement_config = config.get('engagement', {})
-        self.like_weight = engagement_config.get('like_weight', 0.4)
-        self.comment_weight = engagement_config.get('comment_weight', 0.6)
+        # 增量更新：只提取新视频和数据过期的视频，其余使用已入库的数据
+        self.incremental = config['crawler'].get('incremental_update', True)
+        self.video_stats_ttl_hours = config['crawler'].get('video_stats_ttl_hours', 168)
+        self.stats = {'new_videos': 0, 'refreshed_videos': 0, 'reused_videos': 0, 'failed_videos': 0}
+        
+        # 刷新调度：只更新到期的KOL（按更新频率、数据变化和优先级安排下次刷新时间）
+        self.refresh_scheduler = refresh_scheduler
+        scheduler_config = config.get('youtube', {}).get('refresh_scheduler', {})
+        if self.refresh_scheduler is None and scheduler_config.get('enabled', True):
+            self.refresh_scheduler = RefreshScheduler(
+                repository,
+                min_interval_hours=scheduler_config.get('min_interval_hours', 24),
+                max_interval_hours=scheduler_config.get('max_interval_hours', 720),
+                cadence_factor=scheduler_config.get('cadence_factor', 0.5),
+                low_change=scheduler_config.get('low_change', 0.05),
+                high_change=scheduler_config.get('high_change', 0.3),
+                max_per_run=scheduler_config.get('max_per_run')
+            )
+    
+    @staticmethod
+    def _parse_datetime(value):
+        """数据库中的时间字符串或datetime -> datetime"""
+        if value is None or isinstance(value, datetime):
+            return value
+        try:
+            return datetime.fromisoformat(str(value))
+        except ValueError:
+            return None
+    
+    def _collect_video_stats(self, channel_id, videos):
+        """
+        获取最新视频的播放/互动数据
+        
+        增量模式：按video_id对比已入库的视频，只完整提取新视频、抓取时间超过TTL的视频
+        和缺少互动数据的视频，新视频入库、已入库的更新，其余直接使用入库数据；
+        非增量模式下全部重新提取（已入库的视频同样只更新数据）
+        
+        返回: 有数据的视频列表（提取失败且未入库的视频不在其中）
+        """
+        video_ids = [video.get('id', '') for video in videos if video.get('id')]
+        stored = self.repository.get_videos_by_ids(
+            video_ids, stale_after_hours=self.video_stats_ttl_hours if self.incremental else None)
+        
+        if self.incremental:
+            # 分析时只用列表数据入库的视频（点赞/评论为空）也需要提取
+            to_fetch = [video_id for video_id in video_ids
+                        if video_id not in stored or stored[video_id]['is_stale']
+                        or stored[video_id]['likes'] is None or stored[video_id]['comments'] is None]
+        else:
+            to_fetch = video_ids
+        fetched = {}
+        if to_fetch:
+            fetched = dict(zip(to_fetch, self.scraper.fetch_videos_info(to_fetch, max_workers=self.fetch_workers)))
+        entries = {video.get('id'): video for video in videos}
+        
+        video_stats = []
+        for video_id in video_ids:
+            video_info = fetched.get(video_id)
+            row = stored.get(video_id)
+            
+            if video_id not in fetched:
+                self.stats['reused_videos'] += 1
+                video_stats.append(row)
+                continue
+            
+            if video_info is None:
+                self.stats['failed_videos'] += 1
+                # 过期视频刷新失败时仍使用旧数据
+                if row:
+                    video_stats.append(row)
+                continue
+            
+            if row:
+                self.stats['refreshed_videos'] += 1
+                self.repository.update_video_stats(video_info)
+            else:
+                self.stats['new_videos'] += 1
+                entry = entries[video_id]
+                is_ai, matched_keywords = self.analyzer.text_matcher.is_ai_related(
+                    entry.get('title', ''), entry.get('description', ''))
+                video_info['channel_id'] = video_info['channel_id'] or channel_id
+                video_info['is_ai_related'] = is_ai
+                video_info['matched_keywords'] = matched_keywords
+                self.repository.add_video(video_info)
+            video_stats.append(video_info)
+        
+        logger.info(f"  视频: {len(video_ids)} 个, 提取 {len(to_fetch)} 个"
+                   f"{f'（其余 {len(video_ids) - len(to_fetch)} 个使用已入库数据）' if self.incremental else ''}")
+        return video_stats
     
     def run(self):
         """
         执行更新任务
-        1. 获取所有合格的KOL
-        2. 更新每个KOL的最新数据
+        1. 获取到期的合格KOL（未启用刷新调度时为所有合格KOL）
+        2. 更新每个KOL的最新数据，并安排下次刷新时间
         """
         logger.info("=" * 50)
         logger.info("开始执行更新任务")
         logger.info("=" * 50)
         
-        # 获取所有合格的KOL
-        qualified_kols = self.repository.get_qualified_kols()
+        # 获取需要更新的KOL（启用刷新调度时只取已到期的）
+        if self.refresh_scheduler:
+            qualified_kols = self.refresh_scheduler.get_due_kols()
+            logger.info(f"合格KOL总数: {self.repository.count_qualified_kols()}，本次到期: {len(qualified_kols)}")
+        else:
+            qualified_kols = self.repository.get_qualified_kols()
         
         if not qualified_kols:
             logger.info("没有需要更新的KOL")
@@ -59,17 +149,13 @@ class YouTubeUpdateTask:
                 
                 if not videos:
                     logger.warning(f"频道 {channel_id} 没有新视频")
+                    if self.refresh_scheduler:
+                        self.refresh_scheduler.schedule(channel_id, None, 0.0, 0)
                     continue
                 
-                # 分析最新视频
+                # 分析最新视频（AI判断使用视频列表中的标题和描述）
                 ai_videos = 0
-                total_views = 0
-                total_likes = 0
-                total_comments = 0
-                last_video_date = None
-                
                 for video in videos:
-                    video_id = video.get('id', '')
                     title = video.get('title', '')
                     description = video.get('description', '')
                     
@@ -77,33 +163,17 @@ class YouTubeUpdateTask:
                     is_ai, _ = self.analyzer.text_matcher.is_ai_related(title, description)
                     if is_ai:
                         ai_videos += 1
-                    
-                    # 获取详细信息
-                    try:
-                        video_info = self.scraper.get_video_info(video_id)
-                        total_views += video_info['views']
-                        total_likes += video_info['likes']
-                        total_comments += video_info['comments']
-                        
-                        if last_video_date is None or video_info['published_at'] > last_video_date:
-                            last_video_date = video_info['published_at']
-                    
-                    except Exception as e:
-                        logger.error(f"获取视频详情失败: {video_id}, {str(e)}")
-                        continue
                 
-                # 计算新的指标
-                analyzed_videos = len(videos)
-                new_ai_ratio = ai_videos / analyzed_videos if analyzed_videos > 0 else 0
-                new_avg_views = total_views // analyzed_videos if analyzed_videos > 0 else 0
-                new_avg_likes = total_likes // analyzed_videos if analyzed_videos > 0 else 0
-                new_avg_comments = total_comments // analyzed_videos if analyzed_videos > 0 else 0
+                # 获取视频数据（增量模式下只提取新视频和过期的视频）
+                video_stats = self._collect_video_stats(channel_id, videos)
                 
-                # 新的互动率计算公式: (平均点赞*like_weight + 平均评论*comment_weight) / 平均观看数
-                if new_avg_views > 0:
-                    new_engagement_rate = (new_avg_likes * self.like_weight + new_avg_comments * self.comment_weight) / new_avg_views
-                else:
-                    new_engagement_rate = 0
+                published_dates = [d for d in (self._parse_datetime(v['published_at']) for v in video_stats) if d]
+                last_video_date = max(published_dates) if published_dates else None
+                
+                # 计算新的指标
+                new_ai_ratio = ai_videos / len(videos)
+                # 与分析阶段使用同一计算方式（指标缺失的视频不参与对应平均值）
+                new_avg_views, new_avg_likes, new_avg_comments, new_engagement_rate = self.analyzer._compute_engagement(video_stats)
                 
                 days_since_last_video = None
                 if last_video_date:
@@ -125,6 +195,13 @@ class YouTubeUpdateTask:
                     downgraded_count += 1
                     logger.warning(f"KOL降级: {kol['channel_name']} - 新AI占比: {new_ai_ratio:.1%}")
                 
+                # 安排下次刷新（降级的KOL不再更新）
+                if self.refresh_scheduler and update_data.get('status') != 'rejected':
+                    change = RefreshScheduler.change_score(kol, {**update_data, 'ai_ratio': new_ai_ratio})
+                    priority = self.analyzer.calculate_priority({**kol, 'ai_ratio': new_ai_ratio})
+                    hours = self.refresh_scheduler.schedule(channel_id, days_since_last_video, change, priority)
+                    logger.info(f"  下次刷新: {hours / 24:.1f} 天后（数据变化 {change:.0%}）")
+                
                 self.repository.update_kol(channel_id, update_data)
                 updated_count += 1
                 
@@ -132,6 +209,10 @@ class YouTubeUpdateTask:
                 
             except Exception as e:
                 logger.error(f"更新KOL失败: {channel_id}, {str(e)}")
+                # 退避重试，连续失败次数越多间隔越长
+                if self.refresh_scheduler:
+                    hours = self.refresh_scheduler.schedule_retry(channel_id, kol.get('refresh_failures') or 0)
+                    logger.info(f"  {hours / 24:.1f} 天后重试")
                 continue
         
         # 总结
@@ -139,4 +220,9 @@ class YouTubeUpdateTask:
         logger.info(f"更新任务完成")
         logger.info(f"成功更新: {updated_count}")
         logger.info(f"降级KOL: {downgraded_count}")
+        logger.info(f"视频详情: 新视频 {self.stats['new_videos']} | 过期刷新 {self.stats['refreshed_videos']} | "
+                   f"复用已入库 {self.stats['reused_videos']} | 失败 {self.stats['failed_videos']}")
+        info_cache = getattr(self.scraper, 'info_cache', None)
+        if info_cache:
+            info_cache.log_report()
         logger.info("=" * 50)
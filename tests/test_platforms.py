@@ -68,6 +68,71 @@ def test_github_analyzer():
     
     # 这里可以添加更多的单元测试
 
+def test_github_analyzer_prescreen():
+    """测试主页预筛选：不可能合格时跳过仓库页请求，不改变合格结果（粉丝少但星标多仍可合格）"""
+    from platforms.github.analyzer import GitHubAnalyzer
+    from platforms.github.scraper import GitHubScraper
+    from utils.crawler_status import clear_stop_flag
+    
+    clear_stop_flag()
+    config = {'github': {
+        'min_followers': 100, 'min_stars': 500,
+        'academic_min_followers': 50, 'academic_min_stars': 100,
+        'exclusion_organizations': ['OpenAI'],
+        'core_ai_keywords': ['stable-diffusion'],
+        'academic_keywords': ['phd', 'professor'],
+    }}
+    
+    def make_user(username, followers, company='', bio='', public_repos=None):
+        user = {'user_id': 1, 'username': username, 'profile_url': f'https://github.com/{username}',
+                'followers': followers, 'company': company, 'bio': bio, 'email': f'{username}@example.com',
+                'public_repos': public_repos or 0}
+        if public_repos is not None:
+            user['public_repos_parsed'] = True
+        return user
+    
+    # 跳过__init__中的IP冷却等待，只测试判断逻辑
+    scraper = GitHubScraper.__new__(GitHubScraper)
+    repositories = [
+        {'repo_name': 'dev/stable-diffusion-app', 'description': '', 'language': 'Python', 'stars': 5000},
+        {'repo_name': 'dev/dotfiles', 'description': '', 'language': 'Shell', 'stars': 300},
+    ]
+    scraper.get_user_repositories = Mock(return_value=repositories)
+    analyzer = GitHubAnalyzer(scraper)
+    
+    def analyze(user):
+        scraper.get_user_info = Mock(return_value=user)
+        fetches = scraper.get_user_repositories.call_count
+        result = analyzer.analyze_developer(user['username'])
+        return result, scraper.get_user_repositories.call_count > fetches
+    
+    with patch('utils.config_loader.get_config_snapshot', return_value=config):
+        # 粉丝数很少但星标总数达标（仓库数解析失败时不能当作0）：与原规则一致，合格
+        result, fetched = analyze(make_user('newbie', 5))
+        assert fetched and result['status'] == 'qualified' and result['developer_type'] == 'commercial'
+        assert scraper.check_is_indie_developer(make_user('newbie', 5), repositories, config)
+        
+        # 用户名像组织账号（预筛选不据此淘汰）
+        result, fetched = analyze(make_user('openai-tech-fan', 5, public_repos=2))
+        assert fetched and result['status'] == 'qualified'
+        
+        # 排除的组织且主页没有学术特征：不请求仓库页
+        result, fetched = analyze(make_user('employee', 300, company='OpenAI'))
+        assert not fetched and result['status'] == 'rejected'
+        assert not scraper.check_is_indie_developer(make_user('employee', 300, company='OpenAI'), repositories, config)
+        
+        # 排除的组织但主页有学术特征：仍请求仓库页判断是否为学术人士
+        result, fetched = analyze(make_user('phd-intern', 300, company='OpenAI', bio='PhD student'))
+        assert fetched and result['status'] == 'qualified' and result['developer_type'] == 'academic'
+        
+        # 主页显示0个公开仓库：用空仓库列表判定，结果与请求仓库页相同
+        result, fetched = analyze(make_user('empty', 300, public_repos=0))
+        assert not fetched and result['status'] == 'rejected'
+        result, fetched = analyze(make_user('prof', 300, bio='Professor', public_repos=0))
+        assert not fetched and result['status'] == 'qualified' and result['developer_type'] == 'academic'
+    
+    assert analyzer.prescreen_stats == {'analyzed': 6, 'prescreen_rejected': 2, 'saved_fetches': 3}
+
 def test_twitter_scraper():
     """测试Twitter爬虫"""
     from platforms.twitter.scraper import TwitterScraper
@@ -94,3 +159,862 @@ def test_twitter_analyzer():
     analyzer = TwitterAnalyzer(scraper)
     
     assert analyzer is not None
+
+def test_github_searcher_resume_from_frontier(test_db_path):
+    """测试生成器从断点继续，不重复请求搜索页和贡献者列表"""
+    from platforms.github.searcher import GitHubSearcher
+    from storage.repositories.github_frontier_repository import GitHubFrontierRepository
+    from storage.database import Database
+    from utils.crawler_status import clear_stop_flag
+    
+    clear_stop_flag()
+    db = Database()
+    db.db_path = test_db_path
+    db.connect()
+    db.init_tables()
+    frontier = GitHubFrontierRepository(db)
+    
+    scraper = Mock()
+    scraper.search_repositories.return_value = [{'repo_name': 'owner/repo', 'stars': 1000}]
+    scraper.get_repository_contributors.return_value = (
+        [{'username': f'dev{i}', 'commits': 10 - i, 'rank': i + 1} for i in range(4)], ""
+    )
+    
+    with patch('platforms.github.searcher.load_config', return_value={
+        'github': {'search_keywords': ['ComfyUI'], 'min_repo_stars': 100}
+    }):
+        first = GitHubSearcher(scraper, frontier=frontier)
+        generator = first.discover_developers_generator(target_qualified=10)
+        consumed = [next(generator)[0], next(generator)[0]]
+        generator.close()  # 模拟停止：第二个候选者尚未被消费
+        
+        second = GitHubSearcher(scraper, frontier=frontier)
+        resumed = [username for username, _ in second.discover_developers_generator(target_qualified=10)]
+    
+    assert consumed == ['dev0', 'dev1']
+    assert resumed == ['dev1', 'dev2', 'dev3']
+    assert scraper.search_repositories.call_count == 1
+    assert scraper.get_repository_contributors.call_count == 1
+    assert frontier.get_keyword_states()['ComfyUI']['status'] == 'completed'
+    
+    db.close()
+
+def test_github_searcher_frontier_skips_empty_keyword(test_db_path):
+    """测试没有搜索结果的关键词记录为已跳过，所有关键词处理完后开始新一轮"""
+    from platforms.github.searcher import GitHubSearcher
+    from storage.repositories.github_frontier_repository import GitHubFrontierRepository
+    from storage.database import Database
+    from utils.crawler_status import clear_stop_flag
+    
+    clear_stop_flag()
+    db = Database()
+    db.db_path = test_db_path
+    db.connect()
+    db.init_tables()
+    frontier = GitHubFrontierRepository(db)
+    
+    scraper = Mock()
+    scraper.search_repositories.side_effect = lambda keyword, max_results=10, sort='stars': (
+        [{'repo_name': 'owner/repo', 'stars': 1000}] if keyword == 'ComfyUI' else [])
+    scraper.get_repository_contributors.return_value = (
+        [{'username': f'dev{i}', 'commits': 10 - i, 'rank': i + 1} for i in range(2)], ""
+    )
+    
+    # 未启用关键词调度器时按轮次处理关键词
+    with patch('platforms.github.searcher.load_config', return_value={
+        'github': {'search_keywords': ['ComfyUI', 'dead keyword'], 'min_repo_stars': 100,
+                   'discovery_strategy': {'keyword_scheduler': {'enabled': False}}}
+    }):
+        first = [username for username, _ in
+                 GitHubSearcher(scraper, frontier=frontier).discover_developers_generator(target_qualified=10)]
+        states = frontier.get_keyword_states()
+        assert states['ComfyUI']['status'] == 'completed'
+        assert states['dead keyword']['status'] == 'skipped'
+        
+        # 没有待处理的关键词：重置断点，两个关键词都重新搜索
+        second = [username for username, _ in
+                  GitHubSearcher(scraper, frontier=frontier).discover_developers_generator(target_qualified=10)]
+    
+    assert first == second == ['dev0', 'dev1']
+    assert scraper.search_repositories.call_count == 4
+    
+    db.close()
+
+def test_github_searcher_scheduler_revisits_completed_keywords(test_db_path):
+    """测试启用断点时由调度器决定重新访问的关键词：产出高的已完成关键词先于未搜索过的低产出关键词"""
+    import random
+    from platforms.github.searcher import GitHubSearcher
+    from storage.repositories.github_frontier_repository import GitHubFrontierRepository
+    from storage.database import Database
+    from utils.crawler_status import clear_stop_flag
+    
+    clear_stop_flag()
+    db = Database()
+    db.db_path = test_db_path
+    db.connect()
+    db.init_tables()
+    frontier = GitHubFrontierRepository(db)
+    
+    # 上一轮已处理完'hot'，'dead'还没有搜索过
+    frontier.start_keyword('hot', 'stars', [{'repo_name': 'owner/hot', 'stars': 1000}])
+    frontier.update_repository_status('hot', 'owner/hot', 'completed')
+    frontier.complete_keyword('hot')
+    
+    scraper = Mock()
+    scraper.search_repositories.side_effect = lambda keyword, max_results=10, sort='stars': [
+        {'repo_name': f'owner/{keyword}', 'stars': 1000}]
+    scraper.get_repository_contributors.side_effect = lambda repo_name: (
+        [{'username': f'{repo_name.split("/")[1]}-dev{i}', 'commits': 10 - i, 'rank': i + 1} for i in range(2)], "")
+    
+    with patch('platforms.github.searcher.load_config', return_value={
+        'github': {'search_keywords': ['dead', 'hot'], 'min_repo_stars': 100}
+    }):
+        searcher = GitHubSearcher(scraper, frontier=frontier)
+        searcher.keyword_scheduler.rng = random.Random(1)
+        for sort in GitHubSearcher.SORT_OPTIONS:
+            searcher.keyword_scheduler.stats[('hot', sort)] = {'requests': 20, 'yield_total': 40}
+            searcher.keyword_scheduler.stats[('dead', sort)] = {'requests': 20, 'yield_total': 0}
+        generator = searcher.discover_developers_generator(target_qualified=10)
+        first = next(generator)[0]
+        generator.close()
+    
+    # 已完成的关键词重新搜索（清除旧进度），而不是在本轮中被跳过
+    assert first == 'hot-dev0'
+    assert scraper.search_repositories.call_args_list[0].args[0] == 'hot'
+    assert frontier.get_keyword_states()['hot']['status'] == 'in_progress'
+    
+    db.close()
+
+def test_github_searcher_candidate_priority(test_db_path):
+    """测试候选者按历史合格率排序：高合格率仓库的贡献者先返回"""
+    from platforms.github.searcher import GitHubSearcher
+    from platforms.github.candidate_scorer import build_source_tag, parse_source_tag
+    from storage.repositories.github_repository import GitHubRepository
+    from storage.database import Database
+    from utils.crawler_status import clear_stop_flag
+    
+    clear_stop_flag()
+    db = Database()
+    db.db_path = test_db_path
+    db.connect()
+    db.init_tables()
+    repository = GitHubRepository(db)
+    
+    # 历史数据：good/repo 4个全部合格，bad/repo 20个全部不合格
+    history = [('good/repo', 4, True), ('bad/repo', 20, False)]
+    user_id = 0
+    for repo_name, count, qualified in history:
+        for _ in range(count):
+            user_id += 1
+            db.execute(
+                "INSERT INTO github_developers (user_id, username, status, is_indie_developer, discovered_from) VALUES (?, ?, ?, ?, ?)",
+                (user_id, f'old{user_id}', 'qualified' if qualified else 'rejected', int(qualified),
+                 build_source_tag('ComfyUI', repo_name))
+            )
+    
+    stats = repository.get_source_statistics()
+    assert stats[build_source_tag('ComfyUI', 'good/repo')] == {'total': 4, 'qualified': 4}
+    assert parse_source_tag(build_source_tag('ComfyUI', 'bad/repo')) == ('ComfyUI', 'bad/repo')
+    assert parse_source_tag('search') is None
+    
+    scraper = Mock()
+    scraper.search_repositories.return_value = [
+        {'repo_name': 'bad/repo', 'stars': 1000}, {'repo_name': 'good/repo', 'stars': 1000}
+    ]
+    scraper.get_repository_contributors.side_effect = lambda repo_name: (
+        [{'username': f'{repo_name[0]}{i}', 'commits': 50 - i, 'rank': i + 1} for i in range(3)], ""
+    )
+    
+    with patch('platforms.github.searcher.load_config', return_value={
+        'github': {'search_keywords': ['ComfyUI'], 'min_repo_stars': 100}
+    }):
+        searcher = GitHubSearcher(scraper, repository=repository)
+        usernames = [username for username, _ in searcher.discover_developers_generator(target_qualified=10)]
+    
+    assert usernames == ['g0', 'g1', 'g2', 'b0', 'b1', 'b2']
+    assert searcher.get_candidate_source('g1')['repo_name'] == 'good/repo'
+    assert searcher.get_candidate_source('b0')['keyword'] == 'ComfyUI'
+    
+    db.close()
+
+def test_github_searcher_search_cache(test_db_path):
+    """测试搜索结果缓存：同一运行内、跨运行复用，过期后重新请求"""
+    from platforms.github.searcher import GitHubSearcher
+    from storage.repositories.github_repository import GitHubRepository
+    from storage.database import Database
+    
+    db = Database()
+    db.db_path = test_db_path
+    db.connect()
+    db.init_tables()
+    repository = GitHubRepository(db)
+    
+    scraper = Mock()
+    scraper.search_repositories.return_value = [
+        {'repo_name': f'dev{i}/repo', 'owner_username': f'dev{i}', 'stars': 500} for i in range(3)
+    ]
+    config = {'github': {'search_cache': {'ttl_hours': 1}}}
+    
+    with patch('platforms.github.searcher.load_config', return_value=config):
+        first = GitHubSearcher(scraper, repository=repository)
+        first.search_by_topics(['image-generation'], max_per_topic=3)
+        first.search_by_topics(['Image-Generation'], max_per_topic=2)
+        
+        # 新一轮运行：内存缓存为空，从数据库复用
+        second = GitHubSearcher(scraper, repository=repository)
+        developers = second.search_by_topics(['image-generation'], max_per_topic=3)
+    
+    assert scraper.search_repositories.call_count == 1
+    assert sorted(developers) == ['dev0', 'dev1', 'dev2']
+    assert first.search_cache.get_hit_rates()['topics'] == {'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+    assert second.search_cache.get_hit_rates()['topics']['hits'] == 1
+    
+    # 请求更多结果时缓存不够用，需要重新搜索
+    with patch('platforms.github.searcher.load_config', return_value=config):
+        second.search_by_topics(['image-generation'], max_per_topic=10)
+    assert scraper.search_repositories.call_count == 2
+    
+    # TTL为0时缓存立即过期
+    with patch('platforms.github.searcher.load_config',
+               return_value={'github': {'search_cache': {'ttl_hours': 0}}}):
+        expired = GitHubSearcher(scraper, repository=repository)
+        expired.search_by_topics(['image-generation'], max_per_topic=3)
+    assert scraper.search_repositories.call_count == 3
+    
+    # 关键词搜索：缓存命中也计为一次搜索请求，与产出按同一口径统计
+    with patch('platforms.github.searcher.load_config', return_value=config):
+        for _ in range(2):
+            searcher = GitHubSearcher(scraper, repository=repository)
+            searcher.keyword_sorts['image generation'] = 'stars'
+            searcher._load_keyword_repositories('image generation')
+    assert scraper.search_repositories.call_count == 4
+    assert searcher.search_cache.get_hit_rates()['depth_first_generator']['hits'] == 1
+    assert searcher.keyword_scheduler.stats[('image generation', 'stars')]['requests'] == 2
+    
+    db.close()
+
+def test_youtube_channel_cache(test_db_path):
+    """测试频道信息缓存：同一频道只解析一次，记住可用的URL格式，跨运行复用"""
+    from platforms.youtube.scraper import YouTubeScraper
+    from platforms.youtube.channel_cache import YouTubeChannelCache
+    from storage.repositories.youtube_channel_cache_repository import YouTubeChannelCacheRepository
+    from storage.database import Database
+    
+    db = Database()
+    db.db_path = test_db_path
+    db.connect()
+    db.init_tables()
+    repository = YouTubeChannelCacheRepository(db)
+    
+    requested_urls = []
+    
+    def extract_info(url, download=False):
+        requested_urls.append(url)
+        if '/channel/' in url:
+            raise Exception('HTTP Error 404: Not Found')
+        return {'channel': 'AI Lab', 'channel_follower_count': 5000, 'description': 'contact: ai@lab.com'}
+    
+    def make_scraper(cache):
+        scraper = YouTubeScraper(channel_cache=cache)
+        scraper.rate_limiter = Mock()
+        return scraper
+    
+    with patch('platforms.youtube.ydl_pool.yt_dlp.YoutubeDL') as mock_ydl:
+        mock_ydl.return_value.extract_info.side_effect = extract_info
+        
+        # 竞对检查和频道分析共用一次解析
+        scraper = make_scraper(YouTubeChannelCache(repository=repository))
+        first = scraper.get_channel_info('ailab')
+        second = scraper.get_channel_info('ailab')
+        assert first == second
+        assert first['channel_url'] == 'https://www.youtube.com/@ailab'
+        assert requested_urls == ['https://www.youtube.com/channel/ailab', 'https://www.youtube.com/@ailab']
+        assert scraper.channel_cache.get_stats()['hits'] == 1
+        
+        # 新一轮运行：从数据库复用
+        make_scraper(YouTubeChannelCache(repository=repository)).get_channel_info('ailab')
+        assert len(requested_urls) == 2
+        
+        # 频道信息过期后重新解析，直接使用已知可用的URL格式
+        expired = make_scraper(YouTubeChannelCache(ttl_hours=0, repository=repository))
+        assert expired.get_channel_info('ailab')['channel_name'] == 'AI Lab'
+        assert requested_urls[2:] == ['https://www.youtube.com/@ailab']
+        expired.get_channel_videos('ailab', limit=5)
+        assert requested_urls[3] == 'https://www.youtube.com/@ailab/videos'
+    
+    db.close()
+
+def test_youtube_analyzer_uses_flat_metadata():
+    """测试频道分析：AI判断使用视频列表数据，只有合格频道完整提取少量视频"""
+    from datetime import datetime
+    from platforms.youtube.scraper import YouTubeScraper
+    from platforms.youtube.analyzer import KOLAnalyzer
+    
+    def make_entries(ai_count):
+        return [
+            {
+                'id': f'vid{i}',
+                'title': 'Stable Diffusion workflow' if i < ai_count else 'My cooking vlog',
+                'view_count': 1000 * (i + 1),
+                'timestamp': 1700000000 - i * 86400,
+            }
+            for i in range(10)
+        ]
+    
+    def make_video_info(video_id):
+        return {
+            'video_id': video_id, 'channel_id': 'chan', 'title': 'full', 'description': '',
+            'published_at': datetime(2023, 11, 14), 'duration': 60,
+            'views': 1000, 'likes': 100, 'comments': 20,
+            'video_url': f'https://www.youtube.com/watch?v={video_id}', 'full_metadata': True,
+        }
+    
+    scraper = YouTubeScraper()
+    scraper.get_channel_info = Mock(return_value={
+        'channel_id': 'chan', 'channel_name': 'Some Channel', 'channel_url': 'https://www.youtube.com/@chan',
+        'subscribers': 1000, 'total_videos': 10, 'total_views': 0, 'description': '',
+    })
+    scraper.get_video_info = Mock(side_effect=make_video_info)
+    analyzer = KOLAnalyzer(scraper)
+    analyzer.engagement_sample_size = 2
+    
+    # 不合格：结果由列表数据确定，不完整提取任何视频
+    scraper.get_channel_videos = Mock(return_value=make_entries(ai_count=1))
+    result = analyzer.analyze_channel('chan')
+    assert result['kol_data']['status'] == 'rejected'
+    assert scraper.get_video_info.call_count == 0
+    assert result['kol_data']['avg_views'] == 5500
+    assert result['kol_data']['last_video_date'] == datetime.fromtimestamp(1700000000)
+    
+    # 合格：只完整提取engagement_sample_size个视频（最新的优先）补全点赞/评论
+    scraper.get_channel_videos = Mock(return_value=make_entries(ai_count=5))
+    result = analyzer.analyze_channel('chan')
+    kol_data = result['kol_data']
+    assert kol_data['status'] == 'qualified'
+    assert kol_data['ai_ratio'] == 0.5 and kol_data['analyzed_videos'] == 10
+    assert sorted(c.args[0] for c in scraper.get_video_info.call_args_list) == ['vid0', 'vid1']
+    assert kol_data['avg_likes'] == 100 and kol_data['avg_comments'] == 20
+    assert kol_data['engagement_rate'] == round((100 * analyzer.like_weight + 20 * analyzer.comment_weight) / 1000, 4)
+    assert len(result['video_data_list']) == 10
+    assert result['video_data_list'][0]['is_ai_related'] is True
+
+def test_youtube_ydl_pool():
+    """测试YoutubeDL实例池：按配置复用实例，并发取出时互不共享"""
+    from platforms.youtube.ydl_pool import YoutubeDLPool
+    from platforms.youtube.scraper import YouTubeScraper
+    
+    created = []
+    
+    def factory(opts):
+        ydl = Mock()
+        ydl.params = opts
+        created.append(ydl)
+        return ydl
+    
+    pool = YoutubeDLPool(max_idle_per_key=1, factory=factory)
+    with pool.checkout('full', {'extract_flat': False}) as first:
+        pass
+    with pool.checkout('full', {'extract_flat': False}) as again:
+        assert again is first
+        # 同时取出时使用另一个实例
+        with pool.checkout('full', {'extract_flat': False}) as concurrent:
+            assert concurrent is not first
+    assert pool.stats == {'created': 2, 'reused': 1}
+    # 超出空闲上限的实例被关闭
+    assert pool.idle_count() == 1
+    assert created[0].close.called and not created[1].close.called
+    
+    # 爬虫按配置和覆盖选项区分实例
+    scraper = YouTubeScraper(ydl_pool=YoutubeDLPool(factory=factory))
+    with scraper._ydl('channel_videos', playlistend=10) as ydl:
+        assert ydl.params['playlistend'] == 10 and ydl.params['ignoreerrors'] is True
+    with scraper._ydl('channel_videos', playlistend=10) as reused:
+        assert reused is ydl
+    with scraper._ydl('channel_videos', playlistend=5) as other:
+        assert other is not ydl
+    with scraper._ydl('full') as full:
+        assert full.params['extract_flat'] is False
+
+def test_youtube_fetch_videos_info_concurrent():
+    """测试并发获取视频详情：结果按输入顺序返回，单个失败不影响其他视频，并发数有上限"""
+    import threading
+    import time
+    from platforms.youtube.scraper import YouTubeScraper
+    
+    lock = threading.Lock()
+    state = {'active': 0, 'peak': 0}
+    
+    def get_video_info(video_id):
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+        time.sleep(0.05)
+        with lock:
+            state['active'] -= 1
+        if video_id == 'bad':
+            raise Exception('HTTP Error 404')
+        return {'video_id': video_id}
+    
+    scraper = YouTubeScraper()
+    scraper.get_video_info = get_video_info
+    
+    video_ids = ['v1', 'bad', 'v3', 'v4', 'v5', 'v6']
+    results = scraper.fetch_videos_info(video_ids, max_workers=3)
+    assert [r['video_id'] if r else None for r in results] == ['v1', None, 'v3', 'v4', 'v5', 'v6']
+    assert 1 < state['peak'] <= 3
+    
+    # 默认逐个获取
+    state['peak'] = 0
+    assert scraper.fetch_videos_info(['v1', 'bad'])[1] is None
+    assert state['peak'] == 1
+
+def test_youtube_expander_query_reuse():
+    """测试扩散推荐查询：使用已知标题，相同搜索词在频道内去重、跨频道复用缓存"""
+    from platforms.youtube.scraper import YouTubeScraper
+    from platforms.youtube.expander import KOLExpander
+    from platforms.youtube.ydl_pool import YoutubeDLPool
+    
+    searches = []
+    
+    def extract_info(url, download=False):
+        assert url.startswith('ytsearch'), '标题已知时不应提取视频详情'
+        searches.append(url)
+        return {'entries': [{'id': f'r{len(searches)}', 'channel_id': f'UC_found{len(searches)}'},
+                            {'id': 'own', 'channel_id': 'UC_a'}]}
+    
+    ydl = Mock()
+    ydl.extract_info.side_effect = extract_info
+    scraper = YouTubeScraper(ydl_pool=YoutubeDLPool(factory=lambda opts: ydl))
+    scraper.rate_limiter = Mock()
+    channel_videos = {
+        'UC_a': [{'id': 'a1', 'title': 'AI Video Tutorial part 1'},
+                 {'id': 'a2', 'title': 'ai video  tutorial part 2'},
+                 {'id': 'a3', 'title': 'Sora review'}],
+        'UC_b': [{'id': 'b1', 'title': 'AI video tutorial for beginners'}],
+    }
+    scraper.get_channel_videos = Mock(side_effect=lambda channel_id, limit=10: channel_videos[channel_id])
+    
+    expander = KOLExpander(scraper)
+    expander.recommended_videos_count = 10
+    found_a = expander.expand_from_kol('UC_a')
+    found_b = expander.expand_from_kol('UC_b')
+    
+    # 4个视频只有2个不同的搜索词
+    assert searches == ['ytsearch10:AI Video Tutorial', 'ytsearch10:Sora review']
+    assert sorted(found_a) == ['UC_found1', 'UC_found2']
+    assert sorted(found_b) == ['UC_a', 'UC_found1']
+    assert expander.stats == {'queries': 3, 'coalesced': 1}
+    assert scraper.related_search_cache.get_stats()['related_search']['hits'] == 1
+
+def test_youtube_info_cache(temp_dir):
+    """测试yt-dlp信息磁盘缓存：按字段类别过期、批量读取、按大小淘汰，爬虫请求网络前先查询"""
+    import os
+    from platforms.youtube.scraper import YouTubeScraper
+    from platforms.youtube.info_cache import YouTubeInfoCache
+    from platforms.youtube.ydl_pool import YoutubeDLPool
+    
+    now = [1000.0]
+    cache = YouTubeInfoCache(cache_dir=temp_dir, immutable_ttl_hours=720, volatile_ttl_hours=24,
+                             clock=lambda: now[0])
+    info = {'id': 'v1', 'title': 'Sora review', 'timestamp': 1700000000, 'view_count': 100,
+            'formats': [{'url': 'x' * 1000}]}
+    cache.put('video', 'v1', info)
+    assert cache.get('video', 'v1') == {'id': 'v1', 'title': 'Sora review', 'timestamp': 1700000000, 'view_count': 100}
+    assert cache.get('channel', 'v1') is None
+    
+    # 观看数过期后只能取到不变字段
+    now[0] += 25 * 3600
+    assert cache.get('video', 'v1') is None
+    assert cache.get('video', 'v1', fields='immutable') == {'id': 'v1', 'title': 'Sora review', 'timestamp': 1700000000}
+    cache.put('video', 'v2', {'id': 'v2', 'title': 'GPT news', 'view_count': 5})
+    assert set(cache.get_many('video', ['v1', 'v2', 'v3'])) == {'v2'}
+    
+    # 超过大小上限时淘汰最久未访问的记录
+    small = YouTubeInfoCache(cache_dir=os.path.join(temp_dir, 'small'), max_bytes=400, clock=lambda: now[0])
+    for i in range(10):
+        now[0] += 1
+        small.put('video', f'v{i}', {'id': f'v{i}', 'title': f'title {i}', 'description': f'desc {i}' * 5})
+    assert small.stats['evictions'] > 0
+    assert small.get('video', 'v9') is not None and small.get('video', 'v0') is None
+    
+    # 爬虫：视频详情写入缓存，再次获取（包括批量获取和推荐标题）不再请求网络
+    ydl = Mock()
+    ydl.extract_info.return_value = {'id': 'v5', 'title': 'AI video tutorial', 'channel_id': 'UC1',
+                                     'upload_date': '20240101', 'view_count': 10, 'like_count': 1}
+    scraper = YouTubeScraper(ydl_pool=YoutubeDLPool(factory=lambda opts: ydl),
+                             info_cache=YouTubeInfoCache(cache_dir=os.path.join(temp_dir, 'scraper')))
+    scraper.rate_limiter = Mock()
+    assert scraper.get_video_info('v5')['views'] == 10
+    assert scraper.fetch_videos_info(['v5'])[0]['likes'] == 1
+    assert scraper._get_video_title('v5') == 'AI video tutorial'
+    assert ydl.extract_info.call_count == 1
+
+def test_youtube_searcher_cache_and_overlap(test_db_path):
+    """测试关键词搜索：规范化搜索词缓存、重叠关键词去冗余、新频道产出统计持久化"""
+    import random
+    from storage.database import Database
+    from storage.repositories.keyword_stats_repository import KeywordStatsRepository
+    from storage.repositories.youtube_search_cache_repository import YouTubeSearchCacheRepository
+    from platforms.youtube.searcher import KeywordSearcher
+    from platforms.youtube.search_cache import YouTubeSearchCache
+    from utils.keyword_scheduler import KeywordScheduler
+    from utils.keyword_overlap import KeywordOverlapTracker
+    
+    assert YouTubeSearchCache.normalize_query(' Sora-AI  sora ') == YouTubeSearchCache.normalize_query('sora ai')
+    
+    db = Database()
+    db.db_path = test_db_path
+    db.connect()
+    db.init_tables()
+    stats_repository = KeywordStatsRepository(db)
+    cache_repository = YouTubeSearchCacheRepository(db)
+    
+    results = {
+        'Sora': ['UC_s1', 'UC_s2', 'UC_s3', 'UC_known'],
+        'Sora AI': ['UC_s1', 'UC_s2', 'UC_s3'],
+        'cooking': ['UC_c1', 'UC_c2'],
+    }
+    scraper = Mock()
+    scraper.search_videos.side_effect = lambda keyword, max_results: [
+        {'id': f'{keyword}{i}', 'channel_id': channel_id, 'formats': ['large']}
+        for i, channel_id in enumerate(results[keyword])]
+    scraper.extract_channel_id.side_effect = lambda video: video['channel_id']
+    
+    def make_searcher():
+        searcher = KeywordSearcher(
+            scraper,
+            scheduler=KeywordScheduler('youtube', stats_repository, rng=random.Random(3)),
+            search_cache=YouTubeSearchCache(ttl_hours=24, repository=cache_repository),
+            overlap_tracker=KeywordOverlapTracker('youtube', stats_repository, threshold=0.6),
+            is_known_channel=lambda channel_id: channel_id == 'UC_known'
+        )
+        searcher.keywords = list(results)
+        return searcher
+    
+    found = make_searcher().search_by_keywords(keyword_limit=3)
+    assert sorted(found) == ['UC_c1', 'UC_c2', 'UC_known', 'UC_s1', 'UC_s2', 'UC_s3']
+    assert scraper.search_videos.call_count == 3
+    
+    # 每个频道只在第一次出现时计为新频道，已入库的频道不计
+    stats = stats_repository.load('youtube')
+    assert sum(arm['new_channels'] for arm in stats.values()) == 5
+    assert stats[('cooking', '')]['results_total'] == 2
+    assert stats_repository.load_overlaps('youtube')[('Sora', 'Sora AI')]['overlap'] == 1.0
+    
+    # 新一轮运行：重叠的关键词对只保留一个，搜索结果来自数据库缓存
+    searcher = make_searcher()
+    found = searcher.search_by_keywords(keyword_limit=2)
+    assert scraper.search_videos.call_count == 3
+    assert {'UC_c1', 'UC_c2'} <= set(found) and {'UC_s1', 'UC_s2', 'UC_s3'} <= set(found)
+    assert searcher.search_cache.get_stats()['hits'] == 2
+    assert 'formats' not in cache_repository.get(YouTubeSearchCache.normalize_query('cooking'))['results'][0]
+    # 缓存命中也计为一次搜索，缓存结果中合格频道的产出有对应的请求
+    assert stats_repository.load('youtube')[('cooking', '')]['requests'] == 2
+    searcher.record_channel_outcome('UC_c1', qualified=True)
+    arm = searcher.scheduler.stats[('cooking', '')]
+    assert arm['yield_total'] <= arm['requests']
+    
+    db.close()
+
+def test_twitter_profile_with_tweets_single_load():
+    """测试Twitter用户信息和推文只加载一次主页"""
+    from platforms.twitter.scraper import TwitterScraper
+    from platforms.twitter.analyzer import TwitterAnalyzer
+    
+    scraper = TwitterScraper()
+    scraper.driver = Mock()
+    scraper.rate_limiter = Mock()
+    scraper._wait_for_tweets = Mock()
+    scraper._open_profile = Mock(wraps=lambda username: f'https://twitter.com/{username}')
+    scraper._extract_profile = Mock(return_value={'username': 'ai_dev', 'followers_count': 5000, 'tweet_count': 100})
+    scraper._collect_tweets = Mock(return_value=[{'text': 'Training an LLM with PyTorch', 'like_count': 10}])
+    
+    user_info, tweets = scraper.get_profile_with_tweets('ai_dev', limit=5)
+    assert user_info['followers_count'] == 5000 and len(tweets) == 1
+    assert scraper._open_profile.call_count == 1
+    scraper._collect_tweets.assert_called_once_with('ai_dev', 5)
+    
+    # 没有推文（受保护账号）时保留用户信息；主页加载失败时返回 (None, [])
+    scraper._wait_for_tweets.side_effect = TimeoutError('no tweets')
+    assert scraper.get_profile_with_tweets('ai_dev') == (scraper._extract_profile.return_value, [])
+    scraper._open_profile = Mock(side_effect=TimeoutError('blocked'))
+    assert scraper.get_profile_with_tweets('ai_dev') == (None, [])
+    
+    # 分析器只调用一次合并接口
+    fake = Mock()
+    fake.get_profile_with_tweets.return_value = ({'username': 'ai_dev', 'followers_count': 5000}, [{'text': 'GPT'}])
+    result = TwitterAnalyzer(fake).analyze_user('ai_dev')
+    assert result['user_info']['username'] == 'ai_dev'
+    fake.get_profile_with_tweets.assert_called_once()
+    fake.get_user_info.assert_not_called()
+    fake.get_user_tweets.assert_not_called()
+
+
+def test_twitter_batched_extraction():
+    """测试Twitter页面提取每次滚动只执行一次页面脚本"""
+    from platforms.twitter.scraper import TwitterScraper
+    
+    scraper = TwitterScraper()
+    nodes = [
+        {'id': '1790000000000000001', 'href': '/ai_dev/status/1790000000000000001', 'author_href': '/ai_dev',
+         'author_name': 'AI Dev', 'text': 'Training an LLM', 'created_at': '2024-05-01T10:00:00.000Z',
+         'reply': '12 Replies. Reply', 'retweet': '', 'like': '1,234 Likes. Like'},
+        # 广告等没有正文/时间的节点跳过
+        {'id': None, 'href': '', 'author_href': '/ads', 'author_name': 'Ad', 'text': None, 'created_at': None,
+         'reply': '', 'retweet': '', 'like': ''},
+    ]
+    scraper.driver = Mock()
+    scraper.driver.execute_script.side_effect = lambda script, *args: nodes if script == TwitterScraper.TWEETS_SCRIPT else None
+    
+    scraper.scroller = Mock(run=lambda driver, collect, limit: collect())
+    tweets = scraper._collect_tweets('ai_dev', limit=5)
+    
+    assert tweets == [{'tweet_id': '1790000000000000001', 'username': 'ai_dev', 'text': 'Training an LLM',
+                       'created_at': '2024-05-01T10:00:00.000Z', 'reply_count': 12, 'retweet_count': 0,
+                       'like_count': 1234, 'tweet_url': 'https://twitter.com/ai_dev/status/1790000000000000001'}]
+    scripts = [call.args[0] for call in scraper.driver.execute_script.call_args_list]
+    assert scripts == [TwitterScraper.TWEETS_SCRIPT]
+    scraper.driver.find_element.assert_not_called()
+    scraper.driver.find_elements.assert_not_called()
+    
+    # 用户信息一次脚本调用提取
+    scraper.driver.execute_script.side_effect = None
+    scraper.driver.execute_script.return_value = {'name': 'AI Dev', 'bio': '', 'following': '321',
+                                                  'followers': '12.5K', 'location': None}
+    profile = scraper._extract_profile('ai_dev', 'https://twitter.com/ai_dev')
+    assert profile['name'] == 'AI Dev' and profile['followers_count'] == 12500 and profile['location'] == ''
+    scraper.driver = None
+
+
+def test_twitter_scroll_driver():
+    """测试滚动加载等待新内容或网络空闲，而不是固定sleep"""
+    from platforms.twitter.scroll_driver import ScrollDriver
+    
+    class FakeDriver:
+        """每次滚动后第poll_delay次轮询出现新推文，pages页后不再有新内容"""
+        def __init__(self, pages, poll_delay):
+            self.pages, self.poll_delay = pages, poll_delay
+            self.loaded, self.polls = 1, 0
+        
+        def execute_script(self, script, scroll):
+            if scroll:
+                self.polls = 0
+            else:
+                self.polls += 1
+                if self.polls == self.poll_delay and self.loaded < self.pages:
+                    self.loaded += 1
+            return {'articles': self.loaded * 10, 'height': self.loaded * 1000, 'last': str(self.loaded),
+                    'resources': self.loaded, 'pending': 0}
+    
+    clock = {'now': 0.0}
+    def sleep(seconds):
+        clock['now'] += seconds
+    
+    scroller = ScrollDriver(max_scrolls=5, timeout=3.0, idle_time=0.5, poll_interval=0.1,
+                            clock=lambda: clock['now'], sleep=sleep)
+    
+    # 新内容很快出现：达到数量上限即停止，只等待了实际加载时间
+    driver = FakeDriver(pages=10, poll_delay=2)
+    result = scroller.run(driver, lambda: driver.loaded * 10, limit=30)
+    assert result['scrolls'] == 2 and not result['stalled']
+    assert abs(result['wait_seconds'] - 0.4) < 1e-6
+    
+    # 没有更多内容：网络空闲后再滚动一次，仍空闲即判定停滞，不等满超时
+    driver = FakeDriver(pages=1, poll_delay=2)
+    result = scroller.run(driver, lambda: driver.loaded * 10, limit=30)
+    assert result['scrolls'] == 1 and result['stalled']
+    assert result['wait_seconds'] < 1.5
+    assert scroller.stats['scrolls'] == 3 and scroller.stats['stalls'] == 1
+    
+    # 同一实例被多个任务交替使用：每次run的滚动次数上限和等待时间单独计算
+    shared = ScrollDriver(max_scrolls=2, timeout=3.0, idle_time=0.5, poll_interval=0.1,
+                          clock=lambda: clock['now'], sleep=sleep)
+    outer_driver, inner_driver = FakeDriver(pages=10, poll_delay=2), FakeDriver(pages=10, poll_delay=2)
+    inner = {}
+    
+    def collect_outer():
+        if not inner:
+            inner.update(shared.run(inner_driver, lambda: inner_driver.loaded * 10, limit=100))
+        return outer_driver.loaded * 10
+    
+    result = shared.run(outer_driver, collect_outer, limit=100)
+    assert inner['scrolls'] == 2 and result['scrolls'] == 2 and outer_driver.loaded == 3
+    assert abs(result['wait_seconds'] - 0.4) < 1e-6
+    assert shared.stats['scrolls'] == 4 and abs(shared.stats['wait_seconds'] - 0.8) < 1e-6
+    
+    class DelayedDriver:
+        """滚动后第arrive_at秒出现新内容；pending_until之前有进行中的请求（资源条目不变）"""
+        def __init__(self, arrive_at, pending_until=0.0):
+            self.arrive_at, self.pending_until = arrive_at, pending_until
+            self.scrolls = 0
+        
+        def execute_script(self, script, scroll):
+            self.scrolls += bool(scroll)
+            loaded = clock['now'] >= self.arrive_at
+            return {'articles': 20 if loaded else 10, 'height': 1000, 'last': None, 'resources': 5,
+                    'pending': int(clock['now'] < self.pending_until)}
+    
+    # 内容在idle_time之后才出现（加载请求被延迟发出）：空闲后再滚动一次并继续等待
+    clock['now'] = 0.0
+    driver = DelayedDriver(arrive_at=0.8)
+    assert scroller.scroll_and_wait(driver)
+    assert driver.scrolls == 2
+    
+    # 请求进行中（还没有资源条目）不算空闲，等到内容出现
+    clock['now'] = 0.0
+    driver = DelayedDriver(arrive_at=2.0, pending_until=2.0)
+    assert scroller.scroll_and_wait(driver)
+    assert driver.scrolls == 1
+    
+    # 请求一直未完成时最多等到timeout
+    clock['now'] = 0.0
+    assert not scroller.scroll_and_wait(DelayedDriver(arrive_at=10.0, pending_until=10.0))
+    assert abs(clock['now'] - 3.0) < 0.15
+
+
+def test_twitter_search_dedup_by_tweet_id():
+    """测试滚动提取按推文ID去重，搜索结果的tweet_url使用推文ID"""
+    from unittest.mock import patch
+    from platforms.twitter.scraper import TwitterScraper
+    
+    def node(status_id, username='ai_dev', text='GPT-4 tips'):
+        return {'id': status_id, 'href': f'/{username}/status/{status_id}', 'author_href': f'/{username}',
+                'author_name': username, 'text': text, 'created_at': '2024-05-01T10:00:00.000Z',
+                'reply': '', 'retweet': '', 'like': '3 Likes'}
+    
+    # 每次滚动只返回新出现的节点（已提取的节点在页面中被标记），偶尔会重复返回重新渲染的节点
+    passes = [[node('101'), node('102', 'ml_lab')], [node('102', 'ml_lab'), node('103')], [node('104')]]
+    
+    scraper = TwitterScraper()
+    scraper.driver = Mock()
+    scraper.rate_limiter = Mock()
+    scraper._extract_tweet_nodes = Mock(side_effect=passes)
+    
+    def fake_run(driver, collect, limit):
+        while collect() < limit and scraper._extract_tweet_nodes.call_count < len(passes):
+            pass
+    scraper.scroller = Mock(run=fake_run)
+    
+    with patch('platforms.twitter.scraper.WebDriverWait'):
+        tweets = scraper.search_tweets('GPT', limit=3)
+    
+    assert [t['tweet_id'] for t in tweets] == ['101', '102', '103']
+    assert tweets[1]['username'] == 'ml_lab'
+    assert tweets[1]['tweet_url'] == 'https://twitter.com/ml_lab/status/102'
+    scraper.driver = None
+
+
+def test_twitter_driver_pool(temp_dir):
+    """测试WebDriver浏览器池：复用、健康检查、按页面数回收、驱动路径缓存及版本不匹配时重新解析"""
+    import os
+    import threading
+    from unittest.mock import patch
+    from platforms.twitter import driver_pool
+    from platforms.twitter.driver_pool import WebDriverPool, resolve_driver_path
+    from platforms.twitter.scraper import TwitterScraper
+    
+    class FakeDriver:
+        def __init__(self):
+            self.alive, self.quit_called, self.pages = True, False, []
+        
+        def execute_script(self, script, *args):
+            if not self.alive:
+                raise ConnectionError('chrome not reachable')
+            return 1
+        
+        def get(self, url):
+            self.pages.append(url)
+        
+        def delete_all_cookies(self):
+            pass
+        
+        def quit(self):
+            self.quit_called = True
+    
+    created = []
+    def factory():
+        created.append(FakeDriver())
+        return created[-1]
+    
+    pool = WebDriverPool(size=2, max_pages=3, wait_timeout=5, factory=factory)
+    pool.warm_up()
+    assert len(created) == 2 and pool.idle_count() == 2
+    
+    # 复用预启动的浏览器，不再启动新浏览器
+    with pool.checkout() as browser:
+        assert browser.driver in created
+    with pool.checkout() as browser:
+        assert browser.driver in created
+    assert len(created) == 2 and pool.stats['reused'] == 2
+    
+    # 健康检查失败的浏览器关闭后重建
+    for driver in created:
+        driver.alive = False
+    with pool.checkout() as browser:
+        assert browser.driver is created[-1] and len(created) == 3
+    assert pool.stats['unhealthy'] == 2 and all(d.quit_called for d in created[:2])
+    
+    # 爬虫在session期间使用同一个浏览器，打开max_pages个页面后归还时回收
+    scraper = TwitterScraper(pool=pool)
+    with scraper.session() as driver:
+        with scraper.session() as nested:
+            assert nested is driver
+        for i in range(3):
+            scraper._navigate(f'https://twitter.com/user{i}')
+    assert driver.quit_called and pool.stats['recycled'] == 1 and scraper.driver is None
+    
+    # 浏览器都被取出时等待归还，不超过size个
+    results = []
+    def take():
+        with pool.checkout() as browser:
+            results.append(browser.driver)
+    with pool.checkout() as a, pool.checkout() as b:
+        waiter = threading.Thread(target=take)
+        waiter.start()
+        waiter.join(0.2)
+        assert waiter.is_alive()
+    waiter.join(5)
+    assert results and results[0] in (a.driver, b.driver)
+    
+    # 驱动路径只解析一次并缓存到磁盘
+    cache_file = os.path.join(temp_dir, 'chromedriver_path')
+    driver_binary = os.path.join(temp_dir, 'chromedriver')
+    open(driver_binary, 'w').close()
+    with patch('webdriver_manager.chrome.ChromeDriverManager') as manager:
+        manager.return_value.install.return_value = driver_binary
+        with patch.object(driver_pool, '_driver_path', None):
+            assert resolve_driver_path(cache_file) == driver_binary
+            assert resolve_driver_path(cache_file) == driver_binary
+        with patch.object(driver_pool, '_driver_path', None):
+            assert resolve_driver_path(cache_file) == driver_binary
+    assert manager.return_value.install.call_count == 1
+    
+    # Chrome升级后缓存的驱动版本不匹配：清除磁盘缓存、重新解析驱动并重试一次
+    stale_binary = os.path.join(temp_dir, 'chromedriver_old')
+    fresh_binary = os.path.join(temp_dir, 'chromedriver_new')
+    for path in (stale_binary, fresh_binary):
+        open(path, 'w').close()
+    project_cache = os.path.join(temp_dir, driver_pool.DRIVER_PATH_CACHE)
+    os.makedirs(os.path.dirname(project_cache), exist_ok=True)
+    with open(project_cache, 'w', encoding='utf-8') as f:
+        f.write(stale_binary)
+    
+    from selenium.common.exceptions import SessionNotCreatedException
+    launched = []
+    class LaunchedDriver:
+        def execute_cdp_cmd(self, cmd, params):
+            pass
+    def fake_chrome(service, options):
+        launched.append(service)
+        if service == stale_binary:
+            raise SessionNotCreatedException('This version of ChromeDriver only supports Chrome version 120')
+        return LaunchedDriver()
+    with patch.object(driver_pool, 'get_project_root', return_value=temp_dir), patch.object(driver_pool, '_driver_path', None):
+        with patch('selenium.webdriver.Chrome', side_effect=fake_chrome), patch('selenium.webdriver.chrome.service.Service', side_effect=lambda path: path):
+            with patch('webdriver_manager.chrome.ChromeDriverManager') as manager:
+                manager.return_value.install.return_value = fresh_binary
+                assert isinstance(driver_pool.create_chrome_driver(), LaunchedDriver)
+    assert launched == [stale_binary, fresh_binary]
+    assert manager.return_value.install.call_count == 1
+    with open(project_cache, encoding='utf-8') as f:
+        assert f.read() == fresh_binary
@@ -168,3 +168,37 @@ def test_migrations(test_db_path):
     assert run_migration is not None
     
     db.close()
+
+def test_github_frontier_repository(test_db_path):
+    """测试GitHub爬取边界（断点续爬）"""
+    from storage.repositories.github_frontier_repository import GitHubFrontierRepository
+    from storage.database import Database
+    
+    db = Database()
+    db.db_path = test_db_path
+    db.connect()
+    db.init_tables()
+    frontier = GitHubFrontierRepository(db)
+    
+    repos = [{'repo_name': 'a/one', 'stars': 500}, {'repo_name': 'b/two', 'stars': 50}]
+    frontier.start_keyword('ComfyUI', 'stars', repos)
+    
+    states = frontier.get_keyword_states()
+    assert states['ComfyUI']['status'] == 'in_progress'
+    assert [r['repo_name'] for r in frontier.get_keyword_repositories('ComfyUI')] == ['a/one', 'b/two']
+    
+    contributors = [{'username': 'u1', 'commits': 10, 'rank': 1}, {'username': 'u2', 'commits': 5, 'rank': 2}]
+    frontier.save_contributors('ComfyUI', 'a/one', contributors)
+    frontier.checkpoint('ComfyUI', 'a/one', 1)
+    
+    state = frontier.get_repository_state('ComfyUI', 'a/one')
+    assert state['contributor_offset'] == 1
+    assert frontier.load_contributors(state) == contributors
+    
+    frontier.complete_keyword('ComfyUI')
+    assert frontier.get_statistics()['completed_keywords'] == 1
+    
+    frontier.reset()
+    assert frontier.get_keyword_states() == {}
+    
+    db.close()
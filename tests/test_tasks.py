@@ -103,12 +103,338 @@ def test_github_export_academic(test_db_path, temp_dir):
     
     db.close()
 
+def test_github_requalify_task(test_db_path):
+    """测试离线重新判定：修改AI关键词后用已入库的仓库重新分类"""
+    from unittest.mock import patch
+    from tasks.github.requalify import GitHubRequalifyTask
+    from storage.repositories.github_repository import GitHubRepository
+    from storage.repositories.github_academic_repository import GitHubAcademicRepository
+    from storage.database import Database
+    
+    db = Database()
+    db.db_path = test_db_path
+    db.connect()
+    db.init_tables()
+    repo = GitHubRepository(db)
+    academic_repo = GitHubAcademicRepository(db)
+    
+    base = {'followers': 200, 'email': 'dev@example.com', 'contact_info': '📧 dev@example.com',
+            'status': 'qualified', 'is_indie_developer': True, 'analyzed_repos': 1}
+    repo.save_developer({**base, 'user_id': 1, 'username': 'indie'})
+    repo.save_repositories('indie', [{'repo_id': 11, 'repo_name': 'indie/stable-diffusion-app', 'stars': 800}])
+    repo.save_developer({**base, 'user_id': 2, 'username': 'prof', 'bio': 'Professor at MIT'})
+    repo.save_repositories('prof', [{'repo_id': 21, 'repo_name': 'prof/stable-diffusion-paper', 'stars': 300}])
+    # 旧数据：分析过仓库但没有入库，跳过
+    repo.save_developer({**base, 'user_id': 3, 'username': 'legacy'})
+    
+    # 重复保存会替换该开发者之前的仓库
+    repo.save_repositories('indie', [{'repo_id': 11, 'repo_name': 'indie/stable-diffusion-app', 'stars': 800}])
+    assert len(repo.get_repositories_by_username('indie')) == 1
+    # 写入失败时回滚，不会清空之前保存的仓库
+    assert not repo.save_repositories('indie', [{'repo_id': 12, 'repo_name': 'indie/bad', 'stars': object()}])
+    assert [r['repo_name'] for r in repo.get_repositories_by_username('indie')] == ['indie/stable-diffusion-app']
+    
+    config = {'github': {
+        'min_followers': 100, 'min_stars': 500,
+        'academic_min_followers': 50, 'academic_min_stars': 100,
+        'academic_keywords': ['professor'],
+        'core_ai_keywords': ['llm'],
+    }}
+    task = GitHubRequalifyTask(repo, academic_repo)
+    with patch('tasks.github.requalify.load_config', return_value=config):
+        preview = task.run(dry_run=True)
+        assert repo.get_developer_by_username('indie')['status'] == 'qualified'
+        summary = task.run()
+    
+    assert preview['changes'] == summary['changes']
+    assert summary['skipped_missing_repos'] == 1
+    assert summary['newly_rejected'] == 1
+    assert summary['moved'] == 1
+    
+    indie = repo.get_developer_by_username('indie')
+    assert indie['status'] == 'rejected' and indie['is_indie_developer'] == 0
+    assert not repo.developer_exists('prof')
+    assert academic_repo.get_academic_developer_by_username('prof')['status'] == 'qualified'
+    assert repo.get_developer_by_username('legacy')['status'] == 'qualified'
+    
+    db.close()
+
+def test_youtube_update_incremental(test_db_path):
+    """测试YouTube增量更新：只提取新视频和过期视频，指标由入库数据和新数据合并计算"""
+    from datetime import datetime
+    from tasks.youtube.update import YouTubeUpdateTask
+    from platforms.youtube.analyzer import KOLAnalyzer
+    from storage.repositories.youtube_repository import YouTubeRepository
+    from storage.database import Database
+    from utils.text_matcher import TextMatcher
+    
+    db = Database()
+    db.db_path = test_db_path
+    db.connect()
+    db.init_tables()
+    repo = YouTubeRepository(db)
+    
+    repo.add_kol({
+        'channel_id': 'UC1', 'channel_name': 'AI Lab', 'channel_url': '', 'subscribers': 1000,
+        'total_videos': 3, 'total_views': 0, 'analyzed_videos': 2, 'ai_videos': 2, 'ai_ratio': 1.0,
+        'avg_views': 0, 'avg_likes': 0, 'engagement_rate': 0, 'status': 'qualified', 'discovered_from': 'test',
+    })
+    
+    def make_video(video_id, views):
+        return {
+            'video_id': video_id, 'channel_id': 'UC1', 'title': 'Stable Diffusion tips', 'description': '',
+            'published_at': datetime(2024, 1, int(video_id[1:])), 'duration': 60,
+            'views': views, 'likes': views // 10, 'comments': views // 100,
+            'video_url': '', 'is_ai_related': True, 'matched_keywords': ['stable diffusion'],
+        }
+    
+    repo.add_video(make_video('v1', 1000))
+    repo.add_video(make_video('v2', 2000))
+    db.execute("UPDATE youtube_videos SET scraped_at = '2000-01-01 00:00:00' WHERE video_id = 'v2'")
+    
+    scraper = Mock()
+    scraper.get_channel_videos.return_value = [
+        {'id': vid, 'title': 'Stable Diffusion tips'} for vid in ('v3', 'v2', 'v1')
+    ]
+    scraper.fetch_videos_info.side_effect = lambda ids, max_workers=1: [make_video(vid, 3000) for vid in ids]
+    analyzer = Mock()
+    analyzer.text_matcher = TextMatcher()
+    analyzer._compute_engagement = KOLAnalyzer(scraper)._compute_engagement
+    
+    task = YouTubeUpdateTask(scraper, analyzer, repo)
+    task.refresh_scheduler = None  # 每次都更新所有合格KOL
+    task.run()
+    
+    # 新视频v3和过期视频v2重新提取，v1使用入库数据
+    assert scraper.fetch_videos_info.call_args.args[0] == ['v3', 'v2']
+    assert task.stats == {'new_videos': 1, 'refreshed_videos': 1, 'reused_videos': 1, 'failed_videos': 0}
+    kol = repo.get_kol_by_channel_id('UC1')
+    assert kol['avg_views'] == (3000 + 3000 + 1000) // 3
+    assert kol['last_video_date'].startswith('2024-01-03')
+    assert repo.get_videos_by_ids(['v3'])['v3']['views'] == 3000
+    
+    # 再次更新：没有新视频也没有过期视频，不发起任何视频详情提取
+    task.run()
+    assert scraper.fetch_videos_info.call_count == 1
+    
+    # 非增量模式：全部重新提取，已入库的视频只更新数据、不计为新视频；
+    # 缺少点赞/评论数的视频不参与对应的平均值
+    task.incremental = False
+    task.stats = dict.fromkeys(task.stats, 0)
+    scraper.fetch_videos_info.side_effect = lambda ids, max_workers=1: [
+        {**make_video(vid, 4000), 'likes': None, 'comments': None} if vid == 'v3' else make_video(vid, 4000)
+        for vid in ids]
+    task.run()
+    assert task.stats == {'new_videos': 0, 'refreshed_videos': 3, 'reused_videos': 0, 'failed_videos': 0}
+    assert repo.get_videos_by_ids(['v1'])['v1']['views'] == 4000
+    kol = repo.get_kol_by_channel_id('UC1')
+    assert (kol['avg_views'], kol['avg_likes'], kol['avg_comments']) == (4000, 400, 40)
+    
+    db.close()
+
+def test_youtube_refresh_scheduler(test_db_path):
+    """测试KOL刷新调度：按更新频率/变化/优先级计算间隔，更新任务只处理到期的KOL"""
+    import time
+    from tasks.youtube.update import YouTubeUpdateTask
+    from platforms.youtube.analyzer import KOLAnalyzer
+    from platforms.youtube.refresh_scheduler import RefreshScheduler
+    from storage.repositories.youtube_repository import YouTubeRepository
+    from storage.database import Database
+    from utils.text_matcher import TextMatcher
+    
+    db = Database()
+    db.db_path = test_db_path
+    db.connect()
+    db.init_tables()
+    repo = YouTubeRepository(db)
+    
+    scheduler = RefreshScheduler(repo, min_interval_hours=24, max_interval_hours=720, cadence_factor=0.5)
+    # 每天更新的频道 vs 200天没更新的频道
+    assert scheduler.interval_hours(1, change=0.1, priority=50) == 24
+    assert scheduler.interval_hours(200, change=0.1, priority=50) == 720
+    assert scheduler.interval_hours(10, change=0.1, priority=50) == 120
+    # 数据变化大的缩短，几乎不变的延长；优先级高的缩短
+    assert scheduler.interval_hours(10, change=0.5, priority=50) == 60
+    assert scheduler.interval_hours(10, change=0.0, priority=50) == 180
+    assert scheduler.interval_hours(10, change=0.1, priority=100) == 60
+    assert RefreshScheduler.change_score({'avg_views': 1000, 'ai_ratio': 0.5},
+                                         {'avg_views': 1200, 'ai_ratio': 0.45}) == pytest.approx(0.2)
+    
+    for channel_id, ai_ratio in (('UC_active', 0.9), ('UC_dormant', 0.6)):
+        repo.add_kol({
+            'channel_id': channel_id, 'channel_name': channel_id, 'channel_url': '', 'subscribers': 1000,
+            'total_videos': 1, 'total_views': 0, 'analyzed_videos': 1, 'ai_videos': 1, 'ai_ratio': ai_ratio,
+            'avg_views': 100, 'avg_likes': 10, 'engagement_rate': 0.1, 'status': 'qualified', 'discovered_from': 'test',
+        })
+    # UC_dormant已安排在未来刷新，UC_active没有刷新计划（视为到期）
+    repo.save_refresh_schedule('UC_dormant', time.time() + 3600, 720, 0.0, time.time())
+    
+    scraper = Mock()
+    scraper.get_channel_videos.return_value = [{'id': 'v1', 'title': 'Sora tutorial'}]
+    scraper.fetch_videos_info.return_value = [None]
+    analyzer = Mock()
+    analyzer.text_matcher = TextMatcher()
+    analyzer._compute_engagement = KOLAnalyzer(scraper)._compute_engagement
+    analyzer.calculate_priority.return_value = 50
+    
+    task = YouTubeUpdateTask(scraper, analyzer, repo, refresh_scheduler=scheduler)
+    task.run()
+    assert [c.args[0] for c in scraper.get_channel_videos.call_args_list] == ['UC_active']
+    
+    # 刚刷新过的KOL不再到期
+    assert scheduler.get_due_kols() == []
+    due_later = scheduler.get_due_kols(now=time.time() + 721 * 3600)
+    assert sorted(kol['channel_id'] for kol in due_later) == ['UC_active', 'UC_dormant']
+    
+    # 刷新失败的KOL按连续失败次数退避重试，成功刷新后清零
+    assert [scheduler.retry_interval_hours(n) for n in (0, 1, 2, 10)] == [24, 48, 96, 720]
+    repo.save_refresh_schedule('UC_dormant', time.time() - 1, 720, 0.0, time.time())
+    scraper.get_channel_videos.side_effect = Exception('HTTP Error 429')
+    for failures in (1, 2):
+        db.execute("UPDATE youtube_refresh_schedule SET next_refresh_ts = ? WHERE channel_id = 'UC_dormant'",
+                   (time.time() - 1,))
+        task.run()
+        row = db.fetchone("SELECT * FROM youtube_refresh_schedule WHERE channel_id = 'UC_dormant'")
+        assert row['failures'] == failures and row['interval_hours'] == 24 * 2 ** (failures - 1)
+        assert row['next_refresh_ts'] > time.time() + row['interval_hours'] * 3600 - 60
+    assert scheduler.get_due_kols() == []
+    scheduler.schedule('UC_dormant', 10, 0.1, 50)
+    assert db.fetchone("SELECT failures FROM youtube_refresh_schedule WHERE channel_id = 'UC_dormant'")['failures'] == 0
+    
+    db.close()
+
+def test_youtube_expansion_queue_leases(test_db_path):
+    """测试扩散队列租约：多worker不重复领取，过期租约自动回收，多次失败进入死信"""
+    from platforms.youtube.expansion_queue import ExpansionQueue
+    from storage.repositories.youtube_repository import YouTubeRepository
+    from storage.database import Database
+    
+    db = Database()
+    db.db_path = test_db_path
+    db.connect()
+    db.init_tables()
+    repo = YouTubeRepository(db)
+    
+    for i, priority in enumerate((50, 90, 10)):
+        repo.add_to_expansion_queue(f'UC{i}', priority)
+    
+    now = [1000.0]
+    worker_a = ExpansionQueue(repo, worker_id='a', lease_seconds=60, max_attempts=2, clock=lambda: now[0])
+    worker_b = ExpansionQueue(repo, worker_id='b', lease_seconds=60, max_attempts=2, clock=lambda: now[0])
+    
+    # 按优先级领取，两个worker拿到不同的条目
+    item_a = worker_a.claim(1)[0]
+    item_b = worker_b.claim(1)[0]
+    assert (item_a['channel_id'], item_b['channel_id']) == ('UC1', 'UC0')
+    assert item_a['worker_id'] == 'a' and item_a['attempts'] == 1
+    assert not worker_b.heartbeat(item_a['id'])
+    assert worker_a.heartbeat(item_a['id'])
+    
+    # worker b提交完成；worker a崩溃，租约过期后被回收，由worker b重新领取
+    assert worker_b.complete(item_b['id'])
+    now[0] += 61
+    retry = worker_b.claim(5)
+    assert [item['channel_id'] for item in retry] == ['UC1', 'UC2']
+    assert retry[0]['attempts'] == 2
+    # 旧持有者的结果不再提交
+    assert not worker_a.complete(item_a['id'])
+    
+    # 达到最大领取次数后失败进入死信，不再被领取
+    assert worker_b.fail(retry[0]['id'], 'boom') == 'dead'
+    assert worker_b.fail(retry[1]['id'], 'boom') == 'pending'
+    assert [item['channel_id'] for item in worker_a.claim(5)] == ['UC2']
+    assert repo.get_expansion_queue_stats() == {'completed': 1, 'dead': 1, 'processing': 1}
+    
+    db.close()
+
+class _FakeYouTubeScraper:
+    def get_channel_info(self, channel_id):
+        return {'channel_name': 'Rival Studio' if channel_id == 'UC_rival' else channel_id}
+
+class _FakeYouTubeAnalyzer:
+    """多进程测试用分析器（需要在工作进程中按模块路径导入，所以定义在模块级别）"""
+    scraper = _FakeYouTubeScraper()
+    
+    def analyze_channel(self, channel_id, discovered_from=None):
+        if channel_id == 'UC_broken':
+            raise RuntimeError('extraction failed')
+        ai_ratio = 0.8 if channel_id.startswith('UC_ai') else 0.1
+        return {'kol_data': {
+            'channel_id': channel_id, 'channel_name': channel_id, 'channel_url': '', 'subscribers': 1000,
+            'total_videos': 1, 'total_views': 0, 'analyzed_videos': 1, 'ai_videos': 1, 'ai_ratio': ai_ratio,
+            'avg_views': 0, 'avg_likes': 0, 'engagement_rate': 0, 'discovered_from': discovered_from,
+            'status': 'qualified' if ai_ratio >= 0.3 else 'rejected',
+        }, 'video_data_list': []}
+    
+    def calculate_priority(self, kol_data):
+        return 70
+
+class _FakeYouTubeFilter:
+    def is_competitor(self, channel_name):
+        return 'Rival' in channel_name
+
+def _fake_youtube_components(repository, config_path):
+    return _FakeYouTubeAnalyzer(), _FakeYouTubeFilter()
+
+class _RateReportingAnalyzer(_FakeYouTubeAnalyzer):
+    """把工作进程中youtube.com限速器的速率写入discovered_from"""
+    
+    def analyze_channel(self, channel_id, discovered_from=None):
+        from utils.rate_limiter import get_rate_limiter
+        rate = get_rate_limiter('youtube.com', rate=2.0).rate
+        return super().analyze_channel(channel_id, f"rate={rate:g}")
+
+def _rate_reporting_components(repository, config_path):
+    return _RateReportingAnalyzer(), _FakeYouTubeFilter()
+
+def test_youtube_sharded_crawler(test_db_path):
+    """测试多进程分片分析：频道分发到多个工作进程分析入库，结果汇总到协调进程"""
+    from tasks.youtube.parallel import ShardedChannelCrawler
+    from storage.repositories.youtube_repository import YouTubeRepository
+    from storage.database import Database
+    
+    db = Database()
+    db.db_path = test_db_path
+    db.connect()
+    db.init_tables()
+    repo = YouTubeRepository(db)
+    
+    channels = ['UC_ai1', 'UC_ai2', 'UC_cooking', 'UC_rival', 'UC_broken']
+    crawler = ShardedChannelCrawler(test_db_path, workers=2, component_factory=_fake_youtube_components)
+    seen = []
+    results = crawler.run(channels, 'keyword_search', on_result=seen.append)
+    
+    assert sorted(r['channel_id'] for r in results) == sorted(channels)
+    assert seen == results
+    assert crawler.stats == {'qualified': 2, 'rejected': 1, 'skipped': 1, 'failed': 1, 'cancelled': 0}
+    assert all(r['pid'] != os.getpid() for r in results)
+    
+    # 工作进程通过各自的数据库连接入库，合格的加入扩散队列
+    assert repo.get_kol_by_channel_id('UC_ai1')['discovered_from'] == 'keyword_search'
+    assert repo.get_kol_by_channel_id('UC_cooking')['status'] == 'rejected'
+    assert repo.get_kol_by_channel_id('UC_rival') is None
+    assert sorted(item['channel_id'] for item in repo.get_expansion_queue()) == ['UC_ai1', 'UC_ai2']
+    
+    # 每个工作进程只分得1/N的请求速率，合计不超过单进程配置的速率
+    crawler = ShardedChannelCrawler(test_db_path, workers=2, component_factory=_rate_reporting_components)
+    crawler.run(['UC_ai3', 'UC_ai4'], 'keyword_search')
+    assert {repo.get_kol_by_channel_id(c)['discovered_from'] for c in ('UC_ai3', 'UC_ai4')} == {'rate=1'}
+    
+    db.close()
+
 def test_twitter_discovery_task(test_db_path):
     """测试Twitter发现任务"""
     from tasks.twitter.discovery import TwitterDiscoveryTask
     
     task = TwitterDiscoveryTask()
     assert task is not None
+    
+    # 未传入repository的任务复用同一个数据库连接；UI传入的repository直接使用
+    assert TwitterDiscoveryTask().repository is task.repository
+    assert TwitterDiscoveryTask().repository.db is task.repository.db
+    from storage.repositories.twitter_repository import TwitterRepository
+    repo = TwitterRepository(task.repository.db)
+    assert TwitterDiscoveryTask(repo).repository is repo
 
 def test_twitter_export(test_db_path, temp_dir):
     """测试Twitter导出功能"""
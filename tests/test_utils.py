@@ -168,6 +168,175 @@ def test_exclusion_rules(project_root):
     result = rules.is_news_channel("AI新闻频道")
     assert isinstance(result, bool)
 
+def test_keyword_matcher():
+    """测试多关键词匹配：扫描模式和前缀树正则模式结果与逐个 in 扫描一致"""
+    import random
+    from unittest.mock import patch
+    from utils.keyword_matcher import KeywordMatcher, compile_keywords
+    
+    # 重叠、嵌套、大小写不同的关键词
+    keywords = ['gpt', 'GPT-4', 'chatgpt', 'pt', 'stable-diffusion', 'diffusion', 'AI', 'ai', '人工智能']
+    text = 'Building a ChatGPT-4 clone with Stable-Diffusion 和人工智能'
+    expected = [kw for kw in keywords if kw.lower() in text.lower()]
+    
+    with patch.object(KeywordMatcher, 'REGEX_THRESHOLD', 0):
+        regex_matcher = KeywordMatcher(keywords)
+    scan_matcher = KeywordMatcher(keywords)
+    assert regex_matcher._regex is not None and scan_matcher._regex is None
+    
+    for matcher in (scan_matcher, regex_matcher):
+        assert matcher.find_all(text) == expected
+        assert matcher.first_match(text) == 'gpt'
+        assert matcher.contains_any(text)
+        assert not matcher.contains_any('nothing here')
+        assert matcher.find_all('') == []
+    
+    # 随机数据对比
+    rng = random.Random(7)
+    vocab = [''.join(rng.choice('abc') for _ in range(rng.randint(1, 4))) for _ in range(50)]
+    with patch.object(KeywordMatcher, 'REGEX_THRESHOLD', 0):
+        regex_matcher = KeywordMatcher(vocab)
+    for _ in range(50):
+        sample = ''.join(rng.choice('abcd') for _ in range(40))
+        assert regex_matcher.find_all(sample) == [kw for kw in vocab if kw in sample]
+    
+    # 区分大小写
+    assert KeywordMatcher(['AI'], case_sensitive=True).find_all('ai tools') == []
+    
+    # 相同关键词列表复用已编译的匹配器
+    assert compile_keywords(['llm', 'gpt']) is compile_keywords(['llm', 'gpt'])
+
+def test_config_service(temp_dir):
+    """测试配置服务：文件未修改时复用只读快照，修改后自动重新解析"""
+    from unittest.mock import patch
+    from utils.config_loader import get_config_service
+    
+    config_path = os.path.join(temp_dir, 'config.json')
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump({'github': {'min_followers': 100, 'core_ai_keywords': ['LLM', 'gpt']}}, f)
+    
+    service = get_config_service(config_path)
+    assert get_config_service(config_path) is service
+    
+    snapshot = service.snapshot()
+    with patch('builtins.open') as mock_open:
+        assert service.snapshot() is snapshot
+        assert mock_open.call_count == 0
+    
+    # 快照只读，派生结构在同一快照上只计算一次
+    with pytest.raises(TypeError):
+        snapshot['github']['min_followers'] = 1
+    assert snapshot.get_path('github', 'core_ai_keywords') == ('LLM', 'gpt')
+    assert snapshot.keyword_set('github', 'core_ai_keywords') == {'llm', 'gpt'}
+    matcher = snapshot.matcher('github', 'core_ai_keywords')
+    assert matcher is snapshot.matcher('github', 'core_ai_keywords')
+    assert matcher.find_all('an llm app') == ['LLM']
+    
+    # load()返回可修改的副本，不影响快照
+    config = service.load()
+    config['github']['min_followers'] = 1
+    assert service.snapshot()['github']['min_followers'] == 100
+    
+    # 修改文件后生成新快照
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump({'github': {'min_followers': 500, 'core_ai_keywords': ['diffusion']}}, f)
+    new_snapshot = service.snapshot()
+    assert new_snapshot is not snapshot
+    assert new_snapshot['github']['min_followers'] == 500
+    assert new_snapshot.matcher('github', 'core_ai_keywords').find_all('an llm app') == []
+
+def test_rate_limiter_registry():
+    """测试按主机共享的限速器：令牌桶、Retry-After、429自适应降速"""
+    from utils.rate_limiter import RateLimiterRegistry
+    
+    class FakeClock:
+        def __init__(self):
+            self.now = 1000.0
+            self.sleeps = []
+        
+        def __call__(self):
+            return self.now
+        
+        def sleep(self, seconds):
+            self.sleeps.append(seconds)
+            self.now += seconds
+    
+    clock = FakeClock()
+    registry = RateLimiterRegistry(
+        config={'slowdown_factor': 2.0, 'max_slowdown': 4.0, 'recovery_factor': 0.5,
+                'hosts': {'github.com': {'rate': 1.0, 'burst': 2}}},
+        clock=clock, sleep=clock.sleep, wall_clock=clock
+    )
+    
+    # 同一主机（含www.和完整URL）共用一个限速器，配置优先于调用方默认值
+    limiter = registry.get('https://www.github.com/search?q=llm', rate=10.0)
+    assert registry.get('github.com') is limiter
+    assert limiter.rate == 1.0 and limiter.burst == 2
+    
+    # 突发2个请求不等待，之后按1秒间隔
+    assert limiter.acquire() == 0 and limiter.acquire() == 0
+    assert limiter.acquire() == pytest.approx(1.0)
+    assert limiter.acquire() == pytest.approx(1.0)
+    
+    # 429 + Retry-After：暂停指定秒数并降速
+    limiter.observe(429, {'Retry-After': '30'})
+    assert limiter.slowdown == 2.0
+    assert limiter.acquire() == pytest.approx(30.0)
+    assert limiter.acquire() == pytest.approx(2.0)
+    
+    # 连续限流最多降速到max_slowdown，成功请求后逐步恢复
+    limiter.observe(503)
+    limiter.observe(429)
+    assert limiter.slowdown == 4.0
+    limiter.observe(200)
+    assert limiter.slowdown == 2.0 and limiter.consecutive_throttles == 0
+    
+    # 配额用完：暂停到X-RateLimit-Reset
+    api = registry.get('api.github.com', rate=100.0)
+    api.observe(200, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(clock.now + 60)})
+    assert api.acquire() == pytest.approx(60.0)
+    
+    # 无响应对象时从错误信息识别限流（不误匹配ID中的数字）
+    api.observe_error(Exception('HTTP Error 429: Too Many Requests'))
+    assert api.metrics['throttles'] == 1
+    api.observe_error(Exception('video a429b unavailable'))
+    assert api.metrics['throttles'] == 1
+    
+    metrics = registry.get_metrics()
+    assert metrics['github.com']['requests'] == 6
+    assert metrics['github.com']['throttles'] == 3
+    assert metrics['github.com']['server_pauses'] == 3
+
+def test_rate_limiter_share_across_workers():
+    """测试多进程速率份额：N个工作进程各取1/N，合计请求速率不超过配置的速率"""
+    from utils.rate_limiter import RateLimiterRegistry
+    
+    workers, seconds = 4, 60.0
+    total = 0
+    for _ in range(workers):
+        clock = {'now': 0.0}
+        
+        def sleep(s, clock=clock):
+            clock['now'] += s
+        
+        registry = RateLimiterRegistry(config={}, clock=lambda clock=clock: clock['now'], sleep=sleep)
+        registry.set_rate_share(1.0 / workers)
+        limiter = registry.get('youtube.com', rate=0.5)
+        while True:
+            limiter.acquire()
+            if clock['now'] >= seconds:
+                break
+            total += 1
+    
+    # 配置速率0.5次/秒：60秒内所有工作进程合计约30个请求（不是每个进程30个）
+    assert 0.5 * seconds <= total <= 0.5 * seconds + workers
+    
+    # 份额设置前已创建的限速器同时调整
+    registry = RateLimiterRegistry(config={})
+    limiter = registry.get('youtube.com', rate=2.0)
+    registry.set_rate_share(0.5)
+    assert limiter.rate == 1.0 and registry.get('github.com', rate=4.0).rate == 2.0
+
 def test_session_manager(test_db_path):
     """测试会话管理器"""
     from utils.session_manager import init_session_state
@@ -191,3 +360,50 @@ def test_session_manager(test_db_path):
     # 注意：实际测试需要Streamlit环境
     # 这里只测试函数是否可以导入
     assert init_session_state is not None
+
+def test_keyword_scheduler(test_db_path):
+    """测试关键词调度器：集中到高产出关键词，统计持久化到数据库"""
+    import random
+    from unittest.mock import Mock
+    from storage.database import Database
+    from storage.repositories.keyword_stats_repository import KeywordStatsRepository
+    from utils.keyword_scheduler import KeywordScheduler
+    from platforms.youtube.searcher import KeywordSearcher
+    
+    db = Database()
+    db.db_path = test_db_path
+    db.connect()
+    db.init_tables()
+    stats_repository = KeywordStatsRepository(db)
+    
+    scheduler = KeywordScheduler('youtube', stats_repository, rng=random.Random(42))
+    for _ in range(10):
+        scheduler.record_request('AI tools')
+        scheduler.record_request('cooking')
+    scheduler.record_yield('AI tools', amount=6)
+    
+    # 新一轮运行从数据库恢复统计
+    restored = KeywordScheduler('youtube', stats_repository, rng=random.Random(7))
+    assert restored.stats[('AI tools', '')] == {'requests': 10, 'yield_total': 6, 'results_total': 0, 'new_channels': 0}
+    assert restored.expected_yield('AI tools') > restored.expected_yield('cooking')
+    
+    first_choices = [restored.select(['cooking', 'AI tools'], 1)[0][0] for _ in range(100)]
+    assert first_choices.count('AI tools') >= 90
+    
+    # KeywordSearcher按调度器选择关键词，并把合格频道计入关键词产出
+    scraper = Mock()
+    scraper.search_videos.return_value = [{'channel_id': 'UC1'}]
+    scraper.extract_channel_id.side_effect = lambda video: video['channel_id']
+    searcher = KeywordSearcher(scraper, scheduler=restored)
+    searcher.keywords = ['cooking', 'AI tools']
+    searcher.scheduler.rng = random.Random(1)
+    
+    assert searcher.search_by_keywords(keyword_limit=1) == ['UC1']
+    assert scraper.search_videos.call_args[0][0] == 'AI tools'
+    searcher.record_channel_outcome('UC1', True)
+    
+    assert stats_repository.load('youtube')[('AI tools', '')] == {
+        'requests': 11, 'yield_total': 7, 'results_total': 1, 'new_channels': 1}
+    assert stats_repository.load('github') == {}
+    
+    db.close()
@@ -381,3 +381,57 @@ def render(project_root: str, add_log_func):
             st.error(f"❌ {LABELS['config_save_failed']}: {e}")
             import traceback
             st.code(traceback.format_exc())
+    
+    # 离线重新判定（用已入库的主页信息和仓库，不请求GitHub）
+    _render_requalify(add_log_func)
+
+
+def _render_requalify(add_log_func):
+    """渲染离线重新判定区域"""
+    st.divider()
+    st.markdown("#### 🔄 重新判定")
+    st.caption("修改阈值或AI判断关键词并保存后，可用已入库的主页信息和仓库列表重新判定所有开发者，不发起网络请求")
+    
+    repository = st.session_state.get('github_repository')
+    if not repository:
+        st.warning("数据库未连接，无法重新判定")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        preview = st.button(LABELS["requalify_preview"], use_container_width=True)
+    with col2:
+        apply = st.button(LABELS["requalify"], use_container_width=True)
+    
+    if not (preview or apply):
+        return
+    
+    from tasks.github.requalify import GitHubRequalifyTask
+    
+    try:
+        task = GitHubRequalifyTask(repository, st.session_state.get('github_academic_repository'))
+        summary = task.run(dry_run=preview)
+    except Exception as e:
+        st.error(f"❌ 重新判定失败: {e}")
+        return
+    
+    if apply:
+        st.success(LABELS["requalify_done"])
+        add_log_func(f"GitHub开发者重新判定: {len(summary['changes'])} 个变化", "INFO")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("判定开发者", summary['evaluated'])
+    with col2:
+        st.metric("新合格", summary['newly_qualified'])
+    with col3:
+        st.metric("新不合格", summary['newly_rejected'])
+    with col4:
+        st.metric("商业/学术互转", summary['moved'])
+    
+    if summary['skipped_missing_repos'] or summary['needs_refetch'] or summary['needs_contact']:
+        st.info(f"📊 无已入库仓库的旧数据: {summary['skipped_missing_repos']} 个 | "
+                f"需重新在线分析: {summary['needs_refetch']} 个 | 缺少联系方式: {summary['needs_contact']} 个")
+    
+    if summary['changes']:
+        st.dataframe(summary['changes'], use_container_width=True)
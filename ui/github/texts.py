@@ -125,6 +125,9 @@ LABELS = {
     'save_config': '💾 保存配置',
     'config_saved': '✅ 配置已保存！新配置将在下次爬虫任务时生效',
     'config_save_failed': '❌ 保存失败',
+    'requalify': '🔄 按当前规则重新判定已入库开发者',
+    'requalify_preview': '👀 预览变化',
+    'requalify_done': '✅ 重新判定完成（离线，无网络请求）',
     'crawler_title': '🚀 GitHub 爬虫控制',
     'dashboard_title': '📊 GitHub 数据概览'
 }
@@ -3,6 +3,9 @@
 """
 import os
 import json
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
 
 
 def get_project_root():
@@ -27,25 +30,165 @@ def get_config_path():
     return get_absolute_path('config/config.json')
 
 
-def load_config():
-    """加载配置文件"""
-    config_path = get_config_path()
+def _ensure_config_file(config_path):
+    """配置文件不存在时从示例文件创建"""
+    if os.path.exists(config_path):
+        return
+    
+    # 尝试从示例文件创建
+    example_path = get_absolute_path('config/config.example.json')
+    if os.path.exists(example_path):
+        import shutil
+        os.makedirs(os.path.dirname(config_path), exist_ok=True)
+        shutil.copy(example_path, config_path)
+    else:
+        raise FileNotFoundError(
+            f"配置文件不存在: {config_path}\n"
+            f"请确保 config/config.json 文件存在，或从 config/config.example.json 复制一份"
+        )
+
+
+def _freeze(value):
+    """把解析出的配置转为只读结构（dict -> 只读映射，list -> tuple）"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _copy_json(value):
+    """复制JSON结构（比copy.deepcopy快，只需处理dict/list）"""
+    if isinstance(value, dict):
+        return {key: _copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    return value
+
+
+class ConfigSnapshot(Mapping):
+    """
+    配置快照（只读）
     
-    if not os.path.exists(config_path):
-        # 尝试从示例文件创建
-        example_path = get_absolute_path('config/config.example.json')
-        if os.path.exists(example_path):
-            import shutil
-            os.makedirs(os.path.dirname(config_path), exist_ok=True)
-            shutil.copy(example_path, config_path)
-        else:
-            raise FileNotFoundError(
-                f"配置文件不存在: {config_path}\n"
-                f"请确保 config/config.json 文件存在，或从 config/config.example.json 复制一份"
-            )
+    同一份配置文件内容对应同一个快照，派生结构（小写关键词集合、编译好的关键词匹配器）
+    在快照上按需计算一次并缓存；配置文件修改后服务会生成新快照，旧快照的缓存随之失效
+    """
     
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    def __init__(self, data: dict, version=None):
+        self._data = _freeze(data)
+        self.version = version
+        self._derived = {}
+        self._lock = threading.Lock()
+    
+    def __getitem__(self, key):
+        return self._data[key]
+    
+    def __iter__(self):
+        return iter(self._data)
+    
+    def __len__(self):
+        return len(self._data)
+    
+    def get_path(self, *path, default=None):
+        """按路径读取嵌套配置，如 get_path('github', 'core_ai_keywords')"""
+        node = self._data
+        for key in path:
+            if not isinstance(node, Mapping) or key not in node:
+                return default
+            node = node[key]
+        return node
+    
+    def derived(self, name, factory):
+        """获取（首次调用时计算）基于本快照的派生结构"""
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = factory(self)
+            return self._derived[name]
+    
+    def keyword_set(self, *path):
+        """路径下关键词列表的小写集合"""
+        return self.derived(('keyword_set',) + path,
+                            lambda snap: frozenset(kw.lower() for kw in snap.get_path(*path, default=()) if kw))
+    
+    def matcher(self, *path, case_sensitive=False):
+        """路径下关键词列表编译好的KeywordMatcher"""
+        from utils.keyword_matcher import KeywordMatcher
+        return self.derived(('matcher', case_sensitive) + path,
+                            lambda snap: KeywordMatcher(snap.get_path(*path, default=()), case_sensitive))
+
+
+class ConfigService:
+    """
+    配置服务：解析一次配置文件，文件的mtime/大小变化时才重新解析
+    
+    - snapshot(): 只读快照，热路径使用（没有文件读取，只有一次stat）
+    - load(): 可修改的dict副本（兼容load_config()的调用方，调用方修改不影响缓存）
+    """
+    
+    def __init__(self, config_path):
+        self.config_path = config_path
+        self._lock = threading.Lock()
+        self._version = None
+        self._raw = None
+        self._snapshot = None
+    
+    def _file_version(self):
+        stat = os.stat(self.config_path)
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _refresh(self):
+        _ensure_config_file(self.config_path)
+        version = self._file_version()
+        if version == self._version:
+            return
+        with self._lock:
+            if version == self._version:
+                return
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+            self._raw = raw
+            self._snapshot = ConfigSnapshot(raw, version)
+            self._version = version
+    
+    def snapshot(self) -> ConfigSnapshot:
+        """当前配置的只读快照"""
+        self._refresh()
+        return self._snapshot
+    
+    def load(self) -> dict:
+        """当前配置的可修改副本"""
+        self._refresh()
+        return _copy_json(self._raw)
+    
+    def invalidate(self):
+        """丢弃缓存，下次访问时重新解析"""
+        with self._lock:
+            self._version = None
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_config_service(config_path=None) -> ConfigService:
+    """获取配置文件对应的配置服务（每个文件一个，进程内共享）"""
+    config_path = os.path.abspath(get_absolute_path(config_path) if config_path else get_config_path())
+    with _services_lock:
+        service = _services.get(config_path)
+        if service is None:
+            service = ConfigService(config_path)
+            _services[config_path] = service
+        return service
+
+
+def get_config_snapshot(config_path=None) -> ConfigSnapshot:
+    """获取配置的只读快照（配置文件未修改时不读取文件）"""
+    return get_config_service(config_path).snapshot()
+
+
+def load_config():
+    """加载配置文件（返回可修改的副本，配置文件未修改时不重新解析）"""
+    return get_config_service().load()
 
 
 def save_config(config):
@@ -58,3 +201,5 @@ def save_config(config):
     
     with open(config_path, 'w', encoding='utf-8') as f:
         json.dump(config, f, indent=2, ensure_ascii=False)
+    
+    get_config_service().invalidate()
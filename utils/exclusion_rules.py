@@ -1,9 +1,9 @@
 """
 排除规则 - 通用的内容过滤规则
 """
-import json
 from utils.logger import setup_logger
-from utils.config_loader import get_absolute_path
+from utils.config_loader import get_config_snapshot
+from utils.keyword_matcher import compile_keywords
 
 logger = setup_logger()
 
@@ -12,13 +12,13 @@ class ExclusionRules:
     """排除规则管理器"""
     
     def __init__(self, config_path='config/config.json'):
-        config_path = get_absolute_path(config_path)
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = get_config_snapshot(config_path)
         
         # 从配置加载YouTube排除规则
         youtube_config = config.get('youtube', {})
-        self.rules = youtube_config.get('exclusion_rules', {})
+        # 配置快照只读，复制一份（规则可通过add/remove_exclusion_keyword修改）
+        self.rules = {category: list(value) if isinstance(value, (list, tuple)) else value
+                      for category, value in youtube_config.get('exclusion_rules', {}).items()}
         
         # 默认规则
         self._init_default_rules()
@@ -56,6 +56,10 @@ class ExclusionRules:
                 'company', '公司', 'enterprise', '企业', '企業'
             ]
     
+    def _matcher(self, category, case_sensitive=False):
+        """获取某类排除关键词的匹配器（按关键词内容缓存，增删关键词后自动重新编译）"""
+        return compile_keywords(self.rules.get(category, []), case_sensitive)
+    
     def is_course_channel(self, channel_name, video_titles):
         """
         判断是否是课程/教学频道
@@ -67,21 +71,15 @@ class ExclusionRules:
         Returns:
             bool: 是否应该排除
         """
-        channel_lower = channel_name.lower()
-        
         # 检查频道名是否包含学术机构关键词
-        for keyword in self.rules['academic_keywords']:
-            if keyword.lower() in channel_lower:
-                logger.info(f"  └─ 排除原因: 学术机构频道 (关键词: {keyword})")
-                return True
+        keyword = self._matcher('academic_keywords').first_match(channel_name)
+        if keyword:
+            logger.info(f"  └─ 排除原因: 学术机构频道 (关键词: {keyword})")
+            return True
         
-        # 检查视频标题模式
-        course_pattern_count = 0
-        for title in video_titles[:5]:  # 只检查前5个
-            for keyword in self.rules['course_keywords']:
-                if keyword in title:
-                    course_pattern_count += 1
-                    break
+        # 检查视频标题模式（课程关键词区分大小写）
+        course_matcher = self._matcher('course_keywords', case_sensitive=True)
+        course_pattern_count = sum(1 for title in video_titles[:5] if course_matcher.contains_any(title))  # 只检查前5个
         
         # 如果超过60%的视频都是课程模式
         if len(video_titles) > 0 and course_pattern_count / min(len(video_titles), 5) >= 0.6:
@@ -100,12 +98,10 @@ class ExclusionRules:
         Returns:
             bool: 是否应该排除
         """
-        channel_lower = channel_name.lower()
-        
-        for keyword in self.rules['news_keywords']:
-            if keyword.lower() in channel_lower:
-                logger.info(f"  └─ 排除原因: 新闻媒体频道 (关键词: {keyword})")
-                return True
+        keyword = self._matcher('news_keywords').first_match(channel_name)
+        if keyword:
+            logger.info(f"  └─ 排除原因: 新闻媒体频道 (关键词: {keyword})")
+            return True
         
         return False
     
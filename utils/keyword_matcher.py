@@ -0,0 +1,124 @@
+"""
+多关键词匹配引擎 - 关键词集合编译一次，一次扫描返回所有命中的关键词
+
+所有分类器（AI内容识别、GitHub独立开发者/学术人士判断、排除规则、竞对过滤）共用
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+
+class KeywordMatcher:
+    """
+    多关键词子串匹配器
+
+    匹配语义与 `keyword in text` 一致（子串匹配，不要求单词边界），两种执行方式结果完全相同：
+    - 关键词较少时逐个用 `in` 扫描（C实现的子串查找，少量关键词时最快）
+    - 关键词较多时编译为前缀树正则：每个位置只沿前缀树分支匹配，耗时基本不随关键词数量增长
+      正则在每个起点取最长的关键词，再补上它的所有前缀关键词，因此重叠、嵌套的关键词都能找到
+
+    结果按关键词原始顺序返回（重复关键词保留），与逐个扫描的旧写法一致
+    """
+
+    # 超过该数量的关键词使用前缀树正则（见 benchmarks/bench_keyword_matcher.py）
+    REGEX_THRESHOLD = 200
+
+    def __init__(self, keywords: Iterable[str], case_sensitive: bool = False):
+        self.keywords = [kw for kw in keywords if kw]
+        self.case_sensitive = case_sensitive
+
+        # 匹配用的模式 -> 原始关键词下标（大小写不敏感时 'AI' 和 'ai' 是同一个模式）
+        self._indexes: Dict[str, List[int]] = {}
+        for i, keyword in enumerate(self.keywords):
+            self._indexes.setdefault(self._normalize(keyword), []).append(i)
+        self._patterns = list(self._indexes)
+
+        self._regex = None
+        self._prefixes = {}
+        if len(self._patterns) > self.REGEX_THRESHOLD:
+            self._regex = re.compile(self._build_trie_pattern(self._patterns))
+            # 每个模式的所有前缀模式（含自身）：正则只返回最长匹配，同一起点较短的关键词由此补全
+            pattern_set = set(self._patterns)
+            self._prefixes = {
+                pattern: [pattern[:end] for end in range(1, len(pattern) + 1) if pattern[:end] in pattern_set]
+                for pattern in self._patterns
+            }
+
+    def _normalize(self, text: str) -> str:
+        return text if self.case_sensitive else text.lower()
+
+    @staticmethod
+    def _build_trie_pattern(patterns: List[str]) -> str:
+        """把关键词编译为前缀树形式的正则（贪婪匹配，返回每个起点的最长关键词）"""
+        trie = {}
+        for pattern in patterns:
+            node = trie
+            for ch in pattern:
+                node = node.setdefault(ch, {})
+            node[''] = {}
+
+        def emit(node: Dict) -> str:
+            branches = [re.escape(ch) + emit(child) for ch, child in node.items() if ch]
+            if not branches:
+                return ''
+            body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            # 当前节点本身是一个关键词的结尾时，后续部分可选
+            return f'(?:{body})?' if '' in node else body
+
+        return emit(trie)
+
+    def _matched_patterns(self, text: str) -> set:
+        if self._regex is None:
+            return {pattern for pattern in self._patterns if pattern in text}
+
+        matched = set()
+        search = self._regex.search
+        pos = 0
+        while True:
+            match = search(text, pos)
+            if not match:
+                return matched
+            matched.update(self._prefixes[match.group()])
+            pos = match.start() + 1
+
+    def find_all(self, text: str) -> List[str]:
+        """返回文本中出现的所有关键词（按关键词原始顺序）"""
+        if not text or not self._patterns:
+            return []
+        matched = self._matched_patterns(self._normalize(text))
+        if not matched:
+            return []
+        indexes = sorted(i for pattern in matched for i in self._indexes[pattern])
+        return [self.keywords[i] for i in indexes]
+
+    def first_match(self, text: str) -> Optional[str]:
+        """返回命中的第一个关键词（按关键词原始顺序），没有命中返回None"""
+        matched = self.find_all(text)
+        return matched[0] if matched else None
+
+    def contains_any(self, text: str) -> bool:
+        """文本中是否出现任意关键词"""
+        if not text or not self._patterns:
+            return False
+        text = self._normalize(text)
+        if self._regex is None:
+            return any(pattern in text for pattern in self._patterns)
+        return self._regex.search(text) is not None
+
+    def __len__(self):
+        return len(self.keywords)
+
+
+@lru_cache(maxsize=128)
+def _compile(keywords: tuple, case_sensitive: bool) -> KeywordMatcher:
+    return KeywordMatcher(keywords, case_sensitive)
+
+
+def compile_keywords(keywords: Iterable[str], case_sensitive: bool = False) -> KeywordMatcher:
+    """
+    获取关键词集合对应的匹配器（按关键词内容缓存）
+
+    适用于每次调用都从配置读取关键词列表的地方：列表不变时复用已编译的匹配器，
+    在规则页修改关键词后自动重新编译
+    """
+    return _compile(tuple(keywords), case_sensitive)
@@ -0,0 +1,123 @@
+"""
+关键词重叠度跟踪 - 学习哪些关键词对返回的频道大部分相同，选择关键词时跳过冗余的一个
+"""
+import threading
+from itertools import combinations
+from typing import Callable, Dict, List, Optional, Sequence, Set
+from utils.logger import setup_logger
+
+
+logger = setup_logger()
+
+
+class KeywordOverlapTracker:
+    """
+    关键词重叠度跟踪器
+
+    同一次运行中搜索过的每对关键词，按结果频道集合计算重叠系数
+        |A ∩ B| / min(|A|, |B|)
+    （"Sora" 的结果基本包含 "Sora AI" 的结果时接近1），并按smoothing做滑动平均。
+    重叠度达到threshold且样本数达到min_samples的关键词对视为冗余：
+    选择关键词时同一对只保留一个（新频道产出率高的），另一个排到最后。
+
+    传入repository（KeywordStatsRepository）时重叠度持久化到数据库，跨运行累积。
+    """
+
+    def __init__(self, platform: str, repository=None, threshold: float = 0.6, smoothing: float = 0.5,
+                 min_samples: int = 1):
+        self.platform = platform
+        self.repository = repository
+        self.threshold = threshold
+        self.smoothing = smoothing
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self.overlaps = {}  # (keyword_a, keyword_b) -> {'overlap': float, 'samples': int}，keyword_a < keyword_b
+
+        if self.repository:
+            try:
+                self.overlaps = self.repository.load_overlaps(platform)
+            except Exception as e:
+                logger.warning(f"加载关键词重叠度失败，使用空统计: {e}")
+                self.overlaps = {}
+
+    @staticmethod
+    def _pair(keyword_a: str, keyword_b: str):
+        return (keyword_a, keyword_b) if keyword_a < keyword_b else (keyword_b, keyword_a)
+
+    def overlap(self, keyword_a: str, keyword_b: str) -> Optional[float]:
+        """两个关键词的重叠度，没有样本时返回None"""
+        entry = self.overlaps.get(self._pair(keyword_a, keyword_b))
+        return entry['overlap'] if entry else None
+
+    def is_redundant(self, keyword_a: str, keyword_b: str) -> bool:
+        entry = self.overlaps.get(self._pair(keyword_a, keyword_b))
+        return bool(entry) and entry['samples'] >= self.min_samples and entry['overlap'] >= self.threshold
+
+    def observe(self, results: Dict[str, Set[str]]):
+        """
+        记录一次运行中各关键词返回的频道集合
+
+        Args:
+            results: {keyword: 频道ID集合}（空结果不参与计算）
+        """
+        keywords = sorted(keyword for keyword, channels in results.items() if channels)
+        updates = []
+        with self._lock:
+            for keyword_a, keyword_b in combinations(keywords, 2):
+                a, b = results[keyword_a], results[keyword_b]
+                value = len(a & b) / min(len(a), len(b))
+                entry = self.overlaps.get((keyword_a, keyword_b))
+                if entry:
+                    value = entry['overlap'] * (1 - self.smoothing) + value * self.smoothing
+                    samples = entry['samples'] + 1
+                else:
+                    samples = 1
+                self.overlaps[(keyword_a, keyword_b)] = {'overlap': value, 'samples': samples}
+                updates.append((keyword_a, keyword_b, value, samples))
+
+        if self.repository:
+            for keyword_a, keyword_b, value, samples in updates:
+                self.repository.save_overlap(self.platform, keyword_a, keyword_b, value, samples)
+
+    def select(self, ranked: Sequence[str], limit: int,
+               new_channel_rate: Optional[Callable[[str], Optional[float]]] = None) -> List[str]:
+        """
+        按排名选择关键词，跳过与已选关键词冗余的关键词
+
+        冗余的一对中保留新频道产出率高的（没有产出记录时保留排名靠前的）；
+        被跳过的关键词排在最后，已选关键词不足limit时依次补上
+
+        Args:
+            ranked: 按优先级排列的关键词
+            new_channel_rate: 关键词 -> 每次搜索的新频道数（None表示没有记录）
+        """
+        def rate(keyword):
+            value = new_channel_rate(keyword) if new_channel_rate else None
+            return -1.0 if value is None else value
+
+        selected, deferred = [], []
+        for keyword in ranked:
+            if len(selected) >= limit:
+                break
+            conflict = next((chosen for chosen in selected if self.is_redundant(keyword, chosen)), None)
+            if conflict is None:
+                selected.append(keyword)
+            elif rate(keyword) > rate(conflict):
+                selected[selected.index(conflict)] = keyword
+                deferred.append(conflict)
+            else:
+                deferred.append(keyword)
+
+        if deferred:
+            logger.info(f"跳过结果高度重叠的关键词: {', '.join(deferred)}")
+        return (selected + deferred)[:limit]
+
+    def get_redundant_pairs(self) -> List[Dict]:
+        """重叠度达到阈值的关键词对（按重叠度从高到低）"""
+        rows = [
+            {'keywords': pair, 'overlap': entry['overlap'], 'samples': entry['samples']}
+            for pair, entry in self.overlaps.items()
+            if self.is_redundant(*pair)
+        ]
+        rows.sort(key=lambda row: row['overlap'], reverse=True)
+        return rows
@@ -0,0 +1,157 @@
+"""
+关键词调度器 - 多臂老虎机（Thompson采样）按产出率选择搜索关键词
+"""
+import random
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+from utils.logger import setup_logger
+
+
+logger = setup_logger()
+
+
+class KeywordScheduler:
+    """
+    关键词调度器
+
+    每个 (关键词, 排序方式) 是一个臂，收益为每次搜索请求带来的产出（合格开发者/KOL数）。
+    产出率使用Gamma-Poisson共轭模型：
+        rate ~ Gamma(prior_alpha + 总产出, prior_beta + 请求次数)
+    每次调度时从后验分布采样并按采样值排序（Thompson采样）：
+    - 没试过的关键词后验较宽，有机会被探索
+    - 产出率高的关键词被选中的概率更高
+
+    传入repository（KeywordStatsRepository）时统计持久化到数据库，跨运行累积。
+    """
+
+    def __init__(self, platform: str, repository=None, prior_alpha: float = 1.0, prior_beta: float = 1.0,
+                 rng: Optional[random.Random] = None):
+        self.platform = platform
+        self.repository = repository
+        self.prior_alpha = prior_alpha
+        self.prior_beta = prior_beta
+        self.rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self.stats = {}  # (keyword, sort) -> {'requests', 'yield_total', 'results_total', 'new_channels'}
+
+        if self.repository:
+            try:
+                self.stats = self.repository.load(platform)
+            except Exception as e:
+                logger.warning(f"加载关键词统计失败，使用空统计: {e}")
+                self.stats = {}
+
+    @staticmethod
+    def _empty_arm() -> Dict:
+        return {'requests': 0, 'yield_total': 0, 'results_total': 0, 'new_channels': 0}
+
+    def _get(self, keyword: str, sort: str) -> Dict:
+        return self.stats.get((keyword, sort or ''), self._empty_arm())
+
+    def sample(self, keyword: str, sort: str = '') -> float:
+        """从 (关键词, 排序方式) 的产出率后验分布采样"""
+        arm = self._get(keyword, sort)
+        alpha = self.prior_alpha + arm['yield_total']
+        beta = self.prior_beta + arm['requests']
+        return self.rng.gammavariate(alpha, 1.0 / beta)
+
+    def expected_yield(self, keyword: str, sort: str = '') -> float:
+        """后验均值：每次请求的预期产出"""
+        arm = self._get(keyword, sort)
+        return (self.prior_alpha + arm['yield_total']) / (self.prior_beta + arm['requests'])
+
+    def rank(self, keywords: Sequence[str], sorts: Sequence[str] = ('',)) -> List[Tuple[str, str]]:
+        """
+        按Thompson采样排列关键词
+
+        Args:
+            keywords: 候选关键词
+            sorts: 可选的排序方式（每个关键词取采样值最高的排序方式）
+
+        Returns:
+            [(keyword, sort)]，采样值从高到低
+        """
+        with self._lock:
+            scored = []
+            for keyword in keywords:
+                best_sort, best_value = None, -1.0
+                for sort in sorts:
+                    value = self.sample(keyword, sort)
+                    if value > best_value:
+                        best_sort, best_value = sort, value
+                scored.append((best_value, keyword, best_sort))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [(keyword, sort) for _, keyword, sort in scored]
+
+    def select(self, keywords: Sequence[str], limit: int, sorts: Sequence[str] = ('',)) -> List[Tuple[str, str]]:
+        """选择前limit个关键词"""
+        return self.rank(keywords, sorts)[:limit]
+
+    def choose_sort(self, keyword: str, sorts: Sequence[str]) -> str:
+        """为指定关键词选择排序方式"""
+        with self._lock:
+            return max(sorts, key=lambda sort: self.sample(keyword, sort))
+
+    def record_request(self, keyword: str, sort: str = ''):
+        """记录一次搜索请求（拉动一次臂）"""
+        with self._lock:
+            arm = self.stats.setdefault((keyword, sort or ''), self._empty_arm())
+            arm['requests'] += 1
+        if self.repository:
+            self.repository.record_request(self.platform, keyword, sort or '')
+
+    def record_yield(self, keyword: str, sort: str = '', amount: float = 1):
+        """记录关键词的产出"""
+        with self._lock:
+            arm = self.stats.setdefault((keyword, sort or ''), self._empty_arm())
+            arm['yield_total'] += amount
+        if self.repository:
+            self.repository.record_yield(self.platform, keyword, sort or '', amount)
+
+    def record_channels(self, keyword: str, results: int, new_channels: int, sort: str = ''):
+        """记录一次搜索返回的频道数和其中之前未见过的新频道数"""
+        with self._lock:
+            arm = self.stats.setdefault((keyword, sort or ''), self._empty_arm())
+            arm['results_total'] = arm.get('results_total', 0) + results
+            arm['new_channels'] = arm.get('new_channels', 0) + new_channels
+        if self.repository:
+            self.repository.record_channels(self.platform, keyword, sort or '', results, new_channels)
+
+    def new_channel_rate(self, keyword: str, sort: str = '') -> Optional[float]:
+        """平均每次搜索带来的新频道数，没有记录时返回None"""
+        arm = self._get(keyword, sort)
+        if not arm['requests'] or not arm.get('results_total'):
+            return None
+        return arm.get('new_channels', 0) / arm['requests']
+
+    def get_report(self, top: int = 10) -> List[Dict]:
+        """按预期产出率排列的关键词统计"""
+        rows = [
+            {
+                'keyword': keyword,
+                'sort': sort,
+                'requests': arm['requests'],
+                'yield_total': arm['yield_total'],
+                'expected_yield': self.expected_yield(keyword, sort),
+                'new_channel_rate': self.new_channel_rate(keyword, sort),
+            }
+            for (keyword, sort), arm in self.stats.items()
+        ]
+        rows.sort(key=lambda row: row['expected_yield'], reverse=True)
+        return rows[:top]
+
+    def log_report(self, top: int = 5):
+        """输出产出率最高的关键词"""
+        rows = self.get_report(top)
+        if not rows:
+            return
+        total_requests = sum(arm['requests'] for arm in self.stats.values())
+        total_yield = sum(arm['yield_total'] for arm in self.stats.values())
+        per_request = total_yield / total_requests if total_requests else 0
+        logger.info(f"关键词调度统计: 累计 {total_requests} 次请求, 产出 {total_yield:g}, 平均每次请求 {per_request:.2f}")
+        for row in rows:
+            sort_label = f" ({row['sort']})" if row['sort'] else ''
+            new_label = f", 新频道 {row['new_channel_rate']:.1f}/次" if row['new_channel_rate'] is not None else ''
+            logger.info(f"  {row['keyword']}{sort_label}: {row['yield_total']:g}/{row['requests']} 次, "
+                       f"预期 {row['expected_yield']:.2f}/次{new_label}")
@@ -1,29 +1,297 @@
 """
 请求频率控制
+
+按主机共享的限速器：同一进程内所有爬虫实例/线程访问同一主机时共用一个令牌桶，
+并根据服务器返回的 Retry-After、X-RateLimit-* 头和 429/503 状态自动降速
 """
+import re
 import time
-import json
-from utils.config_loader import get_absolute_path
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from utils.config_loader import get_config_snapshot
+from utils.logger import setup_logger
+
+
+logger = setup_logger()
+
+
+class HostRateLimiter:
+    """
+    单个主机的限速器（令牌桶）
+
+    - rate: 持续速率（请求/秒），burst: 桶容量（允许的突发请求数）
+    - jitter: 每个请求额外增加 0~jitter 秒的随机间隔（模拟人工访问）
+    - 服务器要求暂停（Retry-After / X-RateLimit-Reset）时，暂停结束前所有请求等待
+    - 429/503 时速率按 slowdown_factor 降低（最多降到 1/max_slowdown），成功请求后逐步恢复
+
+    令牌桶按"预约"方式实现（GCRA）：acquire在锁内预约发送时间，在锁外等待，
+    多个线程同时请求时按顺序错开，不会同时放行
+    """
+
+    # 错误信息中的限流状态码（要求是独立的数字，避免误匹配视频/频道ID）
+    _THROTTLE_ERROR = re.compile(r'\b(429|503)\b|Too Many Requests', re.IGNORECASE)
+
+    def __init__(self, host: str, rate: float = 1.0, burst: int = 1, jitter: float = 0.0,
+                 slowdown_factor: float = 2.0, max_slowdown: float = 8.0, recovery_factor: float = 0.8,
+                 max_backoff: float = 60.0, max_pause: float = 900.0,
+                 clock=time.monotonic, sleep=time.sleep, wall_clock=time.time):
+        self.host = host
+        self.rate = max(rate, 1e-6)
+        self.burst = max(int(burst), 1)
+        self.jitter = max(jitter, 0.0)
+        self.slowdown_factor = slowdown_factor
+        self.max_slowdown = max_slowdown
+        self.recovery_factor = recovery_factor
+        self.max_backoff = max_backoff
+        self.max_pause = max_pause
+
+        self._clock = clock
+        self._sleep = sleep
+        self._wall_clock = wall_clock
+        self._lock = threading.Lock()
+
+        self.slowdown = 1.0          # 当前降速倍数（1为不降速）
+        self.consecutive_throttles = 0
+        self._tat = clock()          # 理论到达时间（GCRA）
+        self._paused_until = 0.0
+
+        self.metrics = {'requests': 0, 'waits': 0, 'wait_seconds': 0.0, 'throttles': 0, 'server_pauses': 0}
+
+    @property
+    def interval(self) -> float:
+        """当前（降速后）两次请求的最小间隔"""
+        return self.slowdown / self.rate
+
+    @property
+    def tokens(self) -> float:
+        """当前可立即使用的令牌数"""
+        with self._lock:
+            now = self._clock()
+            if now < self._paused_until:
+                return 0.0
+            backlog = max(self._tat - now, 0.0)
+            return max(min(self.burst - backlog / self.interval, self.burst), 0.0)
+
+    def acquire(self) -> float:
+        """
+        获取一个令牌，必要时等待
+
+        Returns:
+            实际等待的秒数
+        """
+        with self._lock:
+            now = self._clock()
+            interval = self.interval
+            tolerance = (self.burst - 1) * interval
+            start = max(now, self._tat - tolerance, self._paused_until)
+            spacing = interval + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+            self._tat = max(self._tat, start) + spacing
+            self.metrics['requests'] += 1
+            wait = start - now
+            if wait > 0:
+                self.metrics['waits'] += 1
+                self.metrics['wait_seconds'] += wait
+
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def pause(self, seconds: float, reason: str = ''):
+        """暂停该主机的所有请求"""
+        seconds = min(max(seconds, 0.0), self.max_pause)
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+            # 暂停结束时桶为空：恢复后按间隔逐个放行，不立即突发
+            self._tat = max(self._tat, self._paused_until + (self.burst - 1) * self.interval)
+            self.metrics['server_pauses'] += 1
+        logger.warning(f"⏸ {self.host} 暂停请求 {seconds:.1f} 秒{f'（{reason}）' if reason else ''}")
+
+    def _parse_retry_after(self, value: Optional[str]) -> Optional[float]:
+        """Retry-After 可以是秒数或HTTP日期"""
+        if not value:
+            return None
+        value = value.strip()
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - self._wall_clock(), 0.0)
+        except (TypeError, ValueError, IndexError):
+            return None
+
+    def observe(self, status_code: int, headers: Optional[Dict] = None):
+        """
+        根据响应调整限速
+
+        Args:
+            status_code: HTTP状态码
+            headers: 响应头（支持 Retry-After、X-RateLimit-Remaining、X-RateLimit-Reset）
+        """
+        headers = headers or {}
+        retry_after = self._parse_retry_after(headers.get('Retry-After'))
+
+        if status_code in (429, 503):
+            with self._lock:
+                self.consecutive_throttles += 1
+                self.metrics['throttles'] += 1
+                self.slowdown = min(self.slowdown * self.slowdown_factor, self.max_slowdown)
+                backoff = min(2 ** self.consecutive_throttles, self.max_backoff)
+            self.pause(retry_after if retry_after is not None else backoff,
+                       f"HTTP {status_code}，第{self.consecutive_throttles}次，降速至1/{self.slowdown:g}")
+            return
+
+        if retry_after is not None:
+            self.pause(retry_after, 'Retry-After')
+
+        # 配额用完：暂停到配额重置时间
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is not None and reset is not None:
+            try:
+                if int(remaining) <= 0:
+                    self.pause(float(reset) - self._wall_clock(), 'X-RateLimit配额用完')
+            except (TypeError, ValueError):
+                pass
+
+        if 200 <= status_code < 400:
+            with self._lock:
+                if self.consecutive_throttles:
+                    logger.info(f"✓ {self.host} 速率限制已解除（之前连续{self.consecutive_throttles}次）")
+                self.consecutive_throttles = 0
+                self.slowdown = max(1.0, self.slowdown * self.recovery_factor)
+
+    def observe_error(self, error: Exception):
+        """无法拿到响应对象时（如yt-dlp），根据错误信息识别429/503"""
+        match = self._THROTTLE_ERROR.search(str(error))
+        if match:
+            self.observe(int(match.group(1)) if match.group(1) else 429)
+
+    def get_metrics(self) -> Dict:
+        metrics = dict(self.metrics)
+        metrics['tokens'] = round(self.tokens, 2)
+        metrics['rate'] = self.rate / self.slowdown
+        metrics['slowdown'] = self.slowdown
+        return metrics
+
+
+class RateLimiterRegistry:
+    """
+    进程内按主机共享的限速器注册表
+
+    参数优先级：配置文件 rate_limits.hosts.<host> > 调用方传入的默认值 > rate_limits.default
+
+    多进程共用一个主机的请求额度时，每个进程通过set_rate_share取得其中一份速率
+    """
+
+    ADAPTIVE_KEYS = ('slowdown_factor', 'max_slowdown', 'recovery_factor', 'max_backoff', 'max_pause')
+
+    def __init__(self, config: Optional[Dict] = None, **limiter_kwargs):
+        self._config = config
+        self._limiter_kwargs = limiter_kwargs  # 测试注入clock/sleep
+        self._limiters = {}
+        self._lock = threading.Lock()
+        self.rate_share = 1.0  # 本进程占用的速率份额
+
+    def _rate_limits_config(self) -> Dict:
+        if self._config is not None:
+            return self._config
+        try:
+            return get_config_snapshot().get('rate_limits', {})
+        except FileNotFoundError:
+            return {}
+
+    @staticmethod
+    def normalize_host(host_or_url: str) -> str:
+        """URL或主机名 -> 主机名（去掉www.前缀）"""
+        host = urlparse(host_or_url).netloc if '://' in host_or_url else host_or_url
+        host = host.split(':')[0].lower()
+        return host[4:] if host.startswith('www.') else host
+
+    def get(self, host_or_url: str, **defaults) -> HostRateLimiter:
+        """获取主机的限速器（首次获取时创建，defaults为调用方建议的rate/burst/jitter/max_backoff）"""
+        host = self.normalize_host(host_or_url)
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                config = self._rate_limits_config()
+                params = dict(config.get('default', {}))
+                params.update(defaults)
+                params.update(config.get('hosts', {}).get(host, {}))
+                for key in self.ADAPTIVE_KEYS:
+                    if key in config and key not in params:
+                        params[key] = config[key]
+                params['rate'] = params.get('rate', 1.0) * self.rate_share
+                limiter = HostRateLimiter(host, **params, **self._limiter_kwargs)
+                self._limiters[host] = limiter
+                logger.debug(f"创建限速器: {host} rate={limiter.rate:.3f}/s burst={limiter.burst} jitter={limiter.jitter}s")
+            return limiter
+
+    def set_rate_share(self, share: float):
+        """
+        设置本进程占用的速率份额（N个工作进程各取1/N，合计不超过配置的速率），已创建的限速器同时调整
+        """
+        share = min(max(share, 1e-6), 1.0)
+        with self._lock:
+            scale = share / self.rate_share
+            self.rate_share = share
+            for limiter in self._limiters.values():
+                limiter.rate *= scale
+
+    def observe_response(self, response, *args, **kwargs):
+        """requests响应钩子：session.hooks['response'].append(registry.observe_response)"""
+        try:
+            self.get(response.url).observe(response.status_code, response.headers)
+        except Exception as e:
+            logger.debug(f"限速器处理响应失败: {e}")
+        return response
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.host: limiter.get_metrics() for limiter in limiters}
+
+    def log_report(self):
+        """输出各主机的限速统计"""
+        for host, metrics in self.get_metrics().items():
+            if not metrics['requests']:
+                continue
+            logger.info(f"限速统计 {host}: 请求 {metrics['requests']} 次, 等待 {metrics['waits']} 次"
+                       f"（共 {metrics['wait_seconds']:.1f} 秒）, 限流 {metrics['throttles']} 次, "
+                       f"当前速率 {metrics['rate']:.2f}/秒")
+
+
+_registry = RateLimiterRegistry()
+
+
+def get_rate_limiter_registry() -> RateLimiterRegistry:
+    """进程内共享的限速器注册表"""
+    return _registry
+
+
+def get_rate_limiter(host_or_url: str, **defaults) -> HostRateLimiter:
+    """获取主机共享的限速器"""
+    return _registry.get(host_or_url, **defaults)
 
 
 class RateLimiter:
-    """频率限制器"""
-    
-    def __init__(self, config_path='config/config.json'):
-        config_path = get_absolute_path(config_path)
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        
+    """频率限制器（按主机共享，同一主机的所有爬虫实例共用一个限速器）"""
+
+    def __init__(self, config_path='config/config.json', host='youtube.com'):
+        config = get_config_snapshot(config_path)
+
         self.delay = config['crawler']['rate_limit_delay']
-        self.last_request_time = 0
-    
+        self.limiter = get_rate_limiter(host, rate=1.0 / max(self.delay, 1e-3), burst=1)
+
     def wait(self):
         """等待到可以发送下一个请求"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.delay:
-            sleep_time = self.delay - time_since_last
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        self.limiter.acquire()
+
+    def observe_error(self, error):
+        """请求失败时识别限流错误并降速"""
+        self.limiter.observe_error(error)
@@ -2,17 +2,13 @@
 重试机制
 """
 import time
-import json
 from functools import wraps
-from utils.config_loader import get_absolute_path
+from utils.config_loader import get_config_snapshot
 
 
 def load_retry_config():
     """加载重试配置"""
-    config_path = get_absolute_path('config/config.json')
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = json.load(f)
-    return config['crawler']['max_retries']
+    return get_config_snapshot()['crawler']['max_retries']
 
 
 def retry_on_failure(max_retries=None):
@@ -1,17 +1,15 @@
 """
 关键词匹配工具
 """
-import json
-from utils.config_loader import get_absolute_path
+from utils.config_loader import get_config_snapshot
+from utils.keyword_matcher import KeywordMatcher
 
 
 class TextMatcher:
     """文本关键词匹配器"""
     
     def __init__(self, config_path='config/config.json'):
-        config_path = get_absolute_path(config_path)
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = get_config_snapshot(config_path)
         
         # 合并所有优先级的关键词
         self.keywords = []
@@ -20,6 +18,9 @@ class TextMatcher:
         
         # 转换为小写用于匹配
         self.keywords_lower = [kw.lower() for kw in self.keywords]
+        
+        # 编译好的匹配器缓存在配置快照上，配置不变时各分析器共用同一个
+        self.matcher = config.derived('ai_keyword_matcher', lambda snap: KeywordMatcher(self.keywords))
     
     def is_ai_related(self, title, description=''):
         """
@@ -36,17 +37,11 @@ class TextMatcher:
         title = title or ''
         description = description or ''
         
-        title_lower = title.lower()
-        description_lower = description.lower()
-        
-        matched_in_title = []
-        matched_in_description = []
+        matched_in_title = self.matcher.find_all(title)
         
-        for i, keyword in enumerate(self.keywords_lower):
-            if keyword in title_lower:
-                matched_in_title.append(self.keywords[i])
-            elif keyword in description_lower:
-                matched_in_description.append(self.keywords[i])
+        # 标题中已匹配的关键词不再重复计入描述
+        title_matched = set(matched_in_title)
+        matched_in_description = [kw for kw in self.matcher.find_all(description) if kw not in title_matched]
         
         # 合并所有匹配的关键词
         all_matched = matched_in_title + matched_in_description
@@ -69,17 +64,8 @@ class TextMatcher:
         title = title or ''
         description = description or ''
         
-        title_lower = title.lower()
-        description_lower = description.lower()
-        
-        matched_in_title = []
-        matched_in_description = []
-        
-        for i, keyword in enumerate(self.keywords_lower):
-            if keyword in title_lower:
-                matched_in_title.append(self.keywords[i])
-            if keyword in description_lower:
-                matched_in_description.append(self.keywords[i])
+        matched_in_title = self.matcher.find_all(title)
+        matched_in_description = self.matcher.find_all(description)
         
         all_matched = list(set(matched_in_title + matched_in_description))
         
@@ -0,0 +1,89 @@
+"""
+带过期时间的内存缓存 - 支持按来源统计命中率
+"""
+import time
+import threading
+from collections import OrderedDict
+
+
+class TTLCache:
+    """TTL内存缓存（线程安全，超出容量时淘汰最久未使用的条目）"""
+
+    def __init__(self, ttl_seconds=3600, max_entries=10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def get(self, key, label=None):
+        """
+        获取缓存值
+
+        Args:
+            key: 缓存键
+            label: 统计来源（如搜索策略名），传入时记录命中/未命中
+
+        返回: 缓存值，不存在或已过期返回None
+        """
+        with self._lock:
+            value = None
+            entry = self._data.get(key)
+            if entry is not None:
+                stored_at, cached = entry
+                if self.ttl_seconds is None or time.time() - stored_at < self.ttl_seconds:
+                    self._data.move_to_end(key)
+                    value = cached
+                else:
+                    del self._data[key]
+
+            if label is not None:
+                self._record(label, value is not None)
+            return value
+
+    def set(self, key, value, stored_at=None):
+        """写入缓存（stored_at用于从持久层回填时保留原始写入时间）"""
+        with self._lock:
+            self._data[key] = (stored_at if stored_at is not None else time.time(), value)
+            self._data.move_to_end(key)
+            while self.max_entries and len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def record(self, label, hit):
+        """记录一次命中/未命中（多级缓存由调用方统一记录）"""
+        with self._lock:
+            self._record(label, hit)
+
+    def _record(self, label, hit):
+        stats = self._stats.setdefault(label, {'hits': 0, 'misses': 0})
+        stats['hits' if hit else 'misses'] += 1
+
+    def invalidate(self, key):
+        """删除单个缓存条目"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get_stats(self):
+        """
+        获取命中率统计
+
+        返回: {label: {'hits': int, 'misses': int, 'hit_rate': float}}
+        """
+        with self._lock:
+            report = {}
+            for label, stats in self._stats.items():
+                total = stats['hits'] + stats['misses']
+                report[label] = {
+                    'hits': stats['hits'],
+                    'misses': stats['misses'],
+                    'hit_rate': stats['hits'] / total if total > 0 else 0.0,
+                }
+            return report